@@ -1,4 +1,7 @@
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from backend.core.metrics import render_prometheus
 from backend.models.schemas import HealthResponse
 
 router = APIRouter()
@@ -23,4 +26,12 @@ async def health_check(request: Request):
         document_count=info.get("document_count", 0),
         embedding_model=info.get("embedding_model", "all-MiniLM-L6-v2"),
         version="2.0.0",
+        model_ready=vector_store.model_ready,
+        startup_timings=getattr(request.app.state, "startup_timings", {}),
     )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage latency histograms in Prometheus text format."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
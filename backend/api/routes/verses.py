@@ -3,6 +3,9 @@ import datetime
 from fastapi import APIRouter, Query, HTTPException, Request
 from typing import Optional
 
+from backend.config import settings
+from backend.core.static_responses import StaticBody
+
 router = APIRouter()
 
 VALID_THEMES = [
@@ -29,22 +32,71 @@ THEME_QUERIES = {
     "general":     "wisdom teaching guidance",
 }
 
+CHAPTER_QUERY = "Chapter {} teachings wisdom"
+
+
+def browse_queries() -> list:
+    """Every fixed query string the browse endpoints embed — pre-seeded at startup."""
+    return list(THEME_QUERIES.values()) + [CHAPTER_QUERY.format(n) for n in range(1, 19)]
+
+
+THEME_INFO = {
+    "duty":        {"emoji": "⚖️",  "description": "Dharma, righteous action, obligations"},
+    "detachment":  {"emoji": "🌊",  "description": "Non-attachment, renunciation, surrender"},
+    "knowledge":   {"emoji": "📚",  "description": "Wisdom, understanding, self-realization"},
+    "devotion":    {"emoji": "❤️",  "description": "Bhakti, love, worship, dedication"},
+    "action":      {"emoji": "⚡",  "description": "Karma yoga, work, performance, activity"},
+    "soul":        {"emoji": "✨",  "description": "Atman, the eternal self, consciousness"},
+    "peace":       {"emoji": "🕊️", "description": "Tranquility, calm, serenity, equanimity"},
+    "meditation":  {"emoji": "🧘",  "description": "Yoga, concentration, mindfulness"},
+    "general":     {"emoji": "🕉️", "description": "General Gita wisdom"},
+}
+
+_THEMES_BODY = StaticBody.render({"themes": THEME_INFO})
+
+
+class BrowseResponses:
+    """
+    Pre-rendered bodies for the browse endpoints: all 18 chapters at startup,
+    the daily verse once per calendar day (re-rendered on the first request
+    after midnight).
+    """
+
+    def __init__(self, verse_table):
+        self._table = verse_table
+        self.chapters = {
+            n: StaticBody.render(_chapter_payload(verse_table, n)) for n in range(1, 19)
+        }
+        self._daily_date: Optional[datetime.date] = None
+        self._daily_body: Optional[StaticBody] = None
+
+    def daily(self, today: datetime.date) -> StaticBody:
+        if self._daily_date != today:
+            self._daily_body = StaticBody.render(_daily_payload(self._table, today))
+            self._daily_date = today
+        return self._daily_body
+
+
+def _chapter_payload(verse_table, chapter_num: int) -> dict:
+    result = [v.to_dict() for v in verse_table.chapter(chapter_num)]
+    return {"chapter": chapter_num, "verses": result, "total": len(result)}
+
+
+def _daily_payload(verse_table, today: datetime.date) -> dict:
+    # Day-of-year (1-365/366) drives the rotation — same verse all day, every day
+    day_of_year = today.timetuple().tm_yday
+    verse       = verse_table[(day_of_year - 1) % len(verse_table)]
+    return {**verse.to_dict(), "date": str(today)}
+
+
+def _browse_cache_control() -> str:
+    return f"public, max-age={settings.BROWSE_CACHE_MAX_AGE}"
+
 
 @router.get("/themes")
-async def get_themes():
+async def get_themes(request: Request):
     """Return all available spiritual themes."""
-    theme_info = {
-        "duty":        {"emoji": "⚖️",  "description": "Dharma, righteous action, obligations"},
-        "detachment":  {"emoji": "🌊",  "description": "Non-attachment, renunciation, surrender"},
-        "knowledge":   {"emoji": "📚",  "description": "Wisdom, understanding, self-realization"},
-        "devotion":    {"emoji": "❤️",  "description": "Bhakti, love, worship, dedication"},
-        "action":      {"emoji": "⚡",  "description": "Karma yoga, work, performance, activity"},
-        "soul":        {"emoji": "✨",  "description": "Atman, the eternal self, consciousness"},
-        "peace":       {"emoji": "🕊️", "description": "Tranquility, calm, serenity, equanimity"},
-        "meditation":  {"emoji": "🧘",  "description": "Yoga, concentration, mindfulness"},
-        "general":     {"emoji": "🕉️", "description": "General Gita wisdom"},
-    }
-    return {"themes": theme_info}
+    return _THEMES_BODY.respond(request, _browse_cache_control())
 
 
 @router.get("/verses/search")
@@ -71,7 +123,7 @@ async def search_verses(
         results = vector_store.search_by_theme(query_text, theme, n_results=limit)
     elif chapter:
         results = vector_store.search_by_chapter(
-            f"Chapter {chapter} teachings wisdom", chapter, n_results=limit
+            CHAPTER_QUERY.format(chapter), chapter, n_results=limit
         )
     else:
         raise HTTPException(
@@ -110,32 +162,12 @@ async def get_chapter_verses(chapter_num: int, request: Request):
     if chapter_num < 1 or chapter_num > 18:
         raise HTTPException(status_code=400, detail="Chapter must be between 1 and 18")
 
-    all_verses     = getattr(request.app.state, "all_verses",  [])
-    sanskrit_index = getattr(request.app.state, "sanskrit",    {})
+    browse = getattr(request.app.state, "browse_responses", None)
 
-    if not all_verses:
+    if not browse:
         raise HTTPException(status_code=503, detail="Verse pool not loaded yet")
 
-    chapter_verses = sorted(
-        [v for v in all_verses if v.get("chapter") == chapter_num],
-        key=lambda v: v.get("verse", 0),
-    )
-
-    result = []
-    for v in chapter_verses:
-        ch, vs = v.get("chapter", 0), v.get("verse", 0)
-        sk = sanskrit_index.get(f"{ch}_{vs}", {})
-        result.append({
-            "chapter":         ch,
-            "verse":           vs,
-            "verse_id":        v.get("verse_id", ""),
-            "text":            v.get("text", ""),
-            "theme":           v.get("theme", "general"),
-            "sanskrit":        sk.get("sanskrit"),
-            "transliteration": sk.get("transliteration"),
-        })
-
-    return {"chapter": chapter_num, "verses": result, "total": len(result)}
+    return browse.chapters[chapter_num].respond(request, _browse_cache_control())
 
 
 @router.get("/verse/daily")
@@ -144,28 +176,13 @@ async def get_daily_verse(request: Request):
     Returns today's verse — deterministic, changes daily.
     Same verse for every user on the same calendar day.
     """
-    all_verses    = getattr(request.app.state, "all_verses",  [])
-    sanskrit_index = getattr(request.app.state, "sanskrit",   {})
+    browse = getattr(request.app.state, "browse_responses", None)
 
-    if not all_verses:
+    if not browse:
         raise HTTPException(status_code=503, detail="Verse pool not loaded yet")
 
-    # Day-of-year (1-365/366) drives the rotation — same verse all day, every day
-    day_of_year = datetime.date.today().timetuple().tm_yday
-    verse       = all_verses[(day_of_year - 1) % len(all_verses)]
-
-    ch  = verse.get("chapter", 0)
-    vs  = verse.get("verse",   0)
-    key = f"{ch}_{vs}"
-    sk  = sanskrit_index.get(key, {})
-
-    return {
-        "chapter":         ch,
-        "verse":           vs,
-        "verse_id":        verse.get("verse_id", ""),
-        "text":            verse.get("text", ""),
-        "theme":           verse.get("theme", "general"),
-        "sanskrit":        sk.get("sanskrit"),
-        "transliteration": sk.get("transliteration"),
-        "date":            str(datetime.date.today()),
-    }
+    # Cacheable until the verse changes at midnight (server local time)
+    now      = datetime.datetime.now()
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+    max_age  = max(1, min(settings.BROWSE_CACHE_MAX_AGE, int((midnight - now).total_seconds())))
+    return browse.daily(now.date()).respond(request, f"public, max-age={max_age}")
@@ -1,24 +1,254 @@
-import json
+import asyncio
+import functools
+import re
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 
+from backend.config import settings
 from backend.models.schemas import QueryRequest, WisdomResponse, VerseInfo, SessionHistoryResponse
 from backend.core.session_manager import SessionManager
-from backend.core.query_classifier import classify_query, QueryType
-from backend.core.prompts import get_off_topic_response, MENTAL_HEALTH_KEYWORDS, MENTAL_HEALTH_DISCLAIMER
-from backend.core.mood_detector import detect_mood
+from backend.core.session_store import SQLiteSessionStore
+from backend.core.query_classifier import QueryType
+from backend.core.query_analysis import QueryAnalysis, analyze_query
+from backend.core.prompts import get_off_topic_response, MENTAL_HEALTH_DISCLAIMER
+from backend.core.metrics import PROMPT_TOKENS, RequestTimer
+from backend.core.single_flight import InFlightRegistry
+from backend.core import sse
 
 router = APIRouter()
 
-_session_manager = SessionManager(max_history=10, session_ttl_hours=2)
+
+
+def _build_session_store():
+    if settings.SESSION_STORE == "sqlite":
+        return SQLiteSessionStore(
+            settings.SESSION_DB_PATH,
+            max_history=10,
+            session_ttl_hours=settings.SESSION_TTL_HOURS,
+            max_sessions=settings.SESSION_MAX_ACTIVE,
+        )
+    return None   # SessionManager defaults to the in-memory store
+
+
+_session_manager = SessionManager(
+    max_history=10,
+    session_ttl_hours=settings.SESSION_TTL_HOURS,
+    max_sessions=settings.SESSION_MAX_ACTIVE,
+    store=_build_session_store(),
+)
+
+
+# Identical concurrent SPIRITUAL queries share one retrieval + generation
+_flights = InFlightRegistry(enabled=settings.SINGLE_FLIGHT_ENABLED)
+
+
+def get_session_manager() -> SessionManager:
+    """The process-wide session manager (lifespan runs its cleanup task)."""
+    return _session_manager
+
+
+async def _run_blocking(request: Request, fn, *args, **kwargs):
+    """
+    Run CPU-bound work (ONNX embedding, vector search) on the bounded retrieval
+    executor so it never stalls the event loop — health checks and other
+    streams keep flowing while a query is being retrieved.
+    """
+    executor = getattr(request.app.state, "retrieval_executor", None)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+# ── Session helpers ──────────────────────────────────────────────────────────
+
+async def _session_call(request: Request, fn, *args):
+    """
+    A session-manager call. With SESSION_STORE=sqlite every call is a query
+    (and history() may wait for a write-behind flush), so it runs on the
+    retrieval executor; the in-memory store answers in microseconds inline.
+    """
+    if _session_manager.store.blocking:
+        return await _run_blocking(request, fn, *args)
+    return fn(*args)
+
+
+def _ensure_session_sync(session_id) -> str:
+    if not session_id or not _session_manager.get_session(session_id):
+        session_id = _session_manager.create_session()
+    return session_id
+
+
+async def _ensure_session(request: Request, session_id) -> str:
+    """The request's live session, or a new one — one executor hop either way."""
+    return await _session_call(request, _ensure_session_sync, session_id)
+
+
+# ── Semantic answer cache helpers ────────────────────────────────────────────
+
+def _answer_cache_probe(request: Request, analysis: QueryAnalysis, context: dict):
+    """Cached entry for this query's embedding, mood, verse set and conversation history, or None."""
+    cache = getattr(request.app.state, "answer_cache", None)
+    if cache is None or analysis.embedding is None:
+        return None
+    return cache.lookup(
+        analysis.embedding, analysis.mood.value, context.get("used_verses", []),
+        context.get("conversation_context", ""),
+    )
+
+
+def _answer_cache_store(request: Request, analysis: QueryAnalysis, context: dict, text: str, provider: str):
+    cache = getattr(request.app.state, "answer_cache", None)
+    if cache is None or analysis.embedding is None:
+        return
+    cache.store(
+        analysis.embedding, analysis.mood.value, context.get("used_verses", []), text, provider,
+        context.get("conversation_context", ""),
+    )
+
+
+def _retrieve(retriever, analysis: QueryAnalysis, conversation_context: str, timer: RequestTimer,
+              reserved_tokens: int = 0):
+    """Embed the query once, then build the LLM context from the same analysis."""
+    analysis = retriever.embed_analysis(analysis, timer)
+    context = retriever.create_context_for_llm(
+        analysis.text,
+        conversation_context=conversation_context,
+        token_budget=settings.PROMPT_TOKEN_BUDGET,
+        timer=timer,
+        analysis=analysis,
+        reserved_tokens=reserved_tokens,
+    )
+    return analysis, context
+
+
+def _reference_verses(request: Request, analysis: QueryAnalysis) -> list:
+    """The verse(s) an explicit reference ("BG 2.47") names — empty if none or unknown."""
+    verse_index = getattr(request.app.state, "verse_index", None)
+    if verse_index is None or analysis.verse_reference is None:
+        return []
+    return verse_index.resolve(analysis.verse_reference, settings.VERSE_REFERENCE_NEIGHBOURS)
+
+
+def _reference_context(retriever, ref_verses: list, themes: list, conversation_context: str,
+                       timer: RequestTimer, reserved_tokens: int = 0) -> dict:
+    """LLM context straight from the referenced verses — no embedding, no vector search."""
+    return retriever.build_context(
+        ref_verses, themes, conversation_context, settings.PROMPT_TOKEN_BUDGET, timer, reserved_tokens
+    )
+
+
+async def _spiritual_context(request: Request, retriever, llm_handler, analysis: QueryAnalysis,
+                             ref_verses: list, conversation_context: str, timer: RequestTimer):
+    """
+    Verse lookup or retrieval for a SPIRITUAL query, with the verse block sized
+    to what the rest of the prompt leaves of PROMPT_TOKEN_BUDGET. Returns
+    (analysis, context).
+    """
+    mood = analysis.mood.value
+    themes = list(dict.fromkeys(v["theme"] for v in ref_verses)) if ref_verses else list(analysis.themes)
+    reserved = llm_handler.prompt_overhead_tokens(analysis.text, themes, conversation_context, mood)
+
+    if ref_verses:
+        with timer.stage("verse_lookup"):
+            context = _reference_context(retriever, ref_verses, themes, conversation_context, timer, reserved)
+    else:
+        with timer.stage("retrieval"):
+            analysis, context = await _run_blocking(
+                request, _retrieve, retriever, analysis, conversation_context, timer, reserved
+            )
+    # Seeker's emotional state — injects tone overlay into system prompt
+    context["mood"] = mood
+
+    tokens = context["prompt_tokens"]
+    PROMPT_TOKENS.observe(tokens["total"], route=timer.route)
+    print(
+        f"Prompt ~{tokens['total']}/{tokens['budget']} tokens "
+        f"({tokens['reserved_tokens']} fixed + {tokens['context_tokens']} context, "
+        f"{context['total_verses']} verses, {tokens['duplicates_dropped']} near-duplicates dropped)"
+    )
+    return analysis, context
+
+
+def _enrich(verse_table, v: dict) -> dict:
+    """A used verse as returned to the client, with Sanskrit from the verse table."""
+    record = verse_table.get(v.get("chapter", 0), v.get("verse", 0)) if verse_table else None
+    return {
+        "chapter":         v.get("chapter", 0),
+        "verse":           v.get("verse", 0),
+        "text":            v.get("text", ""),
+        "theme":           v.get("theme", "general"),
+        "verse_id":        v.get("verse_id", ""),
+        "relevance_score": v.get("relevance_score", 0.0),
+        "sanskrit":        record.sanskrit if record else None,
+        "transliteration": record.transliteration if record else None,
+    }
+
+
+async def _answer_spiritual(request: Request, retriever, llm_handler, analysis: QueryAnalysis,
+                            ref_verses: list, conversation_context: str, timer: RequestTimer):
+    """Retrieval + answer for a SPIRITUAL /query — run once per flight. Returns (result, cached)."""
+    analysis, context = await _spiritual_context(
+        request, retriever, llm_handler, analysis, ref_verses, conversation_context, timer
+    )
+
+    with timer.stage("answer_cache"):
+        cached = _answer_cache_probe(request, analysis, context)
+    if cached:
+        return {
+            "response":    cached["response"] + (MENTAL_HEALTH_DISCLAIMER if analysis.needs_disclaimer else ""),
+            "used_verses": context.get("used_verses", []),
+            "themes":      context.get("query_themes", []),
+            "provider":    cached["provider"],
+            "error":       False,
+        }, True
+
+    with timer.stage("llm"):
+        result = await llm_handler.generate_response_async(analysis.text, context, analysis)
+    if not result.get("error"):
+        text = result["response"]
+        if analysis.needs_disclaimer and text.endswith(MENTAL_HEALTH_DISCLAIMER):
+            text = text[: -len(MENTAL_HEALTH_DISCLAIMER)]
+        _answer_cache_store(request, analysis, context, text, result.get("provider", "none"))
+    return result, False
+
+
+async def _stream_spiritual(flight, request: Request, retriever, llm_handler, analysis: QueryAnalysis,
+                            ref_verses: list, conversation_context: str, timer: RequestTimer):
+    """
+    Retrieval + token stream for a SPIRITUAL /query/stream — run once per
+    flight. Publishes (context, cached) first, then every provider chunk.
+    """
+    analysis, context = await _spiritual_context(
+        request, retriever, llm_handler, analysis, ref_verses, conversation_context, timer
+    )
+
+    with timer.stage("answer_cache"):
+        cached = _answer_cache_probe(request, analysis, context)
+    flight.set_context((context, bool(cached)))
+
+    if cached:
+        # Semantic cache hit — replay the stored answer as token events
+        flight.meta["provider"] = "cache"
+        for chunk in _replay_chunks(cached["response"]):
+            flight.publish(chunk)
+        return
+
+    async for chunk in llm_handler.stream_response_async(analysis.text, context, flight.meta):
+        flight.publish(chunk)
+    if not flight.meta.get("interrupted"):
+        _answer_cache_store(request, analysis, context, "".join(flight.parts), flight.meta.get("provider", "none"))
+
+
+def _replay_chunks(text: str):
+    """Split cached text into word-sized pieces that concatenate back to `text`."""
+    return [piece for piece in re.split(r"(?<=\s)(?=\S)", text) if piece]
 
 
 @router.post("/query", response_model=WisdomResponse)
-async def get_wisdom(request: Request, body: QueryRequest):
+async def get_wisdom(request: Request, body: QueryRequest, response: Response):
     retriever      = getattr(request.app.state, "retriever",   None)
     llm_handler    = getattr(request.app.state, "llm_handler", None)
-    sanskrit_index = getattr(request.app.state, "sanskrit",    {})
+    verse_table    = getattr(request.app.state, "verse_table", None)
 
     if not retriever or not llm_handler:
         raise HTTPException(
@@ -27,15 +257,23 @@ async def get_wisdom(request: Request, body: QueryRequest):
         )
 
     # ── Validate / create session ─────────────────────────────────────────────
-    session_id = body.session_id
-    if not session_id or not _session_manager.get_session(session_id):
-        session_id = _session_manager.create_session()
+    session_id = await _ensure_session(request, body.session_id)
+
+    timer = RequestTimer(route="query")
 
-    # ── Classify intent ───────────────────────────────────────────────────────
-    query_type, _confidence = classify_query(body.query)
+    # ── Analyze once: intent, mood, themes, expansion, disclaimer ─────────────
+    with timer.stage("analysis"):
+        analysis = analyze_query(body.query)
+    query_type = analysis.query_type
+
+    # ── Explicit verse reference ("BG 2.47"): answer from that verse ─────────
+    ref_verses = _reference_verses(request, analysis)
+    if ref_verses:
+        query_type = QueryType.SPIRITUAL
 
     # ── OFF_TOPIC: static redirect, no LLM, no RAG ───────────────────────────
     if query_type == QueryType.OFF_TOPIC:
+        _finish_timing(response, timer, query_type, None)
         return WisdomResponse(
             response=get_off_topic_response(),
             used_verses=[],
@@ -46,11 +284,14 @@ async def get_wisdom(request: Request, body: QueryRequest):
 
     # ── GREETING / FACTUAL: LLM only, no RAG ─────────────────────────────────
     if query_type in (QueryType.GREETING, QueryType.FACTUAL):
-        result = llm_handler.generate_typed_response(body.query, query_type)
+        with timer.stage("llm"):
+            result = await llm_handler.generate_typed_response_async(body.query, query_type)
 
-        _session_manager.add_to_history(
-            session_id, body.query, result["response"], [], result.get("themes", [])
+        await _session_call(
+            request, _session_manager.add_to_history,
+            session_id, body.query, result["response"], [], result.get("themes", []),
         )
+        _finish_timing(response, timer, query_type, result.get("provider"))
 
         return WisdomResponse(
             response=result["response"],
@@ -60,18 +301,24 @@ async def get_wisdom(request: Request, body: QueryRequest):
             error=result.get("error", False),
         )
 
-    # ── SPIRITUAL: full RAG + deep guidance ──────────────────────────────────
-    conversation_context = _session_manager.get_conversation_context(session_id, last_n=3)
-
-    context = retriever.create_context_for_llm(
-        body.query,
-        conversation_context=conversation_context,
-        max_context_length=3500,
-    )
-
-    result = llm_handler.generate_response(body.query, context)
-
-    _session_manager.add_to_history(
+    # ── SPIRITUAL: full RAG + deep guidance (once per identical in-flight query)
+    conversation_context = await _session_call(request, _session_manager.get_conversation_context, session_id, 3)
+
+    flight, leader = _flights.join(InFlightRegistry.key("query", analysis, conversation_context))
+    try:
+        if leader:
+            flight.start(_answer_spiritual(
+                request, retriever, llm_handler, analysis, ref_verses, conversation_context, timer
+            ))
+            result, cached = await flight.result()
+        else:
+            with timer.stage("single_flight"):
+                result, cached = await flight.result()
+    finally:
+        flight.detach()
+
+    await _session_call(
+        request, _session_manager.add_to_history,
         session_id,
         body.query,
         result["response"],
@@ -79,24 +326,9 @@ async def get_wisdom(request: Request, body: QueryRequest):
         result.get("themes", []),
     )
 
-    verses = [
-        VerseInfo(
-            chapter=v.get("chapter", 0),
-            verse=v.get("verse", 0),
-            text=v.get("text", ""),
-            theme=v.get("theme", "general"),
-            verse_id=v.get("verse_id", ""),
-            relevance_score=v.get("relevance_score", 0.0),
-            sanskrit=sanskrit_index.get(
-                f"{v.get('chapter', 0)}_{v.get('verse', 0)}", {}
-            ).get("sanskrit"),
-            transliteration=sanskrit_index.get(
-                f"{v.get('chapter', 0)}_{v.get('verse', 0)}", {}
-            ).get("transliteration"),
-        )
-        for v in result.get("used_verses", [])
-    ]
+    verses = [VerseInfo(**_enrich(verse_table, v)) for v in result.get("used_verses", [])]
 
+    _finish_timing(response, timer, query_type, "cache" if cached else result.get("provider"))
     return WisdomResponse(
         response=result["response"],
         used_verses=verses,
@@ -112,8 +344,28 @@ _SSE_HEADERS = {
     "Connection": "keep-alive",
 }
 
-def _sse(payload: dict) -> str:
-    return f"data: {json.dumps(payload)}\n\n"
+async def _tracked(chunks, parts: list, timer: RequestTimer):
+    """Provider chunks, collected into `parts`, marking time-to-first-token."""
+    async for chunk in chunks:
+        timer.mark("llm_ttft")
+        parts.append(chunk)
+        yield chunk
+
+
+def _coalesced(chunks):
+    """Merge tiny provider chunks into fewer SSE frames (SSE_FLUSH_BYTES / SSE_FLUSH_MS)."""
+    return sse.coalesce(chunks, settings.SSE_FLUSH_BYTES, settings.SSE_FLUSH_MS / 1000.0)
+
+
+def _finish_timing(response: Response, timer: RequestTimer, query_type: QueryType, provider) -> None:
+    """Publish stage metrics and expose them as a Server-Timing header."""
+    timer.finish(query_type=query_type.value, provider=provider)
+    response.headers["Server-Timing"] = timer.server_timing()
+
+
+def _stream_headers(timer: RequestTimer) -> dict:
+    """SSE headers plus Server-Timing for the stages finished before streaming began."""
+    return {**_SSE_HEADERS, "Server-Timing": timer.server_timing()}
 
 
 @router.post("/query/stream")
@@ -127,97 +379,133 @@ async def stream_wisdom(request: Request, body: QueryRequest):
     """
     retriever      = getattr(request.app.state, "retriever",   None)
     llm_handler    = getattr(request.app.state, "llm_handler", None)
-    sanskrit_index = getattr(request.app.state, "sanskrit",    {})
+    verse_table    = getattr(request.app.state, "verse_table", None)
 
     if not retriever or not llm_handler:
         def _err():
-            yield _sse({"type": "error", "message": "Service is still initializing. Please wait."})
+            yield sse.event_frame({"type": "error", "message": "Service is still initializing. Please wait."})
         return StreamingResponse(_err(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
-    session_id = body.session_id
-    if not session_id or not _session_manager.get_session(session_id):
-        session_id = _session_manager.create_session()
+    session_id = await _ensure_session(request, body.session_id)
+
+    timer = RequestTimer(route="query_stream")
+    with timer.stage("analysis"):
+        analysis = analyze_query(body.query)
+    query_type = analysis.query_type
 
-    query_type, _ = classify_query(body.query)
+    # ── Explicit verse reference ("BG 2.47"): answer from that verse ─────────
+    ref_verses = _reference_verses(request, analysis)
+    if ref_verses:
+        query_type = QueryType.SPIRITUAL
 
     # ── OFF_TOPIC: static, no LLM ────────────────────────────────────────────
     if query_type == QueryType.OFF_TOPIC:
         text = get_off_topic_response()
         def _off_topic():
-            yield _sse({"type": "token",  "content": text})
-            yield _sse({"type": "done",   "verses": [], "themes": [], "session_id": session_id})
-        return StreamingResponse(_off_topic(), media_type="text/event-stream", headers=_SSE_HEADERS)
+            timer.finish(query_type=query_type.value)
+            yield sse.token_frame(text)
+            yield sse.event_frame({"type": "done", "verses": [], "themes": [], "session_id": session_id,
+                                   "timing": timer.as_dict()})
+        return StreamingResponse(_off_topic(), media_type="text/event-stream", headers=_stream_headers(timer))
 
     # ── GREETING / FACTUAL: async stream without RAG ─────────────────────────
     if query_type in (QueryType.GREETING, QueryType.FACTUAL):
         async def _typed():
-            full = ""
-            async for chunk in llm_handler.stream_typed_response_async(body.query, query_type):
-                full += chunk
-                yield _sse({"type": "token", "content": chunk})
-            _session_manager.add_to_history(session_id, body.query, full, [], [])
-            yield _sse({"type": "done", "verses": [], "themes": [], "session_id": session_id})
-        return StreamingResponse(_typed(), media_type="text/event-stream", headers=_SSE_HEADERS)
+            parts = []
+            meta = {}
+            with timer.stage("llm_stream"):
+                chunks = llm_handler.stream_typed_response_async(body.query, query_type, meta)
+                async for text in _coalesced(_tracked(chunks, parts, timer)):
+                    yield sse.token_frame(text)
+            await _session_call(request, _session_manager.add_to_history,
+                                session_id, body.query, "".join(parts), [], [])
+            timer.finish(query_type=query_type.value, provider=meta.get("provider"))
+            yield sse.event_frame({"type": "done", "verses": [], "themes": [], "session_id": session_id,
+                                   "timing": timer.as_dict()})
+        return StreamingResponse(_typed(), media_type="text/event-stream", headers=_stream_headers(timer))
 
     # ── SPIRITUAL: RAG retrieval first, then async stream ────────────────────
-    conversation_context = _session_manager.get_conversation_context(session_id, last_n=3)
-    context = retriever.create_context_for_llm(
-        body.query,
-        conversation_context=conversation_context,
-        max_context_length=3500,
-    )
-    needs_disclaimer = any(kw in body.query.lower() for kw in MENTAL_HEALTH_KEYWORDS)
-
-    # Detect seeker's emotional state — injects tone overlay into system prompt
-    mood, _mood_score = detect_mood(body.query)
-    context["mood"] = mood.value
-
-    def _enrich(v):
-        key = f"{v.get('chapter', 0)}_{v.get('verse', 0)}"
-        sk  = sanskrit_index.get(key, {})
-        return {
-            "chapter":         v.get("chapter", 0),
-            "verse":           v.get("verse", 0),
-            "text":            v.get("text", ""),
-            "theme":           v.get("theme", "general"),
-            "verse_id":        v.get("verse_id", ""),
-            "relevance_score": v.get("relevance_score", 0.0),
-            "sanskrit":        sk.get("sanskrit"),
-            "transliteration": sk.get("transliteration"),
-        }
+    # Identical in-flight queries attach to one generation and replay its tokens
+    conversation_context = await _session_call(request, _session_manager.get_conversation_context, session_id, 3)
+    flight, leader = _flights.join(InFlightRegistry.key("stream", analysis, conversation_context))
+    try:
+        if leader:
+            flight.start(_stream_spiritual(
+                flight, request, retriever, llm_handler, analysis, ref_verses, conversation_context, timer
+            ))
+            context, cached = await flight.context()
+        else:
+            with timer.stage("single_flight"):
+                context, cached = await flight.context()
+    except BaseException:
+        flight.detach()
+        raise
+    needs_disclaimer = analysis.needs_disclaimer
+    mood = analysis.mood
 
     async def _spiritual():
-        full = ""
-        async for chunk in llm_handler.stream_response_async(body.query, context):
-            full += chunk
-            yield _sse({"type": "token", "content": chunk})
-
+        try:
+            with timer.stage("cache_replay" if cached else "llm_stream"):
+                async for text in _coalesced(flight.tokens()):
+                    if not cached:
+                        timer.mark("llm_ttft")
+                    yield sse.token_frame(text)
+        finally:
+            flight.detach()
+
+        parts = list(flight.parts)
         if needs_disclaimer:
-            full += MENTAL_HEALTH_DISCLAIMER
-            yield _sse({"type": "token", "content": MENTAL_HEALTH_DISCLAIMER})
+            parts.append(MENTAL_HEALTH_DISCLAIMER)
+            yield sse.token_frame(MENTAL_HEALTH_DISCLAIMER)
+        full = "".join(parts)
 
         used_verses = context.get("used_verses", [])
         themes      = context.get("query_themes", [])
-        _session_manager.add_to_history(session_id, body.query, full, used_verses, themes)
+        await _session_call(request, _session_manager.add_to_history,
+                            session_id, body.query, full, used_verses, themes)
 
-        verses_payload = [_enrich(v) for v in used_verses]
-        yield _sse({"type": "done", "verses": verses_payload, "themes": themes, "session_id": session_id, "mood": mood.value})
+        verses_payload = [_enrich(verse_table, v) for v in used_verses]
+        timer.finish(query_type=query_type.value, provider=flight.meta.get("provider"))
+        yield sse.event_frame({
+            "type": "done", "verses": verses_payload, "themes": themes,
+            "session_id": session_id, "mood": mood.value, "cached": cached,
+            "timing": timer.as_dict(),
+        })
 
-    return StreamingResponse(_spiritual(), media_type="text/event-stream", headers=_SSE_HEADERS)
+    return StreamingResponse(_spiritual(), media_type="text/event-stream", headers=_stream_headers(timer))
 
 
 @router.get("/session/{session_id}/history", response_model=SessionHistoryResponse)
-async def get_session_history(session_id: str):
-    history = _session_manager.get_history(session_id)
+async def get_session_history(session_id: str, request: Request):
+    history = await _session_call(request, _session_manager.get_history, session_id)
     return SessionHistoryResponse(session_id=session_id, history=history)
 
 
 @router.delete("/session/{session_id}")
-async def clear_session(session_id: str):
-    _session_manager.delete_session(session_id)
+async def clear_session(session_id: str, request: Request):
+    await _session_call(request, _session_manager.delete_session, session_id)
     return {"message": "Session cleared", "session_id": session_id}
 
 
 @router.get("/sessions/stats")
-async def session_stats():
-    return _session_manager.get_stats()
+async def session_stats(request: Request):
+    return await _session_call(request, _session_manager.get_stats)
+
+
+@router.get("/cache/stats")
+async def cache_stats(request: Request):
+    """Hit rates for the semantic answer cache, the query-embedding cache and single-flight coalescing."""
+    answer_cache = getattr(request.app.state, "answer_cache", None)
+    vector_store = getattr(request.app.state, "vector_store", None)
+    return {
+        "answer_cache": answer_cache.stats() if answer_cache else None,
+        "query_embedding_cache": vector_store.query_cache.stats() if vector_store else None,
+        "single_flight": _flights.stats(),
+    }
+
+
+@router.get("/providers/stats")
+async def provider_stats(request: Request):
+    """Circuit state, latency EWMAs and error rate per LLM provider, plus hedging counters."""
+    llm_handler = getattr(request.app.state, "llm_handler", None)
+    return llm_handler.provider_stats() if llm_handler else {}
@@ -27,19 +27,90 @@ class Settings:
     DEFAULT_LLM: str = os.getenv("DEFAULT_LLM", "gemini-3.1-flash-lite-preview")
     # Groq fallback model — used automatically when Gemini hits rate limits
     GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+    # Provider routing: Groq must look this many times faster than Gemini to be
+    # chosen first; a rate-limited provider without Retry-After is skipped for
+    # this long (doubling on each repeat)
+    LLM_FALLBACK_PENALTY: float = float(os.getenv("LLM_FALLBACK_PENALTY", "2.0"))
+    LLM_CIRCUIT_COOLDOWN_SECONDS: float = float(os.getenv("LLM_CIRCUIT_COOLDOWN_SECONDS", "5"))
+    # Hedged streaming: if the first token is this late, also start the next
+    # provider and keep whichever streams first (0 = off; costs extra quota)
+    LLM_HEDGE_AFTER_MS: float = float(os.getenv("LLM_HEDGE_AFTER_MS", "0"))
 
     # ── Vector store ─────────────────────────────────────────────────────────
     VECTOR_DB_PATH: str = _abs("VECTOR_DB_PATH", ROOT_DIR / "vector_db")
     COLLECTION_NAME: str = os.getenv("COLLECTION_NAME", "gita_wisdom")
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    # "chroma" (persistent HNSW) or "numpy" (in-process exact search, no chromadb import)
+    VECTOR_ENGINE: str = os.getenv("VECTOR_ENGINE", "chroma").lower()
+    # Precomputed embedding artifact written by setup.py; the numpy engine
+    # memory-maps it at startup instead of embedding the corpus
+    EMBEDDING_ARTIFACT_DIR: str = _abs("EMBEDDING_ARTIFACT_DIR", Path(VECTOR_DB_PATH) / "artifacts")
+    # fastembed worker processes for setup.py indexing (0 = every core, 1 = in-process;
+    # each worker loads its own copy of the model)
+    INDEX_EMBED_WORKERS: int = int(os.getenv("INDEX_EMBED_WORKERS", "0"))
+    # Chunk vectors: "embed" (run the model on the chunk text), or pooled from
+    # its verses' vectors — "mean" / "weighted" (by word count); compare with
+    #   python setup.py --compare-chunk-pooling
+    CHUNK_EMBEDDING: str = os.getenv("CHUNK_EMBEDDING", "embed").lower()
+    # LRU cache of query embeddings — bounded by entry count and total size
+    EMBED_CACHE_SIZE: int = int(os.getenv("EMBED_CACHE_SIZE", "2048"))
+    EMBED_CACHE_MAX_MB: float = float(os.getenv("EMBED_CACHE_MAX_MB", "8"))
+    # Pinned fastembed model directory — ship it with the build and set
+    # EMBED_OFFLINE=true so startup never downloads from the network
+    FASTEMBED_CACHE_DIR: str = _abs("FASTEMBED_CACHE_DIR", ROOT_DIR / ".fastembed_cache")
+    EMBED_OFFLINE: bool = os.getenv("EMBED_OFFLINE", "false").lower() == "true"
+    # Load the model, run a dummy embed + search during startup (not on first request)
+    WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+    # Warm up on a background thread and serve lexical (BM25) retrieval meanwhile
+    WARMUP_IN_BACKGROUND: bool = os.getenv("WARMUP_IN_BACKGROUND", "false").lower() == "true"
 
     # ── Retrieval ─────────────────────────────────────────────────────────────
-    MAX_CONTEXT_LENGTH: int = int(os.getenv("MAX_CONTEXT_LENGTH", "3500"))
+    # Whole LLM prompt (system prompt, mood overlay, conversation, question and
+    # verses), in estimated tokens — verses fill whatever the rest leaves
+    PROMPT_TOKEN_BUDGET: int = int(os.getenv("PROMPT_TOKEN_BUDGET", "1800"))
     MAX_RESULTS: int = int(os.getenv("MAX_RESULTS", "10"))
     RELEVANCE_THRESHOLD: float = 0.20
+    # "dense" (vector only), "hybrid" (vector + BM25, rank-fused) or "lexical" (BM25 only)
+    RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "dense").lower()
+    # Verses either side of a directly referenced verse ("BG 2.47") added to its context
+    VERSE_REFERENCE_NEIGHBOURS: int = int(os.getenv("VERSE_REFERENCE_NEIGHBOURS", "0"))
+    # Dedicated thread pool for embedding + vector search (keeps the event loop free)
+    RETRIEVAL_WORKERS: int = int(os.getenv("RETRIEVAL_WORKERS", "4"))
+
+    # ── Semantic answer cache ─────────────────────────────────────────────────
+    # Similar SPIRITUAL queries (same mood + same verses) reuse a cached answer
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_THRESHOLD: float = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+    ANSWER_CACHE_TTL_SECONDS: int = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", "21600"))
+    ANSWER_CACHE_MAX_ENTRIES: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "512"))
+
+    # ── Streaming ─────────────────────────────────────────────────────────────
+    # Provider chunks are merged into one SSE frame until this many UTF-8 bytes
+    # are buffered or SSE_FLUSH_MS has passed (0 = one frame per chunk)
+    SSE_FLUSH_BYTES: int = int(os.getenv("SSE_FLUSH_BYTES", "256"))
+    SSE_FLUSH_MS: float = float(os.getenv("SSE_FLUSH_MS", "30"))
+
+    # ── Browse endpoints ──────────────────────────────────────────────────────
+    # Cache-Control max-age for /themes and /chapter/{n}/verses (the daily verse
+    # is additionally capped at the next midnight)
+    BROWSE_CACHE_MAX_AGE: int = int(os.getenv("BROWSE_CACHE_MAX_AGE", "86400"))
+
+    # ── Single-flight ─────────────────────────────────────────────────────────
+    # Identical SPIRITUAL queries in flight at the same time (same text, mood,
+    # themes and conversation history) share one retrieval + LLM generation
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+    # ── Sessions ──────────────────────────────────────────────────────────────
+    SESSION_TTL_HOURS: int = int(os.getenv("SESSION_TTL_HOURS", "2"))
+    # Hard cap on live sessions — least-recently-used sessions are evicted past it
+    SESSION_MAX_ACTIVE: int = int(os.getenv("SESSION_MAX_ACTIVE", "10000"))
+    # "memory" (per-process, default) or "sqlite" (shared by all workers, survives restarts)
+    SESSION_STORE: str = os.getenv("SESSION_STORE", "memory").lower()
+    SESSION_DB_PATH: str = _abs("SESSION_DB_PATH", ROOT_DIR / "sessions.db")
+    SESSION_CLEANUP_INTERVAL_SECONDS: int = int(os.getenv("SESSION_CLEANUP_INTERVAL_SECONDS", "60"))
 
     # ── Misc ──────────────────────────────────────────────────────────────────
-    DATA_PATH: str = str(ROOT_DIR / "data" / "processed_gita_data.json")
+    DATA_PATH: str = str(ROOT_DIR / "data" / "processed_gita_data.jsonl")
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
     ROOT_DIR: Path = ROOT_DIR
@@ -0,0 +1,164 @@
+"""
+Semantic answer cache for Gita Wisdom Guide.
+
+Sits in front of the LLM for SPIRITUAL queries. An entry is keyed on:
+  - the query embedding  (matched by cosine similarity, not exact text)
+  - the detected mood    (the mood overlay changes the system prompt)
+  - the retrieved verse set (the verses are the answer's grounding)
+  - the conversation history (prior turns are part of the prompt, so a
+    follow-up like "tell me more about that" never gets an answer written
+    for another session's conversation)
+
+A new query with the same mood and verse set whose embedding is within
+`threshold` cosine similarity of a cached query gets the cached answer
+instantly — no Gemini/Groq call, no quota spent.
+
+Entries expire after `ttl_seconds` and the least-recently-used entry is
+evicted once `max_entries` is reached.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: float = 6 * 3600,
+        max_entries: int = 512,
+    ):
+        self.threshold   = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # entry_id → entry; order = recency of use (LRU first)
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        # (mood, verse_key, history_key) → entry_ids sharing that exact grounding
+        self._buckets: Dict[Tuple[str, Tuple[str, ...], bytes], List[int]] = {}
+        self._next_id = 0
+        self._lock    = threading.Lock()
+
+        self.hits      = 0
+        self.misses    = 0
+        self.stores    = 0
+        self.evictions = 0
+        self.expired   = 0
+
+    # ── Keys ──────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def verse_key(verses: Iterable[Dict]) -> Tuple[str, ...]:
+        return tuple(sorted(v.get("verse_id", "") for v in verses))
+
+    @staticmethod
+    def history_key(conversation_context: str) -> bytes:
+        # Same digest InFlightRegistry.key uses; empty history → b""
+        if not conversation_context:
+            return b""
+        return hashlib.blake2b(conversation_context.encode("utf-8"), digest_size=8).digest()
+
+    @staticmethod
+    def _unit(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    # ── Lookup / store ────────────────────────────────────────────────────────
+
+    def lookup(self, embedding, mood: str, verses: Iterable[Dict], conversation_context: str = "") -> Optional[Dict]:
+        """Return the closest live entry {response, provider, created_at, similarity, hits} or None."""
+        bucket_key = (mood, self.verse_key(verses), self.history_key(conversation_context))
+        query = self._unit(embedding)
+        now = time.time()
+
+        with self._lock:
+            best_id, best_sim = None, self.threshold
+            for entry_id in list(self._buckets.get(bucket_key, [])):
+                entry = self._entries[entry_id]
+                if now - entry["created_at"] > self.ttl_seconds:
+                    self._remove(entry_id)
+                    self.expired += 1
+                    continue
+                sim = float(np.dot(query, entry["embedding"]))
+                if sim >= best_sim:
+                    best_id, best_sim = entry_id, sim
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            entry = self._entries[best_id]
+            self._entries.move_to_end(best_id)
+            entry["hits"] += 1
+            self.hits += 1
+            return {
+                "response":   entry["response"],
+                "provider":   entry["provider"],
+                "created_at": entry["created_at"],
+                "similarity": round(best_sim, 4),
+                "hits":       entry["hits"],
+            }
+
+    def store(self, embedding, mood: str, verses: Iterable[Dict], response: str, provider: str,
+              conversation_context: str = "") -> None:
+        if self.max_entries <= 0 or not response:
+            return
+        bucket_key = (mood, self.verse_key(verses), self.history_key(conversation_context))
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                "embedding":  self._unit(embedding),
+                "bucket":     bucket_key,
+                "response":   response,
+                "provider":   provider,
+                "created_at": time.time(),
+                "hits":       0,
+            }
+            self._buckets.setdefault(bucket_key, []).append(entry_id)
+            self.stores += 1
+
+            while len(self._entries) > self.max_entries:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self.evictions += 1
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        bucket = self._buckets.get(entry["bucket"], [])
+        bucket.remove(entry_id)
+        if not bucket:
+            self._buckets.pop(entry["bucket"], None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    # ── Stats ─────────────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            providers: Dict[str, int] = {}
+            for entry in self._entries.values():
+                providers[entry["provider"]] = providers.get(entry["provider"], 0) + 1
+            return {
+                "entries":     len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold":   self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "hits":        self.hits,
+                "misses":      self.misses,
+                "hit_rate":    round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores":      self.stores,
+                "evictions":   self.evictions,
+                "expired":     self.expired,
+                "providers":   providers,
+            }
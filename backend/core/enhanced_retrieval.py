@@ -14,8 +14,9 @@ Key design points:
 
 import json
 import sys
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 _ROOT = Path(__file__).parent.parent.parent
 for _p in [str(_ROOT), str(_ROOT / "src")]:
@@ -23,6 +24,9 @@ for _p in [str(_ROOT), str(_ROOT / "src")]:
         sys.path.insert(0, _p)
 
 from vector_store import GitaVectorStore  # noqa: E402
+from backend.core import keyword_engine as kw  # noqa: E402
+from backend.core.lexical_index import BM25Index  # noqa: E402
+from backend.core.prompt_budget import DEFAULT_PROMPT_TOKEN_BUDGET, Passage, select_passages  # noqa: E402
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Load theme config from JSON (with hardcoded fallback)
@@ -75,6 +79,29 @@ def _load_theme_config() -> Tuple[Dict[str, List[str]], Dict[str, str]]:
 
 TOPIC_THEMES, QUERY_EXPANSIONS = _load_theme_config()
 
+CONTRACTIONS: Dict[str, str] = {
+    "i'm": "i am", "can't": "cannot", "won't": "will not",
+    "don't": "do not", "i've": "i have", "i'll": "i will",
+    "i'd": "i would", "it's": "it is", "isn't": "is not",
+    "aren't": "are not", "wasn't": "was not", "didn't": "did not",
+    "couldn't": "could not", "shouldn't": "should not",
+}
+
+
+RETRIEVAL_MODES = ("dense", "hybrid", "lexical")
+
+# Reciprocal rank fusion constant (Cormack et al.) — damps the weight of top ranks
+RRF_K = 60
+
+# BM25 scores are unbounded; score / (score + BM25_HALF_SCORE) maps them onto
+# the 0–1 relevance scale used for thresholds and display (5.0 → 0.5)
+BM25_HALF_SCORE = 5.0
+
+
+def _stage(timer, name: str):
+    """Time a block on the request timer (backend.core.metrics), or do nothing."""
+    return timer.stage(name) if timer is not None else nullcontext()
+
 
 class EnhancedGitaRetriever:
     """
@@ -84,31 +111,60 @@ class EnhancedGitaRetriever:
     - L2 distance → similarity conversion
     - Score threshold filtering
     - Smart deduplication
+
+    Retrieval modes (needs a BM25Index for anything but "dense"):
+    - dense   : vector search only
+    - hybrid  : vector + BM25 rankings fused with reciprocal rank fusion
+    - lexical : BM25 only — no embedding model involved
+    While the embedding model is not loaded yet, dense / hybrid degrade to
+    lexical (and trigger a background model load) instead of blocking.
     """
 
-    def __init__(self, vector_store: GitaVectorStore, relevance_threshold: float = 0.20):
+    def __init__(
+        self,
+        vector_store: GitaVectorStore,
+        relevance_threshold: float = 0.20,
+        mode: str = "dense",
+        lexical_index: Optional[BM25Index] = None,
+    ):
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}'. Valid modes: {RETRIEVAL_MODES}")
+        if mode != "dense" and lexical_index is None:
+            raise ValueError(f"Retrieval mode '{mode}' needs a lexical index")
         self.vector_store = vector_store
         self.relevance_threshold = relevance_threshold
+        self.mode = mode
+        self.lexical_index = lexical_index
+
+    @property
+    def active_mode(self) -> str:
+        """The mode this request will actually run in (see class docstring)."""
+        if self.mode == "lexical":
+            return "lexical"
+        if self.lexical_index is not None and not self.vector_store.model_ready:
+            self.vector_store.start_background_warm_up()
+            return "lexical"
+        return self.mode
 
     # ─── Query preprocessing ──────────────────────────────────────────────────
 
-    def preprocess_query(self, query: str) -> Tuple[str, str]:
+    @staticmethod
+    def preprocess_query(query: str, matches: Optional[kw.KeywordMatches] = None) -> Tuple[str, str]:
         """Returns (original_query, expanded_query)."""
         expanded = query.lower().strip()
 
-        contractions = {
-            "i'm": "i am", "can't": "cannot", "won't": "will not",
-            "don't": "do not", "i've": "i have", "i'll": "i will",
-            "i'd": "i would", "it's": "it is", "isn't": "is not",
-            "aren't": "are not", "wasn't": "was not", "didn't": "did not",
-            "couldn't": "could not", "shouldn't": "should not",
-        }
-        for abbrev, full in contractions.items():
-            expanded = expanded.replace(abbrev, full)
+        if matches is None:
+            matches = kw.scan_query(query)
+        span = kw.stripped_span(matches.text, expanded)
 
-        expansion_parts = [
-            exp for kw, exp in QUERY_EXPANSIONS.items() if kw in expanded
-        ]
+        # Expanding contractions changes the text, so the scan of the raw
+        # query no longer applies — rescan the rewritten text in that case
+        if span is None or matches.has(kw.CONTRACTION, *span):
+            for abbrev, full in CONTRACTIONS.items():
+                expanded = expanded.replace(abbrev, full)
+            matches, span = kw.get_keyword_engine().scan(expanded), (0, len(expanded))
+
+        expansion_parts = [QUERY_EXPANSIONS[k] for k in matches.keys(kw.EXPANSION, *span)]
         if expansion_parts:
             expanded = expanded + " " + " ".join(expansion_parts)
 
@@ -116,18 +172,20 @@ class EnhancedGitaRetriever:
 
     # ─── Theme extraction ─────────────────────────────────────────────────────
 
-    def extract_query_themes(self, query: str) -> List[str]:
+    @staticmethod
+    def extract_query_themes(query: str, matches: Optional[kw.KeywordMatches] = None) -> List[str]:
         """
         Extract ALL relevant themes (not first-match-wins).
         Returns themes sorted by cumulative relevance weight.
         """
-        query_lower = query.lower()
+        if matches is None:
+            matches = kw.scan_query(query)
         theme_scores: Dict[str, int] = {}
 
-        for topic, themes in TOPIC_THEMES.items():
-            if topic in query_lower:
-                for rank, theme in enumerate(themes):
-                    theme_scores[theme] = theme_scores.get(theme, 0) + (len(themes) - rank)
+        for topic in matches.keys(kw.TOPIC):
+            themes = TOPIC_THEMES[topic]
+            for rank, theme in enumerate(themes):
+                theme_scores[theme] = theme_scores.get(theme, 0) + (len(themes) - rank)
 
         if not theme_scores:
             return ["general"]
@@ -135,46 +193,64 @@ class EnhancedGitaRetriever:
         sorted_themes = sorted(theme_scores.items(), key=lambda x: x[1], reverse=True)
         return [theme for theme, _ in sorted_themes[:4]]
 
+    def embed_analysis(self, analysis, timer=None):
+        """
+        Attach the query embedding to a QueryAnalysis. The expanded query is
+        embedded in the same ONNX call, so the retrieval plan finds it in the
+        query-embedding cache.
+        """
+        if self.active_mode == "lexical":
+            return analysis   # nothing will be embedded for this request
+        try:
+            with _stage(timer, "embedding"):
+                vectors = self.vector_store.embed_queries([analysis.text, analysis.expanded_query])
+        except Exception:
+            return analysis   # retrieval falls back on its own; answer cache is skipped
+        return analysis.with_embedding(vectors[0])
+
     # ─── Core retrieval ───────────────────────────────────────────────────────
 
-    def retrieve_relevant_verses(self, query: str, max_results: int = 10) -> List[Dict]:
+    def retrieve_relevant_verses(
+        self,
+        query: str,
+        max_results: int = 10,
+        timer=None,
+        analysis=None,
+    ) -> List[Dict]:
         """
         Multi-strategy retrieval:
         1. Theme-filtered semantic search (top 3 themes)
         2. General semantic search with expanded query
         3. General semantic search with original query (catches expansion over-recall)
 
+        All searches run as one batch (see _build_query_plan / _run_query_plan).
         Then: threshold filter → deduplicate → sort → return top N
-        """
-        original_query, expanded_query = self.preprocess_query(query)
-        themes = self.extract_query_themes(original_query)
-
-        all_results: List[Dict] = []
-
-        # 1. Theme-filtered searches
-        for theme in themes[:3]:
-            if theme == "general":
-                continue
-            try:
-                raw = self.vector_store.search_by_theme(expanded_query, theme, n_results=4)
-                all_results.extend(self._format_results(raw))
-            except Exception:
-                pass
 
-        # 2. General semantic search with expanded query
-        try:
-            raw = self.vector_store.search_similar(expanded_query, n_results=8)
-            all_results.extend(self._format_results(raw))
-        except Exception:
-            pass
-
-        # 3. Fallback with original query
-        if original_query.lower() != expanded_query:
-            try:
-                raw = self.vector_store.search_similar(original_query, n_results=5)
-                all_results.extend(self._format_results(raw))
-            except Exception:
-                pass
+        `analysis` (backend.core.query_analysis.QueryAnalysis) supplies the
+        expanded query, themes and query embedding computed once per request.
+        """
+        known: Dict[str, List[float]] = {}
+        if analysis is not None:
+            original_query, expanded_query = query, analysis.expanded_query
+            themes = list(analysis.themes)
+            if analysis.embedding is not None:
+                known[query] = analysis.embedding
+        else:
+            matches = kw.scan_query(query)
+            original_query, expanded_query = self.preprocess_query(query, matches)
+            themes = self.extract_query_themes(original_query, matches)
+
+        mode = self.active_mode
+        plan = self._build_query_plan(original_query, expanded_query, themes)
+
+        # One ranked list per search in the plan, from each retriever in use
+        ranked_lists: List[List[Dict]] = []
+        if mode != "lexical":
+            ranked_lists.extend(self._format_results(raw) for raw in self._run_query_plan(plan, timer, known))
+        if mode != "dense":
+            with _stage(timer, "lexical_search"):
+                ranked_lists.extend(self._run_lexical_plan(plan))
+        all_results = [r for ranked in ranked_lists for r in ranked]
 
         # Filter by relevance threshold
         filtered = [r for r in all_results if r["relevance_score"] >= self.relevance_threshold]
@@ -184,7 +260,11 @@ class EnhancedGitaRetriever:
             filtered = sorted(all_results, key=lambda x: x["relevance_score"], reverse=True)[:5]
 
         unique = self._smart_deduplicate(filtered)
-        unique.sort(key=lambda x: x["relevance_score"], reverse=True)
+        if mode == "hybrid":
+            fused = self._rrf_scores(ranked_lists)
+            unique.sort(key=lambda x: fused[self._doc_key(x)], reverse=True)
+        else:
+            unique.sort(key=lambda x: x["relevance_score"], reverse=True)
 
         # Prefer full verses; pad with chunks if needed
         verses = [r for r in unique if r["content_type"] == "verse"]
@@ -195,8 +275,100 @@ class EnhancedGitaRetriever:
 
         return combined[:max_results]
 
+    def _build_query_plan(
+        self, original_query: str, expanded_query: str, themes: List[str]
+    ) -> List[Tuple[str, int, Optional[Dict]]]:
+        """
+        The searches behind one retrieval, as (query, n_results, filter) tuples:
+        1. Theme-filtered semantic search (top 3 themes)
+        2. General semantic search with expanded query
+        3. General semantic search with original query (only if expansion changed it)
+        """
+        plan: List[Tuple[str, int, Optional[Dict]]] = [
+            (expanded_query, 4, {"theme": theme})
+            for theme in themes[:3]
+            if theme != "general"
+        ]
+        plan.append((expanded_query, 8, None))
+        if original_query.lower() != expanded_query:
+            plan.append((original_query, 5, None))
+        return plan
+
+    def _run_query_plan(
+        self,
+        plan: List[Tuple[str, int, Optional[Dict]]],
+        timer=None,
+        known: Optional[Dict[str, List[float]]] = None,
+    ) -> List[Dict]:
+        """
+        Execute the whole plan in one vector-store batch: each distinct string
+        is embedded once (strings in `known` are not embedded at all), and the
+        searches share a single vectorized pass.
+        If the batch fails, fall back to running each search on its own so one
+        bad filter cannot sink the others.
+        """
+        try:
+            embeddings = dict(known or {})
+            texts = [t for t in dict.fromkeys(q for q, _, _ in plan) if t not in embeddings]
+            with _stage(timer, "embedding"):
+                if texts:
+                    embeddings.update(zip(texts, self.vector_store.embed_queries(texts)))
+            with _stage(timer, "vector_search"):
+                return self.vector_store.search_batch(plan, embeddings)
+        except Exception:
+            pass
+
+        results = []
+        for query, n_results, where in plan:
+            try:
+                results.append(self.vector_store.search_similar(query, n_results, where))
+            except Exception:
+                pass
+        return results
+
+    def _run_lexical_plan(self, plan: List[Tuple[str, int, Optional[Dict]]]) -> List[List[Dict]]:
+        """The same searches as the dense plan, answered by the BM25 index."""
+        results = []
+        for query, n_results, where in plan:
+            try:
+                hits = self.lexical_index.search(query, n_results, where)
+            except ValueError:
+                continue
+            results.append(self._format_lexical(hits))
+        return results
+
+    @staticmethod
+    def _doc_key(r: Dict) -> str:
+        return r.get("verse_id") or r.get("text", "")[:80]
+
+    def _rrf_scores(self, ranked_lists: List[List[Dict]]) -> Dict[str, float]:
+        """Reciprocal rank fusion: each list adds 1 / (RRF_K + rank) per document."""
+        fused: Dict[str, float] = {}
+        for ranked in ranked_lists:
+            for rank, r in enumerate(ranked, start=1):
+                key = self._doc_key(r)
+                fused[key] = fused.get(key, 0.0) + 1.0 / (RRF_K + rank)
+        return fused
+
     # ─── Formatting ───────────────────────────────────────────────────────────
 
+    def _format_lexical(self, hits: List[Tuple[int, float]]) -> List[Dict]:
+        """BM25 hits in the same shape as _format_results (distance is 0 — not a vector match)."""
+        formatted = []
+        for doc_index, score in hits:
+            doc = self.lexical_index.documents[doc_index]
+            formatted.append({
+                "text": doc["text"],
+                "chapter": int(doc.get("chapter") or 0),
+                "verse": int(doc.get("verse") or 0),
+                "verse_id": doc.get("verse_id", ""),
+                "theme": doc.get("theme", "general"),
+                "content_type": doc.get("content_type", "verse"),
+                "relevance_score": round(score / (score + BM25_HALF_SCORE), 3),
+                "distance": 0.0,
+            })
+        return formatted
+
     def _format_results(self, raw: Dict) -> List[Dict]:
         """
         Convert ChromaDB results to structured dicts.
@@ -266,7 +438,10 @@ class EnhancedGitaRetriever:
         self,
         query: str,
         conversation_context: str = "",
-        max_context_length: int = 3500,
+        token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+        timer=None,
+        analysis=None,
+        reserved_tokens: int = 0,
     ) -> Dict:
         """
         Build the full context dict that the LLM handler needs:
@@ -274,37 +449,32 @@ class EnhancedGitaRetriever:
         - used_verses        : structured list for the API response
         - query_themes       : detected themes
         - conversation_context: prior Q&A for continuity
+        - prompt_tokens      : estimated prompt size (see build_context)
         """
-        relevant_verses = self.retrieve_relevant_verses(query)
-        themes = self.extract_query_themes(query)
-
-        context_parts = []
-        used_verses = []
-        total_length = 0
+        relevant_verses = self.retrieve_relevant_verses(query, timer=timer, analysis=analysis)
+        themes = list(analysis.themes) if analysis is not None else self.extract_query_themes(query)
+        return self.build_context(relevant_verses, themes, conversation_context, token_budget, timer, reserved_tokens)
 
-        # Full verses first
-        for v in relevant_verses:
-            if v["content_type"] != "verse":
-                continue
-            label = f"[Chapter {v['chapter']}, Verse {v['verse']} | Theme: {v['theme'].title()}]"
-            verse_text = f"{label}\n{v['text']}"
+    def build_context(
+        self,
+        relevant_verses: List[Dict],
+        themes: List[str],
+        conversation_context: str = "",
+        token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+        timer=None,
+        reserved_tokens: int = 0,
+    ) -> Dict:
+        """
+        The LLM context dict for an already chosen verse list (e.g. a direct verse reference).
 
-            if total_length + len(verse_text) <= max_context_length:
-                context_parts.append(verse_text)
-                used_verses.append(v)
-                total_length += len(verse_text)
-            else:
-                break
-
-        # Pad with chunk context if still under 60% capacity
-        if total_length < max_context_length * 0.6:
-            for v in relevant_verses:
-                if v["content_type"] != "chunk":
-                    continue
-                chunk_text = f"[Related context]\n{v['text'][:350]}"
-                if total_length + len(chunk_text) <= max_context_length:
-                    context_parts.append(chunk_text)
-                    total_length += len(chunk_text)
+        `token_budget` covers the whole prompt; `reserved_tokens` is what the
+        rest of it (system prompt, mood overlay, conversation, question)
+        already takes — see EnhancedGitaLLMHandler.prompt_overhead_tokens.
+        """
+        with _stage(timer, "context_build"):
+            context_parts, used_verses, report = self._assemble_context(
+                relevant_verses, max(0, token_budget - reserved_tokens)
+            )
 
         return {
             "formatted_context": "\n\n".join(context_parts),
@@ -312,4 +482,30 @@ class EnhancedGitaRetriever:
             "query_themes": themes,
             "total_verses": len(used_verses),
             "conversation_context": conversation_context,
+            "prompt_tokens": dict(
+                report,
+                budget=token_budget,
+                reserved_tokens=reserved_tokens,
+                total=reserved_tokens + report["context_tokens"],
+            ),
         }
+
+    def _assemble_context(self, relevant_verses: List[Dict], token_budget: int) -> Tuple[List[str], List[Dict], Dict]:
+        """
+        Pick the verses, then chunk context, that fit `token_budget` by
+        relevance per token, skipping near-duplicates — a chunk repeating a
+        chosen verse is dropped, never the verse.
+        """
+        candidates = []
+        for v in relevant_verses:
+            if v["content_type"] == "verse":
+                label = f"[Chapter {v['chapter']}, Verse {v['verse']} | Theme: {v['theme'].title()}]"
+                candidates.append(Passage(f"{label}\n{v['text']}", v.get("relevance_score", 0.0), v))
+        for v in relevant_verses:
+            if v["content_type"] == "chunk":
+                candidates.append(Passage(f"[Related context]\n{v['text'][:350]}", v.get("relevance_score", 0.0), v, tier=1))
+
+        chosen, report = select_passages(candidates, token_budget)
+        context_parts = [p.text for p in chosen]
+        used_verses = [p.item for p in chosen if p.item["content_type"] == "verse"]
+        return context_parts, used_verses, report
@@ -0,0 +1,247 @@
+"""
+Single-pass keyword engine for Gita Wisdom Guide.
+
+Every lexical component — the query classifier, the mood detector, theme
+extraction, query expansion and the mental-health disclaimer check — asks the
+same question: "which of my phrases occur in this query?". Asking it with one
+`phrase in query` test per phrase means ~450 substring scans per request.
+
+Instead, all phrase lists are compiled once into an Aho-Corasick automaton.
+One pass over the lowercased query yields every occurrence of every phrase,
+each tagged with the component (category) it belongs to:
+
+    matches = scan_query(query)
+    matches.has("off_topic")          # any off-topic signal present?
+    matches.keys("mood")              # Mood per matched phrase, in list order
+
+Matching is plain substring matching, exactly like the `in` checks it
+replaces, so results are identical. Components that look at a trimmed copy of
+the query (classify_query strips whitespace / trailing punctuation) pass that
+span to has()/keys() to ignore matches outside it.
+"""
+
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Category names — one per consuming component
+SPIRITUAL       = "spiritual"
+OFF_TOPIC       = "off_topic"
+FACTUAL_STARTER = "factual_starter"
+MOOD            = "mood"
+TOPIC           = "topic"
+EXPANSION       = "expansion"
+CONTRACTION     = "contraction"
+MENTAL_HEALTH   = "mental_health"
+
+# (category, rank within its source list, key)
+_Tag = Tuple[str, int, Hashable]
+
+
+class KeywordMatches:
+    """Every phrase occurrence found in one text, grouped by category."""
+
+    __slots__ = ("text", "_by_category")
+
+    def __init__(self, text: str, by_category: Dict[str, List[Tuple[int, int, int, Hashable]]]):
+        self.text = text
+        # category → [(start, end, rank, key), ...] in text order
+        self._by_category = by_category
+
+    def keys(self, category: str, start: int = 0, end: Optional[int] = None) -> List[Hashable]:
+        """
+        Keys of the phrases of `category` that occur inside text[start:end],
+        one per source-list entry (a phrase listed twice counts twice),
+        ordered as in the source list.
+        """
+        entries = self._by_category.get(category)
+        if not entries:
+            return []
+        if end is None:
+            end = len(self.text)
+        # rank identifies one source-list entry, so it dedupes repeated
+        # occurrences and orders the result (ranks are unique → keys never compared)
+        found = {}
+        for s, e, rank, key in entries:
+            if s >= start and e <= end:
+                found[rank] = key
+        return [found[rank] for rank in sorted(found)]
+
+    def has(self, category: str, start: int = 0, end: Optional[int] = None) -> bool:
+        entries = self._by_category.get(category)
+        if not entries:
+            return False
+        if end is None:
+            end = len(self.text)
+        for s, e, _, _ in entries:
+            if s >= start and e <= end:
+                return True
+        return False
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of phrases.
+
+    add() every phrase with its tag, then build(). build() folds the failure
+    links into a full transition table (a DFA), so scanning costs one dict
+    lookup per character regardless of how many phrases are registered.
+    Characters that start no phrase are absent from every row and lead back
+    to the root state.
+    """
+
+    def __init__(self):
+        self._patterns: Dict[str, int] = {}       # phrase → pattern id
+        self._tags: List[List[_Tag]] = []         # pattern id → tags
+        self._lengths: List[int] = []
+        self._delta: List[Dict[str, int]] = []
+        self._out: List[tuple] = []
+        self._built = False
+
+    def add(self, phrase: str, category: str, rank: int, key: Hashable) -> None:
+        if self._built:
+            raise RuntimeError("KeywordAutomaton is already built")
+        if not phrase:
+            return
+        pid = self._patterns.get(phrase)
+        if pid is None:
+            pid = self._patterns[phrase] = len(self._tags)
+            self._tags.append([])
+            self._lengths.append(len(phrase))
+        self._tags[pid].append((category, rank, key))
+
+    def add_all(self, phrases: Iterable[str], category: str, keys: Optional[Iterable[Hashable]] = None) -> None:
+        phrases = list(phrases)
+        for rank, (phrase, key) in enumerate(zip(phrases, keys if keys is not None else phrases)):
+            self.add(phrase, category, rank, key)
+
+    def build(self) -> "KeywordAutomaton":
+        # Trie
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for phrase, pid in self._patterns.items():
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        # Failure links (BFS), folded straight into the transition table:
+        # a state's row is its failure state's row overlaid with its own edges
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state].extend(out[fail[state]])
+            row = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                row[ch] = nxt
+                queue.append(nxt)
+            delta[state] = row
+
+        self._delta = delta
+        self._tags = [tuple(t) for t in self._tags]
+        # state → ((category, phrase length, rank, key), ...) for every phrase ending there
+        self._out = [
+            tuple((cat, self._lengths[pid], rank, key) for pid in o for cat, rank, key in self._tags[pid])
+            for o in out
+        ]
+        self._built = True
+        return self
+
+    def scan(self, text: str) -> KeywordMatches:
+        """All phrase occurrences in `text` (already lowercased by the caller)."""
+        delta, out = self._delta, self._out
+        by_category: Dict[str, List[Tuple[int, int, int, Hashable]]] = {}
+        state = 0
+        end = 0
+        for ch in text:
+            end += 1
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                for cat, length, rank, key in out[state]:
+                    entry = (end - length, end, rank, key)
+                    bucket = by_category.get(cat)
+                    if bucket is None:
+                        by_category[cat] = [entry]
+                    else:
+                        bucket.append(entry)
+        return KeywordMatches(text, by_category)
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._patterns)
+
+    @property
+    def state_count(self) -> int:
+        return len(self._delta)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# The shared automaton — compiled once, on first use
+# ─────────────────────────────────────────────────────────────────────────────
+
+_engine: Optional[KeywordAutomaton] = None
+_engine_lock = threading.Lock()
+
+
+def _build_engine() -> KeywordAutomaton:
+    # Imported here: these modules import this one at load time
+    from backend.core.query_classifier import (
+        _SPIRITUAL_SIGNALS, _OFF_TOPIC_SIGNALS, _FACTUAL_QUESTION_STARTERS,
+    )
+    from backend.core.mood_detector import _SIGNALS as _MOOD_SIGNALS
+    from backend.core.prompts import MENTAL_HEALTH_KEYWORDS
+    from backend.core.enhanced_retrieval import TOPIC_THEMES, QUERY_EXPANSIONS, CONTRACTIONS
+
+    engine = KeywordAutomaton()
+    engine.add_all(_SPIRITUAL_SIGNALS, SPIRITUAL)
+    engine.add_all(_OFF_TOPIC_SIGNALS, OFF_TOPIC)
+    engine.add_all(_FACTUAL_QUESTION_STARTERS, FACTUAL_STARTER)
+    mood_phrases = [(p, m) for m, phrases in _MOOD_SIGNALS.items() for p in phrases]
+    engine.add_all((p for p, _ in mood_phrases), MOOD, (m for _, m in mood_phrases))
+    engine.add_all(TOPIC_THEMES, TOPIC)
+    engine.add_all(QUERY_EXPANSIONS, EXPANSION)
+    engine.add_all(CONTRACTIONS, CONTRACTION)
+    engine.add_all(MENTAL_HEALTH_KEYWORDS, MENTAL_HEALTH)
+    return engine.build()
+
+
+def get_keyword_engine() -> KeywordAutomaton:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _build_engine()
+    return _engine
+
+
+@lru_cache(maxsize=1024)
+def scan_query(query: str) -> KeywordMatches:
+    """
+    Scan query.lower() once. Cached, so every component handling the same
+    request text shares one scan even when it is not handed the matches.
+    """
+    return get_keyword_engine().scan(query.lower())
+
+
+def stripped_span(text: str, stripped: str) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) such that text[start:end] == stripped, where `stripped` is
+    `text` with leading whitespace and some trailing characters removed.
+    None if it is not such a slice (callers then rescan `stripped`).
+    """
+    start = len(text) - len(text.lstrip())
+    end = start + len(stripped)
+    if text[start:end] != stripped:
+        return None
+    return start, end
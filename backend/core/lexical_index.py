@@ -0,0 +1,147 @@
+"""
+In-memory BM25 index for Gita Wisdom Guide.
+
+A compact inverted index over the documents in data/processed_gita_data.jsonl,
+built once at startup (a few milliseconds for the full corpus). Postings are
+stored CSR-style in flat NumPy arrays rather than per-term Python lists:
+
+    offsets[t] : offsets[t + 1]   → slice of the postings for term id t
+    doc_ids[slice]                → documents containing the term
+    impacts[slice]                → BM25 term-frequency component, precomputed
+                                    with the document-length normalisation
+
+so scoring a query is one vectorised scatter-add per query term. No embedding
+model is involved — this is what keeps retrieval available (in well under a
+millisecond) while the ONNX model is still loading, and what the hybrid
+retrieval mode fuses with dense search.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Function words carry no signal for BM25 and bloat the postings
+_STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been before being
+but by can could did do does doing for from had has have having he her here
+him his how i if in into is it its itself just me more most my myself no nor
+not now o of on once only or other our ours out over own same she should so
+some such than that the their theirs them then there these they this those
+through to too under until up upon very was we were what when where which
+while who whom why will with would you your yours yourself thou thee thy thine
+""".split())
+
+# Metadata keys a `where` filter may use (equality only, as in NumpyVectorIndex)
+_FILTER_KEYS = ("theme", "chapter", "content_type")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+class BM25Index:
+    def __init__(self, documents: List[Dict], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b  = b
+        self.documents = [d for d in documents if d.get("text")]
+        n_docs = len(self.documents)
+
+        # term → {doc: tf}
+        vocab: Dict[str, int] = {}
+        postings: List[Dict[int, int]] = []
+        lengths = np.zeros(n_docs, dtype=np.float32)
+        for doc_id, doc in enumerate(self.documents):
+            tokens = tokenize(doc["text"])
+            lengths[doc_id] = len(tokens)
+            for tok in tokens:
+                tid = vocab.get(tok)
+                if tid is None:
+                    tid = vocab[tok] = len(postings)
+                    postings.append({})
+                postings[tid][doc_id] = postings[tid].get(doc_id, 0) + 1
+
+        avgdl = float(lengths.mean()) if n_docs else 0.0
+        norm = k1 * (1.0 - b + b * lengths / avgdl) if avgdl else np.full(n_docs, k1, dtype=np.float32)
+
+        offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+        for tid, plist in enumerate(postings):
+            offsets[tid + 1] = offsets[tid] + len(plist)
+        doc_ids = np.empty(int(offsets[-1]), dtype=np.int32)
+        tfs     = np.empty(int(offsets[-1]), dtype=np.float32)
+        for tid, plist in enumerate(postings):
+            a, z = offsets[tid], offsets[tid + 1]
+            doc_ids[a:z] = list(plist.keys())
+            tfs[a:z]     = list(plist.values())
+
+        df = np.diff(offsets).astype(np.float32)
+        self._vocab   = vocab
+        self._offsets = offsets
+        self._doc_ids = doc_ids
+        self._impacts = (tfs * (k1 + 1.0) / (tfs + norm[doc_ids])).astype(np.float32)
+        self._idf     = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        # Filter masks over the same metadata keys the vector store filters on
+        self._masks: Dict[Tuple[str, str], np.ndarray] = {}
+        for key in _FILTER_KEYS:
+            values = np.array([str(d.get(key, "")) for d in self.documents])
+            for value in np.unique(values):
+                self._masks[(key, value)] = values == value
+
+    @classmethod
+    def from_json(cls, path: str, **kwargs) -> "BM25Index":
+        from corpus import load_documents
+        return cls(load_documents(path), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _mask_for(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        if not where:
+            return None
+        mask = np.ones(len(self.documents), dtype=bool)
+        for key, value in where.items():
+            if key not in _FILTER_KEYS or isinstance(value, dict):
+                raise ValueError(f"Unsupported lexical filter: {where}")
+            match = self._masks.get((key, str(value)))
+            if match is None:
+                return np.zeros(len(self.documents), dtype=bool)
+            mask &= match
+        return mask
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for `query` (repeated terms count once)."""
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for tok in set(tokenize(query)):
+            tid = self._vocab.get(tok)
+            if tid is None:
+                continue
+            a, z = self._offsets[tid], self._offsets[tid + 1]
+            # doc ids are unique within one posting list, so plain fancy-index add is safe
+            scores[self._doc_ids[a:z]] += self._idf[tid] * self._impacts[a:z]
+        return scores
+
+    def search(self, query: str, n_results: int = 10, where: Optional[Dict] = None) -> List[Tuple[int, float]]:
+        """Top documents as (doc_index, bm25_score), best first; zero scores are dropped."""
+        scores = self.scores(query)
+        mask = self._mask_for(where)
+        if mask is not None:
+            scores[~mask] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates) or n_results <= 0:
+            return []
+        if len(candidates) > n_results:
+            part = np.argpartition(-scores[candidates], n_results - 1)[:n_results]
+            candidates = candidates[part]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in order]
+
+    def stats(self) -> Dict:
+        return {
+            "documents": len(self.documents),
+            "terms": len(self._vocab),
+            "postings": int(self._offsets[-1]),
+            "bytes": int(self._offsets.nbytes + self._doc_ids.nbytes + self._impacts.nbytes + self._idf.nbytes),
+        }
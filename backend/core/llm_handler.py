@@ -5,6 +5,10 @@ Provider priority:
   1. Google Gemini  (primary)
   2. Groq           (automatic fallback on rate-limit / quota errors)
 
+Each request goes to the currently best provider (backend.core.provider_router):
+a rate-limited provider's circuit stays open for its Retry-After, so later
+requests go straight to the other one instead of paying a failed round trip.
+
 Both providers use the same prompt logic.
 Groq uses the OpenAI-compatible chat completions format (system + user messages).
 Gemini receives the same content as a single combined prompt.
@@ -12,9 +16,11 @@ Gemini receives the same content as a single combined prompt.
 To swap models: edit DEFAULT_LLM / GROQ_MODEL in .env — no code changes needed.
 """
 
+import asyncio
 import os
+import time
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -22,27 +28,18 @@ from backend.core.prompts import (
     SPIRITUAL_GUIDE_SYSTEM,
     GREETING_SYSTEM,
     FACTUAL_SYSTEM,
-    MENTAL_HEALTH_KEYWORDS,
     MENTAL_HEALTH_DISCLAIMER,
     MOOD_TONE_OVERLAYS,
 )
 from backend.core.query_classifier import QueryType
+from backend.core import keyword_engine as kw
+from backend.core.provider_router import CALL, TTFT, ProviderRouter
+from backend.core.prompt_budget import estimate_tokens
 
 _ROOT = Path(__file__).parent.parent.parent
 load_dotenv(_ROOT / ".env")
 
-# Rate-limit signal phrases — same across all providers
-_RATE_LIMIT_SIGNALS = (
-    "429", "503", "504", "rate limit", "quota exceeded", "resource exhausted",
-    "too many requests", "ratelimitexceeded", "rate_limit_exceeded",
-    "tokens per", "requests per", "high demand", "service unavailable",
-    "temporarily unavailable", "try again later", "deadline exceeded",
-)
-
-
-def _is_rate_limit(exc: Exception) -> bool:
-    msg = str(exc).lower()
-    return any(s in msg for s in _RATE_LIMIT_SIGNALS)
+_INTERRUPTED_NOTE = "\n\n*(Response was interrupted — please try again.)*"
 
 
 class EnhancedGitaLLMHandler:
@@ -60,11 +57,17 @@ class EnhancedGitaLLMHandler:
             self.groq_model_name = settings.GROQ_MODEL
             self._google_key = settings.GOOGLE_API_KEY
             self._groq_key = settings.GROQ_API_KEY
+            fallback_penalty = settings.LLM_FALLBACK_PENALTY
+            base_cooldown = settings.LLM_CIRCUIT_COOLDOWN_SECONDS
+            hedge_after_ms = settings.LLM_HEDGE_AFTER_MS
         except ImportError:
             self.gemini_model_name = model_name or "gemini-2.5-flash"
             self.groq_model_name = "llama-3.3-70b-versatile"
             self._google_key = os.getenv("GOOGLE_API_KEY", "")
             self._groq_key = os.getenv("GROQ_API_KEY", "")
+            fallback_penalty = 2.0
+            base_cooldown = 5.0
+            hedge_after_ms = 0.0
 
         self.gemini_model      = None
         self.groq_client       = None
@@ -72,6 +75,15 @@ class EnhancedGitaLLMHandler:
         self._init_gemini()
         self._init_groq()
 
+        self._fallback_penalty = fallback_penalty
+        self._base_cooldown = base_cooldown
+        self._build_router()
+
+        # Hedged streaming (opt-in): start the next provider when the first
+        # token is this late, keep whichever streams first
+        self.hedge_after = hedge_after_ms / 1000.0
+        self.hedge_stats = {"streams": 0, "fired": 0, "won_by_primary": 0, "won_by_hedge": 0, "won_by": {}}
+
     # ─── Initialisation ───────────────────────────────────────────────────────
 
     def _init_gemini(self):
@@ -98,10 +110,22 @@ class EnhancedGitaLLMHandler:
         except Exception as e:
             print(f"WARNING: Groq init failed: {e}")
 
+    def _build_router(self):
+        """Route over the providers that initialized; Gemini preferred (Groq must look `fallback_penalty`× faster)."""
+        providers = [name for name in ("gemini", "groq") if self._provider_ready(name)]
+        self.router = ProviderRouter(
+            providers,
+            penalties={"groq": self._fallback_penalty},
+            base_cooldown=self._base_cooldown,
+        )
+
     # ─── Public API ───────────────────────────────────────────────────────────
 
-    def generate_response(self, user_query: str, context: Dict) -> Dict:
-        """Full spiritual guidance with RAG context — called for SPIRITUAL queries."""
+    def generate_response(self, user_query: str, context: Dict, analysis=None) -> Dict:
+        """
+        Full spiritual guidance with RAG context — called for SPIRITUAL queries.
+        `analysis` is the request's QueryAnalysis (backend.core.query_analysis), if any.
+        """
         if not self._any_provider_ready():
             return self._unavailable_response(context)
 
@@ -109,80 +133,173 @@ class EnhancedGitaLLMHandler:
 
         try:
             text, provider = self._call_with_fallback(system, user_content)
+            return self._spiritual_result(user_query, context, text, provider, analysis)
+        except Exception as e:
+            return self._spiritual_error_result(context, e)
+
+    async def generate_response_async(self, user_query: str, context: Dict, analysis=None) -> Dict:
+        """Async twin of generate_response — never blocks the event loop."""
+        if not self._any_provider_ready():
+            return self._unavailable_response(context)
 
-            if self._needs_mental_health_disclaimer(user_query):
-                text += MENTAL_HEALTH_DISCLAIMER
+        system, user_content = self._build_spiritual_parts(user_query, context)
 
-            return {
-                "response": text,
-                "used_verses": context.get("used_verses", []),
-                "themes": context.get("query_themes", []),
-                "provider": provider,
-                "error": False,
-            }
+        try:
+            text, provider = await self._call_with_fallback_async(system, user_content)
+            return self._spiritual_result(user_query, context, text, provider, analysis)
         except Exception as e:
-            fallback_text = self._fallback_verse_response(context)
-            return {
-                "response": fallback_text or f"I encountered difficulty providing guidance: {e}",
-                "used_verses": context.get("used_verses", []),
-                "themes": context.get("query_themes", []),
-                "provider": "none",
-                "error": True,
-            }
+            return self._spiritual_error_result(context, e)
 
     def generate_typed_response(self, user_query: str, query_type: QueryType) -> Dict:
         """Short responses for GREETING and FACTUAL queries — no RAG context."""
         if not self._any_provider_ready():
             return self._unavailable_response({})
 
-        system = GREETING_SYSTEM if query_type == QueryType.GREETING else FACTUAL_SYSTEM
-        user_content = f'The seeker asks: "{user_query}"'
+        system, user_content = self._build_typed_parts(user_query, query_type)
 
         try:
             text, provider = self._call_with_fallback(system, user_content)
-            return {
-                "response": text,
-                "used_verses": [],
-                "themes": [],
-                "provider": provider,
-                "error": False,
-            }
+            return self._typed_result(text, provider)
+        except Exception as e:
+            return self._typed_error_result(e)
+
+    async def generate_typed_response_async(self, user_query: str, query_type: QueryType) -> Dict:
+        """Async twin of generate_typed_response."""
+        if not self._any_provider_ready():
+            return self._unavailable_response({})
+
+        system, user_content = self._build_typed_parts(user_query, query_type)
+
+        try:
+            text, provider = await self._call_with_fallback_async(system, user_content)
+            return self._typed_result(text, provider)
         except Exception as e:
-            return {
-                "response": f"I encountered difficulty responding: {e}",
-                "used_verses": [],
-                "themes": [],
-                "provider": "none",
-                "error": True,
-            }
+            return self._typed_error_result(e)
+
+    # ─── Result shapes ────────────────────────────────────────────────────────
+
+    def _spiritual_result(self, user_query: str, context: Dict, text: str, provider: str, analysis=None) -> Dict:
+        if self._needs_mental_health_disclaimer(user_query, analysis):
+            text += MENTAL_HEALTH_DISCLAIMER
+
+        return {
+            "response": text,
+            "used_verses": context.get("used_verses", []),
+            "themes": context.get("query_themes", []),
+            "provider": provider,
+            "error": False,
+        }
+
+    def _spiritual_error_result(self, context: Dict, e: Exception) -> Dict:
+        fallback_text = self._fallback_verse_response(context)
+        return {
+            "response": fallback_text or f"I encountered difficulty providing guidance: {e}",
+            "used_verses": context.get("used_verses", []),
+            "themes": context.get("query_themes", []),
+            "provider": "none",
+            "error": True,
+        }
+
+    @staticmethod
+    def _typed_result(text: str, provider: str) -> Dict:
+        return {
+            "response": text,
+            "used_verses": [],
+            "themes": [],
+            "provider": provider,
+            "error": False,
+        }
+
+    @staticmethod
+    def _typed_error_result(e: Exception) -> Dict:
+        return {
+            "response": f"I encountered difficulty responding: {e}",
+            "used_verses": [],
+            "themes": [],
+            "provider": "none",
+            "error": True,
+        }
 
     # ─── Provider dispatch ────────────────────────────────────────────────────
 
+    def _provider_ready(self, name: str, streaming_async: bool = False) -> bool:
+        if name == "gemini":
+            return self.gemini_model is not None
+        return (self.groq_client_async if streaming_async else self.groq_client) is not None
+
+    def _no_provider_error(self) -> RuntimeError:
+        wait = self.router.retry_in()
+        if wait:
+            return RuntimeError(f"All LLM providers are rate-limited — retry in {wait:.0f}s.")
+        return RuntimeError(
+            "All LLM providers are unavailable. "
+            "Check GOOGLE_API_KEY and GROQ_API_KEY in your .env file."
+        )
+
     def _call_with_fallback(self, system: str, user_content: str) -> Tuple[str, str]:
         """
-        Try Gemini first. On rate-limit → switch to Groq.
+        Try providers best-first (see ProviderRouter). On a rate limit or
+        outage → next provider; any other error propagates.
         Returns (response_text, provider_name).
         """
-        # 1. Try Gemini
-        if self.gemini_model:
+        callers = {"gemini": self._call_gemini, "groq": self._call_groq}
+        for name in self.router.candidates(CALL):
+            if not self._provider_ready(name) or not self.router.begin(name):
+                continue
+            t0 = time.perf_counter()
+            try:
+                text = callers[name](system, user_content)
+            except Exception as e:
+                failure = self.router.record_failure(name, e)
+                if not failure.retryable:
+                    raise
+                print(f"{name} {failure.kind} — trying next provider. ({type(e).__name__})")
+                continue
+            finally:
+                self.router.release(name)
+            self.router.record_success(name, CALL, time.perf_counter() - t0)
+            return text, name
+
+        raise self._no_provider_error()
+
+    async def _call_with_fallback_async(self, system: str, user_content: str) -> Tuple[str, str]:
+        """Async twin of _call_with_fallback — awaits the providers' async clients."""
+        callers = {"gemini": self._call_gemini_async, "groq": self._call_groq_async}
+        for name in self.router.candidates(CALL):
+            if not self._provider_ready(name, streaming_async=True) or not self.router.begin(name):
+                continue
+            t0 = time.perf_counter()
             try:
-                text = self._call_gemini(system, user_content)
-                return text, "gemini"
+                text = await callers[name](system, user_content)
             except Exception as e:
-                if _is_rate_limit(e):
-                    print(f"Gemini rate limit hit — switching to Groq. ({type(e).__name__})")
-                else:
-                    raise  # Non-rate-limit Gemini error — propagate
+                failure = self.router.record_failure(name, e)
+                if not failure.retryable:
+                    raise
+                print(f"{name} {failure.kind} — trying next provider. ({type(e).__name__})")
+                continue
+            finally:
+                self.router.release(name)
+            self.router.record_success(name, CALL, time.perf_counter() - t0)
+            return text, name
 
-        # 2. Groq fallback
-        if self.groq_client:
-            text = self._call_groq(system, user_content)
-            return text, "groq"
+        raise self._no_provider_error()
 
-        raise RuntimeError(
-            "All LLM providers are unavailable. "
-            "Check GOOGLE_API_KEY and GROQ_API_KEY in your .env file."
+    async def _call_gemini_async(self, system: str, user_content: str) -> str:
+        full_prompt = f"{system}\n\n{user_content}"
+        response = await self.gemini_model.generate_content_async(full_prompt)
+        return response.text
+
+    async def _call_groq_async(self, system: str, user_content: str) -> str:
+        completion = await self.groq_client_async.chat.completions.create(
+            model=self.groq_model_name,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user",   "content": user_content},
+            ],
+            max_tokens=1024,
+            temperature=0.7,
         )
+        return completion.choices[0].message.content
 
     def _call_gemini(self, system: str, user_content: str) -> str:
         full_prompt = f"{system}\n\n{user_content}"
@@ -230,35 +347,37 @@ class EnhancedGitaLLMHandler:
 
     def _stream_with_fallback(self, system: str, user_content: str):
         """
-        Sync generator — tries Gemini first, falls back to Groq on rate-limit.
-        If Gemini fails before the first token, Groq takes over seamlessly.
-        If Gemini fails mid-stream, yields an interruption note.
+        Sync generator — providers best-first. If one fails before the first
+        token, the next takes over seamlessly; a failure mid-stream yields an
+        interruption note.
         """
-        first_yielded = False
-
-        if self.gemini_model:
+        streams = {"gemini": self._stream_gemini, "groq": self._stream_groq}
+        for name in self.router.candidates(TTFT):
+            if not self._provider_ready(name) or not self.router.begin(name):
+                continue
+            first_yielded = False
+            t0 = time.perf_counter()
             try:
-                for chunk in self._stream_gemini(system, user_content):
-                    first_yielded = True
+                for chunk in streams[name](system, user_content):
+                    if not first_yielded:
+                        first_yielded = True
+                        self.router.record_latency(name, TTFT, time.perf_counter() - t0)
                     yield chunk
-                return
             except Exception as e:
-                if _is_rate_limit(e) and not first_yielded and self.groq_client:
-                    print(f"Gemini rate-limit on stream — switching to Groq. ({type(e).__name__})")
-                    # fall through to Groq below
-                elif first_yielded:
-                    yield "\n\n*(Response was interrupted — please try again.)*"
+                failure = self.router.record_failure(name, e)
+                if first_yielded:
+                    yield _INTERRUPTED_NOTE
                     return
-                else:
+                if not failure.retryable:
                     raise
-
-        if self.groq_client:
-            yield from self._stream_groq(system, user_content)
+                print(f"{name} {failure.kind} on stream — trying next provider. ({type(e).__name__})")
+                continue
+            finally:
+                self.router.release(name)
+            self.router.record_success(name)
             return
 
-        raise RuntimeError(
-            "All LLM providers unavailable. Check GOOGLE_API_KEY / GROQ_API_KEY in .env."
-        )
+        raise self._no_provider_error()
 
     def stream_response(self, user_query: str, context: Dict):
         """Public streaming generator for SPIRITUAL queries (with RAG context)."""
@@ -267,8 +386,7 @@ class EnhancedGitaLLMHandler:
 
     def stream_typed_response(self, user_query: str, query_type: QueryType):
         """Public streaming generator for GREETING / FACTUAL queries."""
-        system = GREETING_SYSTEM if query_type == QueryType.GREETING else FACTUAL_SYSTEM
-        user_content = f'The seeker asks: "{user_query}"'
+        system, user_content = self._build_typed_parts(user_query, query_type)
         yield from self._stream_with_fallback(system, user_content)
 
     # ─── Async streaming (used by FastAPI StreamingResponse) ──────────────────
@@ -298,52 +416,159 @@ class EnhancedGitaLLMHandler:
             if delta:
                 yield delta
 
-    async def _stream_with_fallback_async(self, system: str, user_content: str):
-        first_yielded = False
-        if self.gemini_model:
-            try:
-                async for chunk in self._stream_gemini_async(system, user_content):
-                    first_yielded = True
-                    yield chunk
-                return
-            except Exception as e:
-                if _is_rate_limit(e) and not first_yielded and self.groq_client_async:
-                    print(f"Gemini rate-limit on stream — switching to Groq. ({type(e).__name__})")
-                elif first_yielded:
-                    yield "\n\n*(Response was interrupted — please try again.)*"
-                    return
-                else:
-                    raise
-
-        if self.groq_client_async:
-            async for chunk in self._stream_groq_async(system, user_content):
+    async def _open_stream_async(self, queue: List[str], system: str, user_content: str):
+        """
+        Start providers from `queue` (best first) until one yields its first
+        chunk; returns (provider, stream, first_chunk), or None if none could.
+
+        With hedging on (self.hedge_after > 0), when the first provider has
+        produced nothing after `hedge_after` seconds the next one is started
+        alongside it; the first to produce a chunk wins and the other is
+        cancelled. Failures before the first chunk fall through to the next
+        provider exactly as without hedging.
+        """
+        streams = {"gemini": self._stream_gemini_async, "groq": self._stream_groq_async}
+        racing: Dict[asyncio.Future, Tuple[str, object, float]] = {}   # first-chunk task → (provider, stream, t0)
+        hedged = False
+        last_error: Optional[Exception] = None
+
+        def start_next() -> bool:
+            while queue:
+                name = queue.pop(0)
+                if self.router.begin(name):
+                    stream = streams[name](system, user_content)
+                    racing[asyncio.ensure_future(stream.__anext__())] = (name, stream, time.perf_counter())
+                    return True
+            return False
+
+        if not start_next():
+            return None
+        primary = next(iter(racing.values()))[0]
+        self.hedge_stats["streams"] += 1
+        try:
+            while racing:
+                can_hedge = self.hedge_after > 0 and not hedged and len(racing) == 1 and bool(queue)
+                done, _ = await asyncio.wait(
+                    list(racing), timeout=self.hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = start_next()
+                    if hedged:
+                        self.hedge_stats["fired"] += 1
+                        print(f"{primary} first token late (>{self.hedge_after * 1000:.0f}ms) — hedging.")
+                    continue
+
+                for task in done:
+                    name, stream, t0 = racing.pop(task)
+                    try:
+                        first = task.result()
+                    except StopAsyncIteration:
+                        first = ""          # empty answer — still a successful stream
+                    except Exception as e:
+                        self.router.release(name)
+                        failure = self.router.record_failure(name, e)
+                        if not failure.retryable:
+                            last_error = e
+                        else:
+                            print(f"{name} {failure.kind} on stream — trying next provider. ({type(e).__name__})")
+                        continue
+                    self.router.record_latency(name, TTFT, time.perf_counter() - t0)
+                    if hedged:
+                        self.hedge_stats["won_by_primary" if name == primary else "won_by_hedge"] += 1
+                        self.hedge_stats["won_by"][name] = self.hedge_stats["won_by"].get(name, 0) + 1
+                    return name, stream, first
+
+                if not racing:
+                    if last_error is not None:
+                        raise last_error
+                    start_next()
+            return None
+        finally:
+            for task, (name, stream, _) in racing.items():
+                task.cancel()
+                try:
+                    await task
+                except BaseException:
+                    pass
+                try:
+                    await stream.aclose()
+                except BaseException:
+                    pass
+                self.router.release(name)
+
+    async def _stream_with_fallback_async(self, system: str, user_content: str, meta: Optional[Dict] = None):
+        """
+        Async twin of _stream_with_fallback (plus optional hedging, see
+        _open_stream_async). If `meta` is given, the serving provider is
+        recorded in meta["provider"] and meta["interrupted"] is set when the
+        stream broke mid-answer.
+        """
+        meta = meta if meta is not None else {}
+        queue = [n for n in self.router.candidates(TTFT) if self._provider_ready(n, streaming_async=True)]
+        opened = await self._open_stream_async(queue, system, user_content)
+        if opened is None:
+            raise self._no_provider_error()
+
+        name, stream, first = opened
+        meta["provider"] = name
+        try:
+            if first:
+                yield first
+            async for chunk in stream:
                 yield chunk
+        except Exception as e:
+            self.router.record_failure(name, e)
+            meta["interrupted"] = True
+            yield _INTERRUPTED_NOTE
             return
+        finally:
+            self.router.release(name)
+        self.router.record_success(name)
 
-        raise RuntimeError("All LLM providers unavailable. Check API keys in .env.")
-
-    async def stream_response_async(self, user_query: str, context: Dict):
-        """Async streaming for SPIRITUAL queries — safe to use in FastAPI routes."""
+    async def stream_response_async(self, user_query: str, context: Dict, meta: Optional[Dict] = None):
+        """
+        Async streaming for SPIRITUAL queries — safe to use in FastAPI routes.
+        Pass `meta` to learn which provider served the stream.
+        """
         system, user_content = self._build_spiritual_parts(user_query, context)
-        async for chunk in self._stream_with_fallback_async(system, user_content):
+        async for chunk in self._stream_with_fallback_async(system, user_content, meta):
             yield chunk
 
-    async def stream_typed_response_async(self, user_query: str, query_type: QueryType):
+    async def stream_typed_response_async(self, user_query: str, query_type: QueryType, meta: Optional[Dict] = None):
         """Async streaming for GREETING / FACTUAL queries."""
-        system = GREETING_SYSTEM if query_type == QueryType.GREETING else FACTUAL_SYSTEM
-        user_content = f'The seeker asks: "{user_query}"'
-        async for chunk in self._stream_with_fallback_async(system, user_content):
+        system, user_content = self._build_typed_parts(user_query, query_type)
+        async for chunk in self._stream_with_fallback_async(system, user_content, meta):
             yield chunk
 
     # ─── Prompt builders ──────────────────────────────────────────────────────
 
+    @staticmethod
+    def _build_typed_parts(user_query: str, query_type: QueryType) -> Tuple[str, str]:
+        """Returns (system_prompt, user_content) for GREETING / FACTUAL queries."""
+        system = GREETING_SYSTEM if query_type == QueryType.GREETING else FACTUAL_SYSTEM
+        return system, f'The seeker asks: "{user_query}"'
+
     def _build_spiritual_parts(self, user_query: str, context: Dict) -> Tuple[str, str]:
         """Returns (system_prompt, user_content) for the spiritual guidance flow."""
         verses_text = context.get("formatted_context", "")
-        themes = context.get("query_themes", [])
-        conversation_context = context.get("conversation_context", "")
-        mood = context.get("mood", "neutral")
+        return self._spiritual_prompt(
+            user_query,
+            verses_text if verses_text else "(Draw from your general knowledge of the Gita's teachings)",
+            context.get("query_themes", []),
+            context.get("conversation_context", ""),
+            context.get("mood", "neutral"),
+        )
+
+    def prompt_overhead_tokens(self, user_query: str, themes: List[str],
+                               conversation_context: str = "", mood: str = "neutral") -> int:
+        """Estimated tokens of the spiritual prompt without its verse block."""
+        system, user_content = self._spiritual_prompt(user_query, "", themes, conversation_context, mood)
+        return estimate_tokens(system) + estimate_tokens(user_content)
 
+    @staticmethod
+    def _spiritual_prompt(user_query: str, verses_text: str, themes: List[str],
+                          conversation_context: str, mood: str) -> Tuple[str, str]:
         # Inject mood-specific tone overlay if one is detected
         mood_overlay = MOOD_TONE_OVERLAYS.get(mood, "")
         system = SPIRITUAL_GUIDE_SYSTEM
@@ -365,7 +590,7 @@ THE SEEKER'S QUESTION:
 "{user_query}"
 
 RELEVANT TEACHINGS FROM THE BHAGAVAD GITA:
-{verses_text if verses_text else "(Draw from your general knowledge of the Gita's teachings)"}
+{verses_text}
 
 SPIRITUAL THEMES IN THIS QUERY: {themes_str}
 
@@ -376,12 +601,20 @@ Begin directly with acknowledging the seeker — do not start with "I" or "Dear
 
     # ─── Helpers ──────────────────────────────────────────────────────────────
 
+    def provider_stats(self) -> Dict:
+        """Router state per provider plus hedging counters (GET /api/providers/stats)."""
+        hedge = dict(self.hedge_stats, won_by=dict(self.hedge_stats["won_by"]))
+        hedge["after_ms"] = round(self.hedge_after * 1000)
+        hedge["fire_rate"] = round(hedge["fired"] / hedge["streams"], 3) if hedge["streams"] else 0.0
+        return {"providers": self.router.stats(), "hedging": hedge}
+
     def _any_provider_ready(self) -> bool:
         return self.gemini_model is not None or self.groq_client is not None
 
-    def _needs_mental_health_disclaimer(self, query: str) -> bool:
-        q = query.lower()
-        return any(kw in q for kw in MENTAL_HEALTH_KEYWORDS)
+    def _needs_mental_health_disclaimer(self, query: str, analysis=None) -> bool:
+        if analysis is not None:
+            return analysis.needs_disclaimer
+        return kw.scan_query(query).has(kw.MENTAL_HEALTH)
 
     def _unavailable_response(self, context: Dict) -> Dict:
         return {
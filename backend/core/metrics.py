@@ -0,0 +1,163 @@
+"""
+Lightweight latency metrics for Gita Wisdom Guide.
+
+No prometheus_client dependency — a tiny labelled histogram that renders the
+Prometheus text exposition format, plus a per-request RequestTimer that:
+  - measures named pipeline stages (analysis, embedding, vector_search, ...)
+  - renders a Server-Timing header / a timing dict for the SSE "done" event
+  - feeds every stage into the shared STAGE_SECONDS histogram on finish()
+
+Usage:
+    timer = RequestTimer()
+    with timer.stage("analysis"):
+        ...
+    timer.finish(query_type="spiritual", provider="gemini")
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seconds — from sub-millisecond lexical work up to slow LLM generations
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with string labels, safe across threads."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Iterable[str],
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name        = name
+        self.help_text   = help_text
+        self.label_names = tuple(label_names)
+        self.buckets     = tuple(sorted(buckets))
+        # label values → [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for key, series in items:
+            base = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.label_names, key))
+            sep = "," if base else ""
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound:g}"}} {count:g}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {series[-2]:g}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-2]:g}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Histogram] = []
+
+    def register(self, metric: Histogram) -> Histogram:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "gita_stage_duration_seconds",
+    "Duration of each query pipeline stage.",
+    ("route", "stage", "query_type", "provider"),
+))
+
+# Estimated prompt size of each SPIRITUAL generation (see core.prompt_budget)
+PROMPT_TOKENS = REGISTRY.register(Histogram(
+    "gita_prompt_tokens",
+    "Estimated tokens in the assembled LLM prompt.",
+    ("route",),
+    buckets=(250, 500, 750, 1000, 1250, 1500, 1750, 2000, 2500, 3000, 4000),
+))
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Per-request timer
+# ─────────────────────────────────────────────────────────────────────────────
+
+class RequestTimer:
+    """Collects stage durations for one request. Stages may repeat — they add up."""
+
+    def __init__(self, route: str = ""):
+        self.route = route
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}   # stage → seconds
+        self._finished = False
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def mark(self, name: str) -> None:
+        """Record elapsed time since the request started (e.g. time-to-first-token)."""
+        self.stages.setdefault(name, time.perf_counter() - self.started)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, rounded for JSON payloads."""
+        return {name: round(sec * 1000, 2) for name, sec in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'analysis;dur=0.12, retrieval;dur=8.40'."""
+        return ", ".join(f"{name};dur={sec * 1000:.2f}" for name, sec in self.stages.items())
+
+    def finish(self, query_type: str = "", provider: Optional[str] = None) -> None:
+        """Close the request: record 'total' and publish every stage to the histogram."""
+        if self._finished:
+            return
+        self._finished = True
+        self.stages["total"] = time.perf_counter() - self.started
+        for name, seconds in self.stages.items():
+            STAGE_SECONDS.observe(
+                seconds,
+                route=self.route,
+                stage=name,
+                query_type=query_type,
+                provider=provider or "none",
+            )
@@ -8,7 +8,9 @@ Detection is purely lexical (keyword scoring) — fast, offline, no LLM call nee
 """
 
 from enum import Enum
-from typing import Tuple
+from typing import Optional, Tuple
+
+from backend.core import keyword_engine as kw
 
 
 class Mood(str, Enum):
@@ -24,7 +26,8 @@ class Mood(str, Enum):
 
 # ── Keyword / phrase signals per mood ─────────────────────────────────────────
 # Each phrase scores 1 point; longer phrases are listed first so they are
-# matched before their constituent words. Match is case-insensitive substring.
+# matched before their constituent words. Match is case-insensitive substring
+# (all phrases are matched in one pass by backend.core.keyword_engine).
 
 _SIGNALS: dict[Mood, list[str]] = {
     Mood.GRIEF: [
@@ -82,19 +85,19 @@ _SIGNALS: dict[Mood, list[str]] = {
 _THRESHOLD = 1
 
 
-def detect_mood(query: str) -> Tuple[Mood, int]:
+def detect_mood(query: str, matches: Optional[kw.KeywordMatches] = None) -> Tuple[Mood, int]:
     """
     Returns (dominant_mood, score).
     Score is the raw keyword-match count for the winning mood.
     If no mood clears the threshold, returns (Mood.NEUTRAL, 0).
+    `matches` is the keyword scan of this query (scanned here if omitted).
     """
-    q = query.lower()
+    if matches is None:
+        matches = kw.scan_query(query)
     scores: dict[Mood, int] = {m: 0 for m in Mood if m != Mood.NEUTRAL}
 
-    for mood, phrases in _SIGNALS.items():
-        for phrase in phrases:
-            if phrase in q:
-                scores[mood] += 1
+    for mood in matches.keys(kw.MOOD):
+        scores[mood] += 1
 
     best_mood = max(scores, key=lambda m: scores[m])
     best_score = scores[best_mood]
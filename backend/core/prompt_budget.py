@@ -0,0 +1,93 @@
+"""
+Prompt token budgeting for Gita Wisdom Guide.
+
+The context builder used to cap the verse block at 3 500 characters while the
+rest of the prompt — system prompt, mood overlay, prior conversation, the
+question itself — went uncounted, so a long conversation silently grew every
+request. Now the whole assembled prompt is budgeted in approximate tokens:
+
+    reserved = llm_handler.prompt_overhead_tokens(query, themes, history, mood)
+    passages, report = select_passages(candidates, budget - reserved)
+
+estimate_tokens() is an offline approximation of a BPE tokenizer (no model
+download, tens of µs per verse): short words are one token, long words a few,
+digits and punctuation one each (~0.1 ms for the whole system prompt). It errs
+on the high side so the real prompt stays inside the budget.
+
+select_passages() fills the remaining budget greedily by relevance per token
+and skips passages whose words are mostly contained in one already chosen —
+a multi-verse chunk overlapping a selected verse adds tokens, not information.
+"""
+
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Sequence, Tuple
+
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+_WORD_RE  = re.compile(r"[a-z]{3,}")
+
+# Whole-prompt budget when the caller gives none (≈ the old 3 500-character
+# verse block plus a neutral system prompt and three prior turns)
+DEFAULT_PROMPT_TOKEN_BUDGET = 1800
+
+# Share of the smaller passage's words found in the other → near-duplicate
+DUPLICATE_OVERLAP = 0.8
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count of `text`."""
+    if not text:
+        return 0
+    return sum(1 + (len(p) - 1) // 6 for p in _PIECE_RE.findall(text))
+
+
+def _words(text: str) -> FrozenSet[str]:
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+def _overlap(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    smaller = min(len(a), len(b))
+    return len(a & b) / smaller if smaller else 0.0
+
+
+class Passage(NamedTuple):
+    text: str           # exactly as it will appear in the prompt
+    relevance: float
+    item: Dict          # the retrieval result it came from
+    tier: int = 0       # lower tiers are considered first (verses before chunks)
+
+
+def select_passages(
+    candidates: Sequence[Passage],
+    budget: int,
+    overlap: float = DUPLICATE_OVERLAP,
+) -> Tuple[List[Passage], Dict[str, int]]:
+    """
+    Passages that fit in `budget` tokens (joined with blank lines), chosen by
+    tier, then relevance per token, returned in their original order. The report counts
+    tokens used and passages dropped as near-duplicates or for lack of room.
+    """
+    sized = [(p, estimate_tokens(p.text) + 1, i) for i, p in enumerate(candidates)]
+    # Stable: equal density keeps retrieval order (e.g. a referenced verse first)
+    ranked = sorted(sized, key=lambda s: (s[0].tier, -s[0].relevance / s[1]))
+
+    chosen: List[Tuple[int, Passage]] = []
+    chosen_words: List[FrozenSet[str]] = []
+    used = duplicates = over_budget = 0
+    for passage, tokens, index in ranked:
+        if used + tokens > budget:
+            over_budget += 1
+            continue
+        words = _words(passage.text)
+        if any(_overlap(words, seen) >= overlap for seen in chosen_words):
+            duplicates += 1
+            continue
+        chosen.append((index, passage))
+        chosen_words.append(words)
+        used += tokens
+
+    chosen.sort(key=lambda c: c[0])
+    return [p for _, p in chosen], {
+        "context_tokens": used,
+        "duplicates_dropped": duplicates,
+        "over_budget_dropped": over_budget,
+    }
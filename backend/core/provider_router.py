@@ -0,0 +1,279 @@
+"""
+Health- and latency-aware LLM provider routing for Gita Wisdom Guide.
+
+The handler used to try Gemini first on every request, so once Gemini's quota
+was exhausted each request still paid a failed Gemini round trip before
+falling back to Groq. The router keeps per-provider state instead:
+
+  - a circuit breaker: a rate limit / outage opens the circuit for the
+    provider's Retry-After (or an exponential backoff); after that one
+    half-open probe request decides whether it closes again
+  - EWMAs of time-to-first-token (streams), call latency (non-streaming)
+    and error rate
+
+and orders the providers for each request by expected latency, inflated by
+the error rate and a per-provider penalty (the fallback provider only wins
+when it is clearly better). A provider whose cooldown has expired is tried
+first, as the half-open probe.
+
+    for name in router.candidates("ttft"):
+        if not router.begin(name):
+            continue
+        try:
+            ...call the provider...
+        except Exception as e:
+            failure = router.record_failure(name, e)
+            if failure.retryable: continue
+            raise
+        else:
+            router.record_success(name, "ttft", elapsed)
+        finally:
+            router.release(name)
+
+Pure bookkeeping — no I/O, injectable clock — so it can be driven by fake
+providers and simulated 429s.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+CLOSED    = "closed"
+OPEN      = "open"
+HALF_OPEN = "half_open"
+
+# Latency kinds: time to first streamed token, or a whole non-streaming call
+TTFT = "ttft"
+CALL = "call"
+
+_RATE_LIMIT_STATUS  = {429}
+_UNAVAILABLE_STATUS = {500, 502, 503, 504}
+
+# Last resort for SDK errors that carry no status code
+_RATE_LIMIT_SIGNALS = (
+    "rate limit", "quota exceeded", "resource exhausted", "resource has been exhausted",
+    "too many requests", "ratelimitexceeded", "rate_limit_exceeded",
+    "tokens per", "requests per",
+)
+_UNAVAILABLE_SIGNALS = (
+    "high demand", "service unavailable", "temporarily unavailable",
+    "try again later", "deadline exceeded", "overloaded",
+)
+_RETRY_IN_RE = re.compile(r"(?:retry|try again)[^0-9]{0,20}(\d+(?:\.\d+)?)\s*(ms|s|sec|seconds?)?\b")
+
+
+class Failure(NamedTuple):
+    kind: str                       # "rate_limit" | "unavailable" | "error"
+    retry_after: Optional[float]    # seconds, when the provider said so
+    retryable: bool                 # worth trying the next provider
+
+
+def _status_of(exc: Exception) -> Optional[int]:
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if value is None or callable(value):
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    response = getattr(exc, "response", None)
+    code = getattr(response, "status_code", None)
+    return int(code) if isinstance(code, int) else None
+
+
+def _retry_after_of(exc: Exception) -> Optional[float]:
+    # HTTP Retry-After header (Groq / OpenAI-style SDKs)
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                pass
+    # google.rpc.RetryInfo (Gemini)
+    for detail in getattr(exc, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None and hasattr(delay, "seconds"):
+            return delay.seconds + getattr(delay, "nanos", 0) / 1e9
+    # "... Please retry in 17.3s" in the message
+    m = _RETRY_IN_RE.search(str(exc).lower())
+    if m:
+        seconds = float(m.group(1))
+        return seconds / 1000.0 if m.group(2) == "ms" else seconds
+    return None
+
+
+def classify_error(exc: Exception) -> Failure:
+    """Rate limit / transient outage (retryable elsewhere) vs. any other error."""
+    retry_after = _retry_after_of(exc)
+    status = _status_of(exc)
+    if status in _RATE_LIMIT_STATUS:
+        return Failure("rate_limit", retry_after, True)
+    if status in _UNAVAILABLE_STATUS:
+        return Failure("unavailable", retry_after, True)
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return Failure("unavailable", retry_after, True)
+    if status is None:
+        msg = str(exc).lower()
+        if any(s in msg for s in _RATE_LIMIT_SIGNALS):
+            return Failure("rate_limit", retry_after, True)
+        if any(s in msg for s in _UNAVAILABLE_SIGNALS):
+            return Failure("unavailable", retry_after, True)
+    return Failure("error", retry_after, False)
+
+
+class _ProviderState:
+    __slots__ = ("name", "penalty", "state", "open_until", "opens", "probing",
+                 "latency", "error_rate", "successes", "failures", "last_failure")
+
+    def __init__(self, name: str, penalty: float):
+        self.name = name
+        self.penalty = penalty
+        self.state = CLOSED
+        self.open_until = 0.0
+        self.opens = 0                  # consecutive openings → backoff exponent
+        self.probing = False            # a half-open probe is in flight
+        self.latency: Dict[str, float] = {}
+        self.error_rate = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.last_failure: Optional[str] = None
+
+
+class ProviderRouter:
+    def __init__(
+        self,
+        providers: Sequence[str],
+        penalties: Optional[Dict[str, float]] = None,
+        alpha: float = 0.2,
+        base_cooldown: float = 5.0,
+        max_cooldown: float = 120.0,
+        error_threshold: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        `providers` in priority order (used while there are no latency samples).
+        `penalties` multiply a provider's expected latency when ranking.
+        A circuit also opens when the error-rate EWMA reaches `error_threshold`.
+        """
+        penalties = penalties or {}
+        self._order = list(providers)
+        self._states = {name: _ProviderState(name, penalties.get(name, 1.0)) for name in providers}
+        self._alpha = alpha
+        self._base_cooldown = base_cooldown
+        self._max_cooldown = max_cooldown
+        self._error_threshold = error_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._states
+
+    # ── Selection ─────────────────────────────────────────────────────────────
+
+    def _available(self, s: _ProviderState, now: float) -> bool:
+        if s.state == CLOSED:
+            return True
+        if s.state == OPEN and now >= s.open_until:
+            s.state = HALF_OPEN
+        return s.state == HALF_OPEN and not s.probing
+
+    def _score(self, s: _ProviderState, kind: str) -> float:
+        known = [st.latency[kind] for st in self._states.values() if kind in st.latency]
+        # No sample yet: assume it matches the slowest provider seen (or 1 s)
+        latency = s.latency.get(kind, max(known) if known else 1.0)
+        return latency * s.penalty * (1.0 + 4.0 * s.error_rate)
+
+    def candidates(self, kind: str = TTFT) -> List[str]:
+        """Providers worth trying right now, best first. Open circuits are skipped."""
+        now = self._clock()
+        with self._lock:
+            ready = [self._states[n] for n in self._order if self._available(self._states[n], now)]
+            # A half-open provider goes first: its probe is how the circuit closes again.
+            # Stable sort → priority order breaks ties.
+            ranked = sorted(ready, key=lambda s: (s.state != HALF_OPEN, self._score(s, kind)))
+        return [s.name for s in ranked]
+
+    def retry_in(self) -> float:
+        """Seconds until the first open circuit allows a probe (0 if one is usable)."""
+        now = self._clock()
+        with self._lock:
+            if any(self._available(s, now) for s in self._states.values()):
+                return 0.0
+            return max(0.0, min(s.open_until for s in self._states.values()) - now)
+
+    def begin(self, name: str) -> bool:
+        """Claim a request slot. False if the circuit is open or its probe is taken."""
+        now = self._clock()
+        with self._lock:
+            s = self._states[name]
+            if not self._available(s, now):
+                return False
+            if s.state == HALF_OPEN:
+                s.probing = True
+            return True
+
+    def release(self, name: str) -> None:
+        """End of an attempt, however it ended (a cancelled probe frees the slot)."""
+        with self._lock:
+            self._states[name].probing = False
+
+    # ── Outcomes ──────────────────────────────────────────────────────────────
+
+    def _ewma(self, old: Optional[float], sample: float) -> float:
+        return sample if old is None else old + self._alpha * (sample - old)
+
+    def record_latency(self, name: str, kind: str, seconds: float) -> None:
+        with self._lock:
+            s = self._states[name]
+            s.latency[kind] = self._ewma(s.latency.get(kind), seconds)
+
+    def record_success(self, name: str, kind: Optional[str] = None, seconds: Optional[float] = None) -> None:
+        with self._lock:
+            s = self._states[name]
+            if kind is not None and seconds is not None:
+                s.latency[kind] = self._ewma(s.latency.get(kind), seconds)
+            s.error_rate = self._ewma(s.error_rate, 0.0)
+            s.successes += 1
+            s.state = CLOSED
+            s.opens = 0
+            s.probing = False
+
+    def record_failure(self, name: str, exc: Exception) -> Failure:
+        failure = classify_error(exc)
+        now = self._clock()
+        with self._lock:
+            s = self._states[name]
+            s.error_rate = self._ewma(s.error_rate, 1.0)
+            s.failures += 1
+            s.last_failure = failure.kind
+            s.probing = False
+            if failure.retryable or s.state == HALF_OPEN or s.error_rate >= self._error_threshold:
+                cooldown = failure.retry_after
+                if cooldown is None:
+                    cooldown = min(self._max_cooldown, self._base_cooldown * (2 ** s.opens))
+                s.state = OPEN
+                s.open_until = now + cooldown
+                s.opens += 1
+        return failure
+
+    def stats(self) -> Dict:
+        now = self._clock()
+        with self._lock:
+            return {
+                s.name: {
+                    "state": s.state if not (s.state == OPEN and now >= s.open_until) else HALF_OPEN,
+                    "retry_in_s": round(max(0.0, s.open_until - now), 1) if s.state == OPEN else 0.0,
+                    "ttft_ms": round(s.latency[TTFT] * 1000, 1) if TTFT in s.latency else None,
+                    "call_ms": round(s.latency[CALL] * 1000, 1) if CALL in s.latency else None,
+                    "error_rate": round(s.error_rate, 3),
+                    "successes": s.successes,
+                    "failures": s.failures,
+                    "last_failure": s.last_failure,
+                }
+                for s in self._states.values()
+            }
@@ -0,0 +1,72 @@
+"""
+Per-request query analysis for Gita Wisdom Guide.
+
+Everything the pipeline derives from the query text alone — intent, mood,
+themes, expanded query, disclaimer flag, verse reference — is computed once,
+at the top of the wisdom routes, from a single keyword scan
+(backend.core.keyword_engine).
+The resulting QueryAnalysis is immutable and is handed down to the retriever
+and LLM handler, so no stage re-lowercases, re-tokenizes or re-classifies.
+
+The query embedding is attached later (with_embedding) — only SPIRITUAL
+queries need it, and it is computed off the event loop.
+
+    analysis = analyze_query(body.query)
+    if analysis.query_type == QueryType.SPIRITUAL:
+        analysis = retriever.embed_analysis(analysis)
+        context  = retriever.create_context_for_llm(analysis.text, analysis=analysis)
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Tuple
+
+from backend.core import keyword_engine as kw
+from backend.core.enhanced_retrieval import EnhancedGitaRetriever
+from backend.core.mood_detector import Mood, detect_mood
+from backend.core.query_classifier import QueryType, classify_query
+from backend.core.verse_reference import VerseReference, parse_verse_reference
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    text: str                   # the query exactly as received
+    normalized: str             # lowercased, whitespace-collapsed — cache / metrics key
+    tokens: Tuple[str, ...]
+    query_type: QueryType
+    confidence: float
+    mood: Mood
+    mood_score: int
+    themes: Tuple[str, ...]
+    expanded_query: str
+    needs_disclaimer: bool
+    verse_reference: Optional[VerseReference]   # "BG 2.47", "chapter 2 verse 47", ...
+    matches: kw.KeywordMatches = field(repr=False, compare=False)
+    embedding: Optional[List[float]] = field(default=None, repr=False, compare=False)
+
+    def with_embedding(self, embedding: List[float]) -> "QueryAnalysis":
+        return replace(self, embedding=embedding)
+
+
+def analyze_query(query: str) -> QueryAnalysis:
+    matches = kw.scan_query(query)
+    normalized = " ".join(matches.text.split())
+
+    query_type, confidence = classify_query(query, matches)
+    mood, mood_score = detect_mood(query, matches)
+    _, expanded = EnhancedGitaRetriever.preprocess_query(query, matches)
+    themes = EnhancedGitaRetriever.extract_query_themes(query, matches)
+
+    return QueryAnalysis(
+        text=query,
+        normalized=normalized,
+        tokens=tuple(normalized.split()),
+        query_type=query_type,
+        confidence=confidence,
+        mood=mood,
+        mood_score=mood_score,
+        themes=tuple(themes),
+        expanded_query=expanded,
+        needs_disclaimer=matches.has(kw.MENTAL_HEALTH),
+        verse_reference=parse_verse_reference(query),
+        matches=matches,
+    )
@@ -14,7 +14,9 @@ Easy to extend: add new signal sets without touching existing logic.
 """
 
 from enum import Enum
-from typing import Tuple
+from typing import Optional, Tuple
+
+from backend.core import keyword_engine as kw
 
 
 class QueryType(str, Enum):
@@ -117,15 +119,24 @@ _OFF_TOPIC_SIGNALS = {
 # Classifier
 # ─────────────────────────────────────────────────────────────────────────────
 
-def classify_query(query: str) -> Tuple[QueryType, float]:
+def classify_query(query: str, matches: Optional[kw.KeywordMatches] = None) -> Tuple[QueryType, float]:
     """
     Returns (QueryType, confidence_score 0.0–1.0).
 
     Confidence is indicative — use it for logging/debugging, not hard gates.
+    `matches` is the keyword scan of this query (scanned here if omitted).
     """
     q = query.strip().lower().rstrip("!?.,;:")
     words = q.split()
 
+    # Signal phrases are looked up in the shared keyword scan, limited to the
+    # stripped span `q` occupies inside query.lower()
+    if matches is None:
+        matches = kw.scan_query(query)
+    span = kw.stripped_span(matches.text, q)
+    if span is None:
+        matches, span = kw.get_keyword_engine().scan(q), (0, len(q))
+
     scores = {
         QueryType.GREETING:  0.0,
         QueryType.FACTUAL:   0.0,
@@ -146,14 +157,12 @@ def classify_query(query: str) -> Tuple[QueryType, float]:
             scores[QueryType.GREETING] += 1.0
 
     # ── Off-topic signals ─────────────────────────────────────────────────
-    for signal in _OFF_TOPIC_SIGNALS:
-        if signal in q:
-            scores[QueryType.OFF_TOPIC] += 2.0
-            break   # one strong off-topic hit is enough
+    if matches.has(kw.OFF_TOPIC, *span):
+        scores[QueryType.OFF_TOPIC] += 2.0   # one strong off-topic hit is enough
 
     # ── Factual signals ───────────────────────────────────────────────────
     has_gita_term = bool(_GITA_MAHABHARATA_TERMS.intersection(set(words)))
-    has_factual_starter = any(q.startswith(s) or s in q for s in _FACTUAL_QUESTION_STARTERS)
+    has_factual_starter = matches.has(kw.FACTUAL_STARTER, *span)
 
     if has_gita_term:
         scores[QueryType.FACTUAL] += 1.5
@@ -163,7 +172,7 @@ def classify_query(query: str) -> Tuple[QueryType, float]:
         scores[QueryType.FACTUAL] += 1.0  # combined bonus
 
     # ── Spiritual signals ─────────────────────────────────────────────────
-    spiritual_hits = sum(1 for s in _SPIRITUAL_SIGNALS if s in q)
+    spiritual_hits = len(matches.keys(kw.SPIRITUAL, *span))
     scores[QueryType.SPIRITUAL] += spiritual_hits * 0.5
 
     # Personal pronouns are a strong spiritual indicator
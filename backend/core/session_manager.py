@@ -1,34 +1,45 @@
+import asyncio
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
 
+from backend.core.session_store import InMemorySessionStore, SessionStore
+
 
 class SessionManager:
     """
-    In-memory session manager for conversation history.
+    Conversation history per session.
     Stores the last N queries per session with automatic TTL cleanup.
+
+    Where sessions live is delegated to a SessionStore: in-memory by default,
+    or SQLiteSessionStore to share sessions across uvicorn workers and
+    restarts. Expired sessions are purged by run_cleanup_loop() in the
+    background rather than on the request path.
     """
 
-    def __init__(self, max_history: int = 10, session_ttl_hours: int = 2):
-        self.sessions: Dict[str, Dict] = {}
+    def __init__(
+        self,
+        max_history: int = 10,
+        session_ttl_hours: int = 2,
+        max_sessions: int = 10000,
+        store: Optional[SessionStore] = None,
+    ):
         self.max_history = max_history
-        self.session_ttl = timedelta(hours=session_ttl_hours)
+        self.session_ttl_hours = session_ttl_hours
+        self.max_sessions = max_sessions
+        self.store = store or InMemorySessionStore(
+            max_history=max_history,
+            session_ttl_hours=session_ttl_hours,
+            max_sessions=max_sessions,
+        )
 
     def create_session(self) -> str:
         session_id = str(uuid.uuid4())
-        self.sessions[session_id] = {
-            "history": [],
-            "created_at": datetime.now(),
-            "last_accessed": datetime.now(),
-        }
+        self.store.create(session_id)
         return session_id
 
     def get_session(self, session_id: str) -> Optional[Dict]:
-        self._cleanup_expired()
-        session = self.sessions.get(session_id)
-        if session:
-            session["last_accessed"] = datetime.now()
-        return session
+        return self.store.touch(session_id)
 
     def add_to_history(
         self,
@@ -38,11 +49,6 @@ class SessionManager:
         verses: List[Dict],
         themes: List[str],
     ) -> str:
-        session = self.get_session(session_id)
-        if not session:
-            session_id = self.create_session()
-            session = self.sessions[session_id]
-
         entry = {
             "query": query,
             "response": response,
@@ -54,17 +60,14 @@ class SessionManager:
             "timestamp": datetime.now().isoformat(),
         }
 
-        session["history"].append(entry)
-
-        # Keep only the last max_history entries
-        if len(session["history"]) > self.max_history:
-            session["history"] = session["history"][-self.max_history :]
+        if not self.store.append(session_id, entry):
+            session_id = self.create_session()
+            self.store.append(session_id, entry)
 
         return session_id
 
     def get_history(self, session_id: str) -> List[Dict]:
-        session = self.get_session(session_id)
-        return session["history"] if session else []
+        return self.store.history(session_id)
 
     def get_conversation_context(self, session_id: str, last_n: int = 3) -> str:
         """Format recent history for LLM context injection."""
@@ -83,20 +86,28 @@ class SessionManager:
         return "\n".join(context_parts)
 
     def delete_session(self, session_id: str):
-        self.sessions.pop(session_id, None)
-
-    def _cleanup_expired(self):
-        now = datetime.now()
-        expired = [
-            sid
-            for sid, session in self.sessions.items()
-            if now - session["last_accessed"] > self.session_ttl
-        ]
-        for sid in expired:
-            del self.sessions[sid]
+        self.store.delete(session_id)
+
+    def purge_expired(self) -> int:
+        return self.store.purge_expired()
+
+    async def run_cleanup_loop(self, interval_seconds: float = 60.0):
+        """Background task: purge expired sessions every `interval_seconds`."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await loop.run_in_executor(None, self.purge_expired)
+            except Exception as e:
+                print(f"WARNING: session cleanup failed: {e}")
+
+    def close(self):
+        self.store.close()
 
     def get_stats(self) -> Dict:
         return {
-            "active_sessions": len(self.sessions),
-            "ttl_hours": self.session_ttl.seconds // 3600,
+            "active_sessions": self.store.count(),
+            "ttl_hours": self.session_ttl_hours,
+            "max_sessions": self.max_sessions,
+            **self.store.stats(),
         }
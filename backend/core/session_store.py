@@ -0,0 +1,404 @@
+"""
+Storage backends for SessionManager.
+
+  InMemorySessionStore — default; per-process, LRU-ordered, zero setup
+  SQLiteSessionStore   — one file shared by every uvicorn worker (WAL mode),
+                         survives restarts, write-behind batching for history
+
+Both implement the same small interface so SessionManager never needs to
+know where sessions live. Select with SESSION_STORE=memory|sqlite.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+class SessionStore:
+    """Interface every session backend implements."""
+
+    # True when calls do I/O (disk, locks held across a write transaction) —
+    # async callers must then run them off the event loop
+    blocking = False
+
+    def create(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    def touch(self, session_id: str) -> Optional[Dict]:
+        """Return the live session (and mark it accessed), or None if missing/expired."""
+        raise NotImplementedError
+
+    def append(self, session_id: str, entry: Dict) -> bool:
+        """Append a history entry. Returns False if the session does not exist."""
+        raise NotImplementedError
+
+    def history(self, session_id: str) -> List[Dict]:
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        """Drop expired sessions (and enforce the size cap). Returns how many were removed."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# In-memory (default)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class InMemorySessionStore(SessionStore):
+    """
+    Sessions live in an OrderedDict kept in last-access order (oldest first),
+    so expiry only ever inspects the front of the dict: each call pops the
+    sessions that have actually expired and stops at the first live one.
+    Cleanup is amortized O(1) per call instead of a scan over every session.
+    `max_sessions` caps memory — past it, the least-recently-used session is
+    evicted.
+    """
+
+    def __init__(self, max_history: int = 10, session_ttl_hours: float = 2, max_sessions: int = 10000):
+        self.sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self.max_history = max_history
+        self.session_ttl = timedelta(hours=session_ttl_hours)
+        self.max_sessions = max_sessions
+        self._lock = threading.RLock()
+        self.expired_count = 0
+        self.evicted_count = 0
+
+    def create(self, session_id: str) -> None:
+        now = datetime.now()
+        with self._lock:
+            self._cleanup_expired(now)
+            self.sessions[session_id] = {
+                "history": [],
+                "created_at": now,
+                "last_accessed": now,
+            }
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+                self.evicted_count += 1
+
+    def touch(self, session_id: str) -> Optional[Dict]:
+        now = datetime.now()
+        with self._lock:
+            self._cleanup_expired(now)
+            session = self.sessions.get(session_id)
+            if session:
+                session["last_accessed"] = now
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def append(self, session_id: str, entry: Dict) -> bool:
+        with self._lock:
+            session = self.touch(session_id)
+            if not session:
+                return False
+            session["history"].append(entry)
+            # Keep only the last max_history entries
+            if len(session["history"]) > self.max_history:
+                session["history"] = session["history"][-self.max_history :]
+            return True
+
+    def history(self, session_id: str) -> List[Dict]:
+        with self._lock:
+            session = self.touch(session_id)
+            return list(session["history"]) if session else []
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self.sessions.pop(session_id, None)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            before = self.expired_count
+            self._cleanup_expired(datetime.now())
+            return self.expired_count - before
+
+    def _cleanup_expired(self, now: datetime) -> None:
+        """Pop expired sessions from the least-recently-used end; stop at the first live one."""
+        while self.sessions:
+            oldest_id = next(iter(self.sessions))
+            if now - self.sessions[oldest_id]["last_accessed"] <= self.session_ttl:
+                break
+            del self.sessions[oldest_id]
+            self.expired_count += 1
+
+    def count(self) -> int:
+        return len(self.sessions)
+
+    def stats(self) -> Dict:
+        return {
+            "store": "memory",
+            "expired_sessions": self.expired_count,
+            "evicted_sessions": self.evicted_count,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SQLite (multi-worker, durable)
+# ─────────────────────────────────────────────────────────────────────────────
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id            TEXT PRIMARY KEY,
+    created_at    REAL NOT NULL,
+    last_accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_accessed ON sessions(last_accessed);
+CREATE TABLE IF NOT EXISTS history (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    entry      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_session ON history(session_id, id);
+"""
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in one SQLite file in WAL mode: any number of worker processes
+    read concurrently while a single writer commits.
+
+    Write-behind: history appends and last-access touches are buffered in
+    memory and committed by a background thread in one transaction every
+    `flush_interval` seconds (or as soon as `batch_size` writes are pending).
+    Reads in this process merge the pending buffer, so a session always sees
+    its own latest turn; other workers see it after the next flush.
+    Session creation is written through immediately so a follow-up request
+    landing on another worker finds the session.
+
+    Expiry is never scanned on the request path — purge_expired() is run by
+    SessionManager's background cleanup task.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        max_history: int = 10,
+        session_ttl_hours: float = 2,
+        max_sessions: int = 10000,
+        flush_interval: float = 0.05,
+        batch_size: int = 64,
+    ):
+        self.path = path
+        self.max_history = max_history
+        self.ttl_seconds = session_ttl_hours * 3600
+        self.max_sessions = max_sessions
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._local = threading.local()
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()     # one flush at a time keeps history order
+        self._pending_history: Dict[str, List[Dict]] = {}
+        self._pending_touch: Dict[str, float] = {}
+        self._pending_count = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self.flushes = 0
+        self.flushed_writes = 0
+        self.expired_count = 0
+        self.evicted_count = 0
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="session-flush", daemon=True)
+        self._flusher.start()
+
+    # ── Connections ───────────────────────────────────────────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread — sqlite3 connections are not shareable."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    # ── Interface ─────────────────────────────────────────────────────────────
+
+    def create(self, session_id: str) -> None:
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sessions (id, created_at, last_accessed) VALUES (?, ?, ?)",
+            (session_id, now, now),
+        )
+
+    def touch(self, session_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT created_at, last_accessed FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        with self._pending_lock:
+            last_accessed = max(row[1], self._pending_touch.get(session_id, 0.0))
+            if now - last_accessed > self.ttl_seconds:
+                return None
+            self._pending_touch[session_id] = now
+            self._pending_count += 1
+        self._maybe_wake()
+
+        return {
+            "created_at": datetime.fromtimestamp(row[0]),
+            "last_accessed": datetime.fromtimestamp(now),
+        }
+
+    def append(self, session_id: str, entry: Dict) -> bool:
+        if self.touch(session_id) is None:
+            return False
+        with self._pending_lock:
+            self._pending_history.setdefault(session_id, []).append(entry)
+            self._pending_count += 1
+        self._maybe_wake()
+        return True
+
+    def history(self, session_id: str) -> List[Dict]:
+        if self.touch(session_id) is None:
+            return []
+        # Holding the flush lock means no batch is half-way between the pending
+        # buffer and the table while we read both
+        with self._flush_lock:
+            rows = self._conn().execute(
+                "SELECT entry FROM history WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, self.max_history),
+            ).fetchall()
+            with self._pending_lock:
+                pending = list(self._pending_history.get(session_id, []))
+        committed = [json.loads(r[0]) for r in reversed(rows)]
+        return (committed + pending)[-self.max_history :]
+
+    def delete(self, session_id: str) -> None:
+        with self._pending_lock:
+            self._pending_history.pop(session_id, None)
+            self._pending_touch.pop(session_id, None)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM history WHERE session_id = ?", (session_id,))
+        conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        conn.execute("COMMIT")
+
+    def purge_expired(self) -> int:
+        self.flush()
+        cutoff = time.time() - self.ttl_seconds
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        expired = conn.execute("DELETE FROM sessions WHERE last_accessed < ?", (cutoff,)).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM sessions WHERE id IN "
+                "(SELECT id FROM sessions ORDER BY last_accessed ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.evicted_count += overflow
+        conn.execute("DELETE FROM history WHERE session_id NOT IN (SELECT id FROM sessions)")
+        conn.execute("COMMIT")
+        self.expired_count += expired
+        return expired + max(overflow, 0)
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def stats(self) -> Dict:
+        with self._pending_lock:
+            pending = self._pending_count
+        return {
+            "store": "sqlite",
+            "path": self.path,
+            "pending_writes": pending,
+            "flushes": self.flushes,
+            "flushed_writes": self.flushed_writes,
+            "expired_sessions": self.expired_count,
+            "evicted_sessions": self.evicted_count,
+        }
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+
+    # ── Write-behind ──────────────────────────────────────────────────────────
+
+    def _maybe_wake(self) -> None:
+        if self._pending_count >= self.batch_size:
+            self._wake.set()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"WARNING: session flush failed, will retry: {e}")
+
+    def flush(self) -> None:
+        """Commit every buffered append / touch in one transaction."""
+        with self._flush_lock:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        with self._pending_lock:
+            if not self._pending_count:
+                return
+            history, self._pending_history = self._pending_history, {}
+            touches, self._pending_touch = self._pending_touch, {}
+            count, self._pending_count = self._pending_count, 0
+
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE sessions SET last_accessed = MAX(last_accessed, ?) WHERE id = ?",
+                [(ts, sid) for sid, ts in touches.items()],
+            )
+            conn.executemany(
+                "INSERT INTO history (session_id, entry) VALUES (?, ?)",
+                [(sid, json.dumps(e, ensure_ascii=False)) for sid, entries in history.items() for e in entries],
+            )
+            # Keep only the last max_history entries per touched session
+            conn.executemany(
+                "DELETE FROM history WHERE session_id = ? AND id NOT IN "
+                "(SELECT id FROM history WHERE session_id = ? ORDER BY id DESC LIMIT ?)",
+                [(sid, sid, self.max_history) for sid in history],
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Put the batch back so nothing is lost; newer writes stay after it
+            with self._pending_lock:
+                for sid, entries in history.items():
+                    self._pending_history[sid] = entries + self._pending_history.get(sid, [])
+                for sid, ts in touches.items():
+                    self._pending_touch[sid] = max(ts, self._pending_touch.get(sid, 0.0))
+                self._pending_count += count
+            raise
+
+        self.flushes += 1
+        self.flushed_writes += count
@@ -0,0 +1,149 @@
+"""
+Single-flight coalescing of identical in-flight queries for Gita Wisdom Guide.
+
+When a post is shared, many people submit the same question within seconds.
+Instead of one retrieval + one LLM generation each, the first request starts
+a Flight — a task that runs retrieval and generation once — and identical
+requests arriving while it runs attach to it:
+
+    flight, leader = registry.join(key)
+    if leader:
+        flight.start(produce(flight))          # retrieval + generation, once
+    context = await flight.context()           # used verses, themes, ...
+    async for chunk in flight.tokens():        # every token, from the first
+        ...
+
+Streaming subscribers get the full token stream, including tokens emitted
+before they attached; non-streaming callers await flight.result(). The flight
+belongs to no single client: the first requester disconnecting does not cut
+off the others. It is cancelled only once every attached client has left.
+
+The key is built from the QueryAnalysis (normalized text, mood, themes) plus
+the route and the session's conversation context, so requests share a flight
+only when they would have sent the LLM the same prompt.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
+
+
+class Flight:
+    def __init__(self, registry: "InFlightRegistry", key: Hashable):
+        self._registry = registry
+        self.key = key
+        self.parts: List[str] = []
+        self.meta: Dict[str, Any] = {}
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.clients = 0
+        self._context: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def start(self, coro) -> None:
+        self._task = asyncio.ensure_future(coro)
+        self._task.add_done_callback(self._finished)
+
+    def set_context(self, context: Any) -> None:
+        if not self._context.done():
+            self._context.set_result(context)
+
+    def publish(self, chunk: str) -> None:
+        self.parts.append(chunk)
+        self._wake.set()
+        self._wake = asyncio.Event()
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._registry._discard(self)
+        if task.cancelled():
+            self.error = asyncio.CancelledError()
+        elif task.exception() is not None:
+            self.error = task.exception()
+        if not self._context.done():
+            if self.error is not None:
+                self._context.set_exception(self.error)
+                self._context.exception()    # retrieved — no "never retrieved" warning
+            else:
+                self._context.set_result(None)
+        self.done = True
+        self._wake.set()
+
+    # ── Client side ───────────────────────────────────────────────────────────
+
+    def attach(self) -> None:
+        self.clients += 1
+
+    def detach(self) -> None:
+        """A client is finished (or gone); the last one out cancels unfinished work."""
+        self.clients -= 1
+        if self.clients <= 0 and self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def context(self) -> Any:
+        return await asyncio.shield(self._context)
+
+    async def result(self) -> Any:
+        return await asyncio.shield(self._task)
+
+    async def tokens(self) -> AsyncIterator[str]:
+        """Every published chunk from the first, then new ones as they arrive."""
+        i = 0
+        while True:
+            while i < len(self.parts):
+                yield self.parts[i]
+                i += 1
+            if self.done:
+                break
+            await self._wake.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class InFlightRegistry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, Flight] = {}
+        self.led = 0
+        self.joined = 0
+
+    @staticmethod
+    def key(route: str, analysis, conversation_context: str = "") -> Tuple:
+        history = hashlib.blake2b(conversation_context.encode("utf-8"), digest_size=8).digest() \
+            if conversation_context else b""
+        return (route, analysis.normalized, analysis.mood.value, tuple(sorted(analysis.themes)), history)
+
+    def join(self, key: Hashable) -> Tuple[Flight, bool]:
+        """
+        The running flight for `key` and False, or a new (not yet started)
+        flight and True — the caller must then start() it. Either way the
+        caller is attached and must detach() when done.
+        """
+        flight = self._flights.get(key) if self.enabled else None
+        if flight is not None and not flight.done:
+            self.joined += 1
+            leader = False
+        else:
+            flight = Flight(self, key)
+            if self.enabled:
+                self._flights[key] = flight
+            self.led += 1
+            leader = True
+        flight.attach()
+        return flight, leader
+
+    def _discard(self, flight: Flight) -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def stats(self) -> Dict:
+        total = self.led + self.joined
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "generations": self.led,
+            "coalesced": self.joined,
+            "coalesce_rate": round(self.joined / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,112 @@
+"""
+Server-Sent Events encoding for the streaming wisdom route.
+
+Providers emit many tiny chunks (often a single word). Writing one SSE frame
+per chunk means one json.dumps, one ASGI send and one socket write each — under
+many concurrent streams that is mostly overhead. Instead:
+
+    async for text in coalesce(chunks, max_bytes=256, max_delay=0.03):
+        yield token_frame(text)
+
+coalesce() merges chunks until `max_bytes` is buffered or `max_delay` seconds
+have passed since the oldest unsent chunk (the very first chunk is flushed at
+once, so time-to-first-token is unaffected). Frames are pre-encoded bytes:
+the event prefix is a constant and only the text itself goes through the JSON
+encoder (orjson when installed).
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator
+
+try:
+    import orjson
+except ImportError:   # optional — stdlib json is the fallback
+    orjson = None
+
+
+if orjson is not None:
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+else:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_TOKEN_PREFIX = b'data: {"type":"token","content":'
+_FRAME_SUFFIX = b"}\n\n"
+
+
+def event_frame(payload: dict) -> bytes:
+    return b"data: " + dumps(payload) + b"\n\n"
+
+
+def token_frame(text: str) -> bytes:
+    return _TOKEN_PREFIX + dumps(text) + _FRAME_SUFFIX
+
+
+async def coalesce(chunks: AsyncIterator[str], max_bytes: int, max_delay: float) -> AsyncIterator[str]:
+    """
+    Re-chunk `chunks` into fewer, larger pieces (see module docstring).
+    max_delay <= 0 disables coalescing. Concatenating the output always gives
+    exactly the concatenated input.
+
+    One reader task drains `chunks` into a buffer; the flush-window timer is a
+    single call_later per flush, not a task or timeout per chunk.
+    """
+    if max_delay <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    buf = []
+    state = {"size": 0, "done": False, "error": None, "timer": None}
+
+    async def _read():
+        first = True
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                buf.append(chunk)
+                # UTF-8 bytes, not characters — transliterated Sanskrit is multi-byte
+                state["size"] += len(chunk.encode("utf-8"))
+                if first or state["size"] >= max_bytes:
+                    first = False
+                    ready.set()
+                elif state["timer"] is None:
+                    state["timer"] = loop.call_later(max_delay, ready.set)
+        except Exception as e:
+            state["error"] = e
+        finally:
+            state["done"] = True
+            ready.set()
+
+    reader = asyncio.ensure_future(_read())
+    try:
+        while True:
+            await ready.wait()
+            ready.clear()
+            if state["timer"] is not None:
+                state["timer"].cancel()
+                state["timer"] = None
+            if buf:
+                text = "".join(buf)
+                buf.clear()
+                state["size"] = 0
+                yield text
+            if state["done"] and not buf:
+                break
+        if state["error"] is not None:
+            raise state["error"]
+    finally:
+        if state["timer"] is not None:
+            state["timer"].cancel()
+        if not reader.done():
+            reader.cancel()
+            try:
+                await reader
+            except asyncio.CancelledError:
+                pass
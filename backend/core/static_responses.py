@@ -0,0 +1,78 @@
+"""
+Precomputed static responses for Gita Wisdom Guide.
+
+The browse endpoints (/themes, /chapter/{n}/verses, /verse/daily) return the
+same bytes to every user. Their bodies are rendered once, compressed once
+(gzip, plus brotli when the `brotli` package is installed), and served as-is:
+
+    body = StaticBody.render(payload)
+    return body.respond(request, cache_control="public, max-age=86400")
+
+Each body carries a strong ETag (content hash, one per encoding), so a client
+or CDN revalidating with If-None-Match gets an empty 304.
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:   # optional — gzip alone is fine
+    brotli = None
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class StaticBody:
+    __slots__ = ("identity", "gzip", "br", "etag")
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self.gzip = gzip.compress(identity, compresslevel=9, mtime=0)
+        self.br: Optional[bytes] = brotli.compress(identity, quality=11) if brotli else None
+        self.etag = hashlib.sha256(identity).hexdigest()[:20]
+
+    @classmethod
+    def render(cls, payload) -> "StaticBody":
+        # Same encoding as FastAPI's JSONResponse
+        return cls(json.dumps(payload, ensure_ascii=False, allow_nan=False,
+                              indent=None, separators=(",", ":")).encode("utf-8"))
+
+    def _etag_for(self, coding: str) -> str:
+        return f'"{self.etag}"' if coding == "identity" else f'"{self.etag}-{coding}"'
+
+    def _not_modified(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return any(self._etag_for(c) in tags for c in ("identity", "gzip", "br"))
+
+    def respond(self, request: Request, cache_control: str) -> Response:
+        accept = request.headers.get("accept-encoding", "")
+        if self.br is not None and _accepts(accept, "br"):
+            coding, content = "br", self.br
+        elif _accepts(accept, "gzip"):
+            coding, content = "gzip", self.gzip
+        else:
+            coding, content = "identity", self.identity
+
+        headers = {
+            "ETag": self._etag_for(coding),
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self._not_modified(request.headers.get("if-none-match", "")):
+            return Response(status_code=304, headers=headers)
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(content=content, media_type="application/json", headers=headers)
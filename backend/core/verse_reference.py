@@ -0,0 +1,156 @@
+"""
+Direct verse references for Gita Wisdom Guide.
+
+Queries like "BG 2.47", "chapter 2 verse 47", "what does 18.66 say" or
+"explain Gita 3:19 - 21" name the verse they are about. For those, embedding
+the query and running the vector search plan is wasted work (and may not even
+surface the verse asked for). Instead:
+
+    ref    = parse_verse_reference(query)        # regex, microseconds
+    verses = verse_index.resolve(ref)            # dict lookups, constant time
+
+and the exact verse(s) become the LLM context.
+
+Bare "N.M" numbers are only read as a reference when the query looks like it
+is asking about a verse (a cue word like "say", "explain", "verse", or nothing
+but the reference) — "I slept 7.5 hours" is not chapter 7, verse 5.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from backend.core.verse_table import VerseRecord, VerseTable
+
+# Longest passage injected for one range reference
+MAX_REFERENCE_VERSES = 10
+
+_RANGE_SEP = r"\s*(?:-|–|—|to|through)\s*"
+
+# "BG 2.47", "gita 3:19", "bhagavad gita 2.47-50", "verse 2.47 - 2.49", "shloka 18.66"
+_PREFIXED = re.compile(
+    r"\b(?:bg|b\.g\.|gita|geeta|bhagavad\s*gita|bhagavad\s*geeta|verses?|shlokas?|slokas?)"
+    r"\s*\.?\s*(\d{1,2})\s*[.:]\s*(\d{1,2})"
+    r"(?:" + _RANGE_SEP + r"(?:(\d{1,2})\s*[.:]\s*)?(\d{1,2}))?"
+    r"(?![\d.:])"
+)
+
+# "chapter 2 verse 47", "ch. 2, v. 47", "chapter 2 verses 47 to 50", "adhyaya 2 shloka 47"
+_CHAPTER_VERSE = re.compile(
+    r"\b(?:chapter|ch|adhyaya)\s*\.?\s*(\d{1,2})\s*[,;:]?\s*"
+    r"(?:verses?|vv?|shlokas?|slokas?|text)\s*\.?\s*(\d{1,2})"
+    r"(?:" + _RANGE_SEP + r"(\d{1,2}))?"
+    r"(?!\d)"
+)
+
+# Bare "18.66", "3:19", "2.47-49" — accepted only with a cue (see module docstring)
+_BARE = re.compile(
+    r"(?<![\d.:])(\d{1,2})\s*[.:]\s*(\d{1,2})"
+    r"(?:" + _RANGE_SEP + r"(\d{1,2}))?"
+    r"(?![\d.:]|\s*(?:%|am\b|pm\b|hours?|hrs?|years?|yrs?|mins?|minutes?|km|kg|times))"
+)
+_BARE_CUES = re.compile(
+    r"\b(?:say|says|said|mean|means|meaning|explain|explanation|interpret|verse|verses|"
+    r"shloka|sloka|gita|geeta|krishna|teach|teaches|teaching|recite|quote)\b"
+)
+_ONLY_REFERENCE = re.compile(r"^\W*(?:bg\W*)?\d{1,2}\s*[.:]\s*\d{1,2}(?:" + _RANGE_SEP + r"\d{1,2})?\W*$")
+
+
+@dataclass(frozen=True)
+class VerseReference:
+    chapter: int
+    start: int
+    end: int      # == start for a single verse
+
+    @property
+    def label(self) -> str:
+        if self.end == self.start:
+            return f"{self.chapter}.{self.start}"
+        return f"{self.chapter}.{self.start}-{self.end}"
+
+
+def _build(chapter: str, start: str, end_chapter: Optional[str], end: Optional[str]) -> Optional[VerseReference]:
+    ch, first = int(chapter), int(start)
+    last = int(end) if end else first
+    if end_chapter and int(end_chapter) != ch:
+        last = first    # cross-chapter ranges: answer about the first verse only
+    if not 1 <= ch <= 18 or first < 1 or last < first:
+        return None
+    return VerseReference(ch, first, min(last, first + MAX_REFERENCE_VERSES - 1))
+
+
+def parse_verse_reference(query: str) -> Optional[VerseReference]:
+    """The first verse reference named in `query`, or None."""
+    q = query.lower()
+    if not any(c.isdigit() for c in q):
+        return None
+
+    m = _PREFIXED.search(q)
+    if m:
+        return _build(m.group(1), m.group(2), m.group(3), m.group(4))
+
+    m = _CHAPTER_VERSE.search(q)
+    if m:
+        return _build(m.group(1), m.group(2), None, m.group(3))
+
+    m = _BARE.search(q)
+    if m and (_BARE_CUES.search(q) or _ONLY_REFERENCE.match(q)):
+        return _build(m.group(1), m.group(2), None, m.group(3))
+
+    return None
+
+
+class VerseReferenceIndex:
+    """
+    Every valid (chapter, verse) → the VerseTable record holding its text.
+
+    The processed corpus merges a few consecutive verses into one record
+    (e.g. 1.4 covers 1.4–1.6); a reference to a merged-away verse resolves to
+    the record that contains it.
+    """
+
+    def __init__(self, table: VerseTable):
+        self._table = table
+        self._records: Dict[Tuple[int, int], VerseRecord] = {}
+        for ch in range(1, 19):
+            current = None
+            for vs in range(1, table.chapter_length(ch) + 1):
+                current = table.get(ch, vs) or current
+                if current is not None:
+                    self._records[(ch, vs)] = current
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, chapter: int, verse: int) -> Optional[VerseRecord]:
+        return self._records.get((chapter, verse))
+
+    def resolve(self, ref: VerseReference, neighbours: int = 0) -> List[Dict]:
+        """
+        The referenced verse(s) plus `neighbours` verses either side, shaped
+        like retriever results. Empty if the reference does not exist.
+        """
+        length = self._table.chapter_length(ref.chapter)
+        if not length or ref.start > length:
+            return []
+        first = max(1, ref.start - neighbours)
+        last = min(length, ref.end + neighbours)
+
+        results: List[Dict] = []
+        seen = set()
+        for vs in range(first, last + 1):
+            record = self._records.get((ref.chapter, vs))
+            if record is None or id(record) in seen:
+                continue
+            seen.add(id(record))
+            results.append({
+                "text": record.text,
+                "chapter": record.chapter,
+                "verse": record.verse,
+                "verse_id": record.verse_id,
+                "theme": record.theme,
+                "content_type": "verse",
+                "relevance_score": 1.0,
+                "distance": 0.0,
+            })
+        return results
@@ -0,0 +1,102 @@
+"""
+In-memory verse table for Gita Wisdom Guide.
+
+Built once at startup from the processed corpus and sanskrit_lookup.json, and
+shared by every code path that needs a verse by number — the chapter and daily
+verse routes, Sanskrit enrichment of retrieval results, and direct verse
+references:
+
+    table = VerseTable(documents, sanskrit)
+    table.get(2, 47).sanskrit          # O(1), Sanskrit already joined in
+    table.chapter(2)                   # precomputed, sorted by verse
+
+Records are slot-based objects holding only what the API returns (no
+word_count / content_type per verse), and the Sanskrit lookup dict is not
+kept once it has been joined.
+"""
+
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class VerseRecord:
+    __slots__ = ("chapter", "verse", "verse_id", "text", "theme", "sanskrit", "transliteration")
+
+    def __init__(self, chapter: int, verse: int, verse_id: str, text: str, theme: str,
+                 sanskrit: Optional[str] = None, transliteration: Optional[str] = None):
+        self.chapter = chapter
+        self.verse = verse
+        self.verse_id = verse_id
+        self.text = text
+        self.theme = theme
+        self.sanskrit = sanskrit
+        self.transliteration = transliteration
+
+    def to_dict(self) -> Dict:
+        return {
+            "chapter":         self.chapter,
+            "verse":           self.verse,
+            "verse_id":        self.verse_id,
+            "text":            self.text,
+            "theme":           self.theme,
+            "sanskrit":        self.sanskrit,
+            "transliteration": self.transliteration,
+        }
+
+
+class VerseTable:
+    def __init__(self, documents: List[Dict], sanskrit: Optional[Dict[str, Dict]] = None):
+        sanskrit = sanskrit or {}
+        rows: List[VerseRecord] = []
+        for d in documents:
+            if d.get("content_type") != "verse" or not d.get("chapter") or not d.get("verse"):
+                continue
+            ch, vs = int(d["chapter"]), int(d["verse"])
+            sk = sanskrit.get(f"{ch}_{vs}", {})
+            rows.append(VerseRecord(
+                chapter=ch,
+                verse=vs,
+                verse_id=d.get("verse_id", ""),
+                text=d.get("text", ""),
+                theme=sys.intern(d.get("theme", "general")),
+                sanskrit=sk.get("sanskrit"),
+                transliteration=sk.get("transliteration"),
+            ))
+
+        # Source order is kept: the daily verse rotates through it
+        self._rows: Tuple[VerseRecord, ...] = tuple(rows)
+        self._by_key: Dict[Tuple[int, int], VerseRecord] = {(r.chapter, r.verse): r for r in rows}
+
+        chapters: Dict[int, List[VerseRecord]] = {}
+        for r in rows:
+            chapters.setdefault(r.chapter, []).append(r)
+        self._chapters: Dict[int, Tuple[VerseRecord, ...]] = {
+            ch: tuple(sorted(recs, key=lambda r: r.verse)) for ch, recs in chapters.items()
+        }
+
+        # Chapter lengths from both sources — the corpus merges some verses away
+        chapter_len = {ch: recs[-1].verse for ch, recs in self._chapters.items()}
+        for key in sanskrit:
+            ch, _, vs = key.partition("_")
+            if ch.isdigit() and vs.isdigit():
+                chapter_len[int(ch)] = max(chapter_len.get(int(ch), 0), int(vs))
+        self._chapter_len = chapter_len
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[VerseRecord]:
+        return iter(self._rows)
+
+    def __getitem__(self, index: int) -> VerseRecord:
+        return self._rows[index]
+
+    def get(self, chapter: int, verse: int) -> Optional[VerseRecord]:
+        return self._by_key.get((chapter, verse))
+
+    def chapter(self, chapter: int) -> Tuple[VerseRecord, ...]:
+        return self._chapters.get(chapter, ())
+
+    def chapter_length(self, chapter: int) -> int:
+        """Highest verse number in the chapter (counting merged-away verses)."""
+        return self._chapter_len.get(chapter, 0)
@@ -4,10 +4,13 @@ Run with: uvicorn backend.main:app --reload --port 8000
 (from the project root: gita-wisdom-guide/)
 """
 
+import asyncio
 import json
 import sys
+import time
 import traceback
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -20,6 +23,16 @@ for _p in [str(ROOT_DIR), str(ROOT_DIR / "src")]:
         sys.path.insert(0, _p)
 
 
+@contextmanager
+def _timed(timings: dict, name: str):
+    """Record how long a startup step took, in milliseconds."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize heavyweight components once at startup, store on app.state."""
@@ -27,53 +40,134 @@ async def lifespan(app: FastAPI):
     print("  Gita Wisdom Guide API v2.0  — Starting up")
     print("=" * 55)
 
+    startup_t0 = time.perf_counter()
+    timings: dict = {}
+    app.state.startup_timings = timings
+
     # Import here (after sys.path is configured)
-    from backend.config import settings
-    from vector_store import GitaVectorStore
-    from backend.core.enhanced_retrieval import EnhancedGitaRetriever
-    from backend.core.llm_handler import EnhancedGitaLLMHandler
+    with _timed(timings, "imports_ms"):
+        from backend.config import settings
+        from corpus import load_documents
+        from vector_store import GitaVectorStore
+        from backend.core.enhanced_retrieval import EnhancedGitaRetriever
+        from backend.core.llm_handler import EnhancedGitaLLMHandler
+        from backend.core.answer_cache import SemanticAnswerCache
+        from backend.core.lexical_index import BM25Index
 
     print(f"Vector DB path : {settings.VECTOR_DB_PATH}")
+    print(f"Vector engine  : {settings.VECTOR_ENGINE}")
+    print(f"Model cache    : {settings.FASTEMBED_CACHE_DIR}{' (offline)' if settings.EMBED_OFFLINE else ''}")
     print(f"LLM model      : {settings.DEFAULT_LLM}")
 
     print("Loading vector store...")
-    app.state.vector_store = GitaVectorStore(
-        collection_name=settings.COLLECTION_NAME,
-        persist_directory=settings.VECTOR_DB_PATH,
-    )
-
-    print("Initializing enhanced retriever...")
+    with _timed(timings, "vector_store_open_ms"):
+        app.state.vector_store = GitaVectorStore(
+            collection_name=settings.COLLECTION_NAME,
+            persist_directory=settings.VECTOR_DB_PATH,
+            engine=settings.VECTOR_ENGINE,
+            data_path=settings.DATA_PATH,
+            query_cache_size=settings.EMBED_CACHE_SIZE,
+            query_cache_bytes=int(settings.EMBED_CACHE_MAX_MB * 1024 * 1024),
+            model_cache_dir=settings.FASTEMBED_CACHE_DIR,
+            offline=settings.EMBED_OFFLINE,
+            artifact_dir=settings.EMBEDDING_ARTIFACT_DIR,
+            chunk_embedding=settings.CHUNK_EMBEDDING,
+        )
+
+    # Eager warm-up: model load + first ONNX session + first search happen now,
+    # not on the first user's request after a cold start. In the background
+    # variant, retrieval runs lexical-only until the model is ready.
+    if settings.WARMUP_ON_STARTUP and settings.WARMUP_IN_BACKGROUND:
+        app.state.vector_store.start_background_warm_up()
+        print("Warm-up        : running in background (lexical retrieval until ready)")
+    elif settings.WARMUP_ON_STARTUP:
+        try:
+            timings.update(app.state.vector_store.warm_up())
+        except Exception as e:
+            print(f"WARNING: Embedding warm-up failed — model will load lazily: {e}")
+
+    # Browse queries (theme / chapter) are fixed strings — embed them once now
+    # (not during a background warm-up: that would load the model right here)
+    from backend.api.routes.verses import browse_queries
+    if not (settings.WARMUP_ON_STARTUP and settings.WARMUP_IN_BACKGROUND):
+        try:
+            with _timed(timings, "query_cache_seed_ms"):
+                seeded = app.state.vector_store.warm_query_cache(browse_queries())
+            print(f"Query cache    : {seeded} browse queries pre-embedded")
+        except Exception as e:
+            print(f"WARNING: Could not pre-seed query cache: {e}")
+
+    # Compile the shared keyword automaton now rather than on the first query
+    from backend.core.keyword_engine import get_keyword_engine
+    with _timed(timings, "keyword_engine_ms"):
+        get_keyword_engine()
+
+    # Processed corpus — feeds the BM25 index and the Daily Verse pool
+    _all_docs = []
+    if Path(settings.DATA_PATH).exists():
+        with _timed(timings, "corpus_ms"):
+            _all_docs = load_documents(settings.DATA_PATH)
+
+    lexical_index = None
+    if _all_docs:
+        with _timed(timings, "lexical_index_ms"):
+            lexical_index = BM25Index(_all_docs)
+        print(f"Lexical index  : {lexical_index.stats()['terms']} terms over {len(lexical_index)} documents")
+
+    print(f"Initializing enhanced retriever ({settings.RETRIEVAL_MODE})...")
     app.state.retriever = EnhancedGitaRetriever(
         app.state.vector_store,
         relevance_threshold=settings.RELEVANCE_THRESHOLD,
+        mode=settings.RETRIEVAL_MODE,
+        lexical_index=lexical_index,
     )
 
-    print("Initializing LLM handler...")
-    app.state.llm_handler = EnhancedGitaLLMHandler()
+    # Bounded pool for blocking retrieval work (ONNX inference, vector search)
+    app.state.retrieval_executor = ThreadPoolExecutor(
+        max_workers=settings.RETRIEVAL_WORKERS,
+        thread_name_prefix="retrieval",
+    )
 
-    # Sanskrit lookup — loaded once, served from memory (tiny ~500 KB)
+    print("Initializing LLM handler...")
+    with _timed(timings, "llm_init_ms"):
+        app.state.llm_handler = EnhancedGitaLLMHandler()
+
+    app.state.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        app.state.answer_cache = SemanticAnswerCache(
+            threshold=settings.ANSWER_CACHE_THRESHOLD,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+        )
+        print(f"Answer cache   : cosine >= {settings.ANSWER_CACHE_THRESHOLD}, "
+              f"{settings.ANSWER_CACHE_MAX_ENTRIES} entries, TTL {settings.ANSWER_CACHE_TTL_SECONDS}s")
+
+    # Sanskrit lookup — joined into the verse table below, not kept on its own
+    sanskrit = {}
     sanskrit_path = ROOT_DIR / "data" / "sanskrit_lookup.json"
     if sanskrit_path.exists():
-        with open(sanskrit_path, encoding="utf-8") as _f:
-            app.state.sanskrit = json.load(_f)
-        print(f"Sanskrit index : {len(app.state.sanskrit)} verses loaded")
+        with _timed(timings, "sanskrit_json_ms"), open(sanskrit_path, encoding="utf-8") as _f:
+            sanskrit = json.load(_f)
+        print(f"Sanskrit index : {len(sanskrit)} verses loaded")
     else:
-        app.state.sanskrit = {}
         print("Sanskrit index : not found — run  python data/fetch_sanskrit.py  once")
 
-    # All individual verses — used for Daily Verse feature
-    gita_data_path = ROOT_DIR / "data" / "processed_gita_data.json"
-    if gita_data_path.exists():
-        with open(gita_data_path, encoding="utf-8") as _f:
-            _all_docs = json.load(_f)
-        app.state.all_verses = [
-            d for d in _all_docs
-            if d.get("content_type") == "verse"
-            and d.get("chapter") and d.get("verse")
-        ]
-        print(f"Verse pool     : {len(app.state.all_verses)} verses for daily feature")
-    else:
-        app.state.all_verses = []
+    # Verse table — every verse by (chapter, verse), Sanskrit pre-joined; serves
+    # the chapter / daily routes, enrichment and direct verse references
+    from backend.core.verse_table import VerseTable
+    from backend.core.verse_reference import VerseReferenceIndex
+    with _timed(timings, "verse_table_ms"):
+        app.state.verse_table = VerseTable(_all_docs, sanskrit)
+        app.state.verse_index = VerseReferenceIndex(app.state.verse_table)
+    del sanskrit
+
+    # Browse responses (chapters, daily verse) rendered + compressed once
+    if len(app.state.verse_table):
+        from backend.api.routes.verses import BrowseResponses
+        with _timed(timings, "browse_responses_ms"):
+            app.state.browse_responses = BrowseResponses(app.state.verse_table)
+    if len(app.state.verse_table):
+        print(f"Verse table    : {len(app.state.verse_table)} verses, {len(app.state.verse_index)} references")
 
     info = app.state.vector_store.get_collection_info()
     print(f"Vector store   : {info.get('document_count', 0)} documents indexed")
@@ -84,12 +178,26 @@ async def lifespan(app: FastAPI):
     if llm.groq_client:
         _providers.append(f"Groq fallback ({llm.groq_model_name})")
     print(f"LLM ready      : {', '.join(_providers) or 'NONE — check API keys'}")
+    timings["total_ms"] = round((time.perf_counter() - startup_t0) * 1000, 1)
+    print("Startup timing : " + ", ".join(f"{k[:-3]}={v:.0f}ms" for k, v in timings.items()))
+
+    # Expired sessions are purged in the background, never on the request path
+    from backend.api.routes.wisdom import get_session_manager
+    sessions = get_session_manager()
+    cleanup_task = asyncio.create_task(
+        sessions.run_cleanup_loop(settings.SESSION_CLEANUP_INTERVAL_SECONDS)
+    )
+    print(f"Session store  : {settings.SESSION_STORE}, cleanup every {settings.SESSION_CLEANUP_INTERVAL_SECONDS}s")
+
     print("API is ready!  Docs -> http://localhost:8000/docs")
     print("=" * 55)
 
     yield  # App runs here
 
     # Cleanup
+    cleanup_task.cancel()
+    sessions.close()   # flushes any write-behind session history
+    app.state.retrieval_executor.shutdown(wait=False, cancel_futures=True)
     del app.state.vector_store
     del app.state.retriever
     del app.state.llm_handler
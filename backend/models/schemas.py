@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class QueryRequest(BaseModel):
@@ -31,6 +31,8 @@ class HealthResponse(BaseModel):
     document_count: int
     embedding_model: str
     version: str
+    model_ready: bool = False
+    startup_timings: Dict[str, float] = {}
 
 
 class SessionHistoryEntry(BaseModel):
@@ -0,0 +1,174 @@
+"""
+Lexical work per request: per-list `phrase in query` scans vs. one keyword scan.
+
+A request's lexical components — classify_query, detect_mood,
+preprocess_query (contractions + expansion), extract_query_themes and the
+mental-health disclaimer check — used to test every phrase of every list
+with `in`. They now read one Aho-Corasick scan (keyword_engine.scan_query).
+
+  per-list   the original `in` loops, over the same phrase lists
+  engine     scan_query() once (LRU cache cleared — every query is new),
+             then every component reads the scan
+
+Both paths must return identical results for every query.
+
+    python benchmarks/bench_keywords.py
+    python benchmarks/bench_keywords.py --number 5000 --repeat 5
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from backend.core import keyword_engine as kw                                   # noqa: E402
+from backend.core import mood_detector as md                                    # noqa: E402
+from backend.core import query_classifier as qc                                 # noqa: E402
+from backend.core.enhanced_retrieval import (                                   # noqa: E402
+    CONTRACTIONS, QUERY_EXPANSIONS, TOPIC_THEMES, EnhancedGitaRetriever,
+)
+from backend.core.prompts import MENTAL_HEALTH_KEYWORDS                         # noqa: E402
+from backend.core.query_classifier import QueryType                             # noqa: E402
+
+QUERIES = [
+    "hi",
+    "namaste krishna",
+    "What is the weather forecast for tomorrow?",
+    "Who is Arjuna in the Mahabharata?",
+    "What does chapter 2 say about the soul?",
+    "I'm feeling so lost and anxious about my career, my family expects me to succeed "
+    "and I can't stop worrying about failure",
+    "what should i do when my anger at my brother keeps growing",
+    "How do I let go of attachment to the results of my work?",
+    "I don't see the point of anything anymore and I feel hopeless",
+    "How can I find peace and calm my restless mind through meditation?",
+    "My father passed away last month and the grief is overwhelming",
+    "Is it wrong to want success and money?",
+]
+
+
+# ── Per-list scans (the implementation before the keyword engine) ────────────
+
+def _classify_old(query: str):
+    q = query.strip().lower().rstrip("!?.,;:")
+    words = q.split()
+    scores = {QueryType.GREETING: 0.0, QueryType.FACTUAL: 0.0, QueryType.OFF_TOPIC: 0.0, QueryType.SPIRITUAL: 0.1}
+
+    if q in qc._GREETING_EXACT:
+        scores[QueryType.GREETING] += 3.0
+    if any(q.startswith(s) for s in qc._GREETING_STARTS):
+        scores[QueryType.GREETING] += 2.0
+    if len(words) <= 3 and not qc._GITA_MAHABHARATA_TERMS.intersection(words):
+        if not qc._SPIRITUAL_SIGNALS.intersection(words):
+            scores[QueryType.GREETING] += 1.0
+
+    for signal in qc._OFF_TOPIC_SIGNALS:
+        if signal in q:
+            scores[QueryType.OFF_TOPIC] += 2.0
+            break
+
+    has_gita_term = bool(qc._GITA_MAHABHARATA_TERMS.intersection(set(words)))
+    has_factual_starter = any(q.startswith(s) or s in q for s in qc._FACTUAL_QUESTION_STARTERS)
+    if has_gita_term:
+        scores[QueryType.FACTUAL] += 1.5
+    if has_factual_starter:
+        scores[QueryType.FACTUAL] += 1.0
+    if has_gita_term and has_factual_starter:
+        scores[QueryType.FACTUAL] += 1.0
+
+    scores[QueryType.SPIRITUAL] += sum(1 for s in qc._SPIRITUAL_SIGNALS if s in q) * 0.5
+    if any(p in words for p in ("i", "me", "my", "myself", "i'm", "i've", "i'll")):
+        scores[QueryType.SPIRITUAL] += 1.0
+    if len(words) > 10:
+        scores[QueryType.SPIRITUAL] += 0.5
+
+    winner = max(scores, key=lambda t: scores[t])
+    total = sum(scores.values()) or 1.0
+    return winner, round(scores[winner] / total, 2)
+
+
+def _mood_old(query: str):
+    q = query.lower()
+    scores = {m: 0 for m in md.Mood if m != md.Mood.NEUTRAL}
+    for mood, phrases in md._SIGNALS.items():
+        for phrase in phrases:
+            if phrase in q:
+                scores[mood] += 1
+    best = max(scores, key=lambda m: scores[m])
+    return (md.Mood.NEUTRAL, 0) if scores[best] < md._THRESHOLD else (best, scores[best])
+
+
+def _preprocess_old(query: str):
+    expanded = query.lower().strip()
+    for abbrev, full in CONTRACTIONS.items():
+        expanded = expanded.replace(abbrev, full)
+    parts = [exp for k, exp in QUERY_EXPANSIONS.items() if k in expanded]
+    if parts:
+        expanded = expanded + " " + " ".join(parts)
+    return query, expanded
+
+
+def _themes_old(query: str):
+    q = query.lower()
+    theme_scores = {}
+    for topic, themes in TOPIC_THEMES.items():
+        if topic in q:
+            for rank, theme in enumerate(themes):
+                theme_scores[theme] = theme_scores.get(theme, 0) + (len(themes) - rank)
+    if not theme_scores:
+        return ["general"]
+    return [t for t, _ in sorted(theme_scores.items(), key=lambda x: x[1], reverse=True)[:4]]
+
+
+def _disclaimer_old(query: str) -> bool:
+    q = query.lower()
+    return any(k in q for k in MENTAL_HEALTH_KEYWORDS)
+
+
+def per_list(query: str):
+    return (_classify_old(query), _mood_old(query), _preprocess_old(query),
+            _themes_old(query), _disclaimer_old(query))
+
+
+# ── Keyword engine ───────────────────────────────────────────────────────────
+
+def engine(query: str):
+    kw.scan_query.cache_clear()
+    m = kw.scan_query(query)
+    return (qc.classify_query(query, m), md.detect_mood(query, m), EnhancedGitaRetriever.preprocess_query(query, m),
+            EnhancedGitaRetriever.extract_query_themes(query, m), m.has(kw.MENTAL_HEALTH))
+
+
+def _best_us(fn, query: str, number: int, repeat: int) -> float:
+    return min(timeit.repeat(lambda: fn(query), number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=7, help="timing runs (best is reported)")
+    args = parser.parse_args()
+
+    kw.get_keyword_engine()     # compile the automaton outside the timings
+    for q in QUERIES:
+        assert per_list(q) == engine(q), f"results differ for {q!r}"
+
+    print(f"{'chars':>5}  {'per-list':>10}  {'engine':>10}  {'speed-up':>8}  query")
+    total_old = total_new = 0.0
+    for q in QUERIES:
+        old = _best_us(per_list, q, args.number, args.repeat)
+        new = _best_us(engine, q, args.number, args.repeat)
+        total_old += old
+        total_new += new
+        print(f"{len(q):>5}  {old:>7.1f} us  {new:>7.1f} us  {old / new:>7.2f}x  {q[:48]}", flush=True)
+    n = len(QUERIES)
+    print(f"\nmean over {n} queries: {total_old / n:.1f} us -> {total_new / n:.1f} us "
+          f"({total_old / total_new:.2f}x); results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-request cost of the in-memory session store as the number of sessions grows.
+
+One request does what /api/query does with its session: get_session,
+get_conversation_context (history read) and add_to_history. The store is
+filled with 1k / 10k / 100k live sessions and requests hit random ones.
+
+  lru        InMemorySessionStore — expiry pops only from the oldest end
+  full-scan  the same store with the original expiry, a scan over every
+             session on every call (the behaviour before the LRU index)
+
+The lru cost should stay flat across sizes; full-scan grows linearly.
+
+    python benchmarks/bench_sessions.py
+    python benchmarks/bench_sessions.py --sizes 1000 100000 --no-baseline
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.core.session_manager import SessionManager        # noqa: E402
+from backend.core.session_store import InMemorySessionStore    # noqa: E402
+
+_VERSES = [{"chapter": 2, "verse": 47, "verse_id": "Chapter 2, Verse 47"}]
+_RESPONSE = "Act without attachment to the fruits of action. " * 8
+
+
+class FullScanSessionStore(InMemorySessionStore):
+    """The original expiry: collect every expired session on every call."""
+
+    def _cleanup_expired(self, now) -> None:
+        expired = [
+            sid for sid, s in self.sessions.items()
+            if now - s["last_accessed"] > self.session_ttl
+        ]
+        for sid in expired:
+            del self.sessions[sid]
+            self.expired_count += 1
+
+
+def _manager(store_cls, n_sessions: int):
+    store = store_cls(max_history=10, session_ttl_hours=2, max_sessions=n_sessions)
+    manager = SessionManager(max_history=10, session_ttl_hours=2, max_sessions=n_sessions, store=store)
+    # Filled directly: creating one by one would cost the full-scan store O(n²)
+    now = datetime.now()
+    ids = [str(uuid.uuid4()) for _ in range(n_sessions)]
+    for sid in ids:
+        store.sessions[sid] = {"history": [], "created_at": now, "last_accessed": now}
+    return manager, ids
+
+
+def _request(manager: SessionManager, session_id: str) -> None:
+    manager.get_session(session_id)
+    manager.get_conversation_context(session_id, last_n=3)
+    manager.add_to_history(session_id, "How do I stay calm?", _RESPONSE, _VERSES, ["peace"])
+
+
+def per_request_us(store_cls, n_sessions: int, n_requests: int, seed: int = 0) -> float:
+    manager, ids = _manager(store_cls, n_sessions)
+    rng = random.Random(seed)
+    picks = [rng.choice(ids) for _ in range(n_requests)]
+    for sid in picks[: min(200, n_requests)]:     # warm-up
+        _request(manager, sid)
+    t0 = time.perf_counter()
+    for sid in picks:
+        _request(manager, sid)
+    return (time.perf_counter() - t0) / n_requests * 1e6
+
+
+def _fmt(us: float) -> str:
+    return f"{us / 1000:.1f} ms/req" if us >= 1000 else f"{us:.0f} us/req"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--requests", type=int, default=20_000, help="requests per size (lru)")
+    parser.add_argument("--no-baseline", action="store_true", help="skip the full-scan store")
+    args = parser.parse_args()
+
+    print(f"{'sessions':>10}  {'lru':>14}  {'full-scan':>14}", flush=True)
+    lru = {}
+    for n in args.sizes:
+        lru[n] = per_request_us(InMemorySessionStore, n, args.requests)
+        row = f"{n:>10,}  {_fmt(lru[n]):>14}"
+        if not args.no_baseline:
+            # Each full-scan request walks all n sessions — cap the total work
+            requests = max(50, min(args.requests, 5_000_000 // n))
+            row += f"  {_fmt(per_request_us(FullScanSessionStore, n, requests)):>14}"
+        print(row, flush=True)
+
+    smallest, largest = min(args.sizes), max(args.sizes)
+    ratio = lru[largest] / lru[smallest]
+    print(f"\nlru cost at {largest:,} vs {smallest:,} sessions: {ratio:.2f}x")
+    if ratio > 3:
+        sys.exit(f"per-request cost is not flat ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
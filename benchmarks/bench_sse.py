@@ -0,0 +1,113 @@
+"""
+SSE frames and CPU per stream: one frame per provider chunk vs. coalesce().
+
+A fake provider yields one-word chunks every 2 ms (some of them IAST
+transliteration, which is multi-byte in UTF-8). N concurrent streams are
+served through a StreamingResponse and read over httpx.ASGITransport, so
+every frame also pays for its ASGI send.
+
+  baseline   one frame per chunk, f"data: {json.dumps(payload)}\\n\\n"
+             (the stream route before coalescing)
+  coalesced  sse.coalesce() + pre-encoded sse.token_frame() bytes,
+             SSE_FLUSH_BYTES / SSE_FLUSH_MS from settings unless overridden
+
+Both paths must deliver exactly the same text.
+
+    python benchmarks/bench_sse.py
+    python benchmarks/bench_sse.py --streams 50 200 --tokens 400 --flush-ms 30
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx                                            # noqa: E402
+from fastapi import FastAPI                             # noqa: E402
+from fastapi.responses import StreamingResponse         # noqa: E402
+
+from backend.config import settings                     # noqa: E402
+from backend.core import sse                            # noqa: E402
+
+_WORDS = ["Act ", "without ", "attachment ", "to ", "the ", "fruits; ", "karmaṇy ", "evādhikāras ", "te ", "mā "]
+
+
+async def _provider(n_tokens: int, gap: float):
+    for i in range(n_tokens):
+        await asyncio.sleep(gap)
+        yield _WORDS[i % len(_WORDS)]
+
+
+def _app(n_tokens: int, gap: float, flush_bytes: int, flush_ms: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/baseline")
+    async def baseline():
+        async def frames():
+            async for chunk in _provider(n_tokens, gap):
+                yield f"data: {json.dumps({'type': 'token', 'content': chunk})}\n\n"
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    @app.get("/coalesced")
+    async def coalesced():
+        async def frames():
+            async for text in sse.coalesce(_provider(n_tokens, gap), flush_bytes, flush_ms / 1000.0):
+                yield sse.token_frame(text)
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    return app
+
+
+def _text(body: str) -> str:
+    return "".join(
+        json.loads(frame[6:])["content"] for frame in body.split("\n\n") if frame.startswith("data: ")
+    )
+
+
+async def run(app: FastAPI, path: str, n_streams: int, n_tokens: int) -> dict:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get(path)      # warm-up
+        cpu, wall = time.process_time(), time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(n_streams)))
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    expected = "".join(_WORDS[i % len(_WORDS)] for i in range(n_tokens))
+    for r in responses:
+        assert _text(r.text) == expected, f"{path}: streamed text differs"
+    frames = sum(r.text.count("data: ") for r in responses)
+    return {
+        "frames_per_stream": frames / n_streams,
+        "frames_per_second": frames / wall,
+        "cpu_ms_per_stream": cpu / n_streams * 1000,
+        "wall_s":            wall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--tokens", type=int, default=400, help="chunks per stream")
+    parser.add_argument("--gap-ms", type=float, default=2.0, help="delay between provider chunks")
+    parser.add_argument("--flush-bytes", type=int, default=settings.SSE_FLUSH_BYTES)
+    parser.add_argument("--flush-ms", type=float, default=settings.SSE_FLUSH_MS)
+    args = parser.parse_args()
+
+    app = _app(args.tokens, args.gap_ms / 1000.0, args.flush_bytes, args.flush_ms)
+    print(f"{args.tokens} chunks/stream every {args.gap_ms:g} ms; "
+          f"coalesce at {args.flush_bytes} bytes / {args.flush_ms:g} ms "
+          f"({'orjson' if sse.orjson else 'stdlib json'})\n")
+    print(f"{'streams':>8}  {'path':<10}  {'frames/stream':>13}  {'frames/s':>9}  {'CPU/stream':>11}  {'wall':>6}")
+    for n in args.streams:
+        for path in ("/baseline", "/coalesced"):
+            r = asyncio.run(run(app, path, n, args.tokens))
+            print(f"{n:>8}  {path[1:]:<10}  {r['frames_per_stream']:>13.0f}  {r['frames_per_second']:>9.0f}  "
+                  f"{r['cpu_ms_per_stream']:>8.1f} ms  {r['wall_s']:>5.2f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,17 @@ Gita Wisdom Guide — First-time setup
 Run once before starting the backend for the first time:
     python setup.py
 
+Re-run it after editing the corpus: only changed documents are re-embedded
+(python setup.py --rebuild re-embeds everything).
+
+python setup.py --compare-chunk-pooling  reports how well chunk vectors pooled
+from verse vectors (CHUNK_EMBEDDING=mean / weighted) match embedded ones.
+
 What this does:
 1. Processes raw Gita verses into structured documents
-2. Creates and indexes the ChromaDB vector database
-3. Verifies the system is ready
+2. Creates and indexes the vector database (VECTOR_ENGINE)
+3. Writes the precomputed embedding artifact the numpy engine memory-maps
+4. Verifies the system is ready
 """
 
 import sys
@@ -43,15 +50,15 @@ def process_data():
     from data_processor import GitaDataProcessor
 
     raw_path = ROOT / "data" / "reformatted_bhagavad_gita.json"
-    out_path = ROOT / "data" / "processed_gita_data.json"
+    out_path = ROOT / "data" / "processed_gita_data.jsonl"
 
     if not raw_path.exists():
         print(f"  ERROR: {raw_path} not found.")
         sys.exit(1)
 
     if out_path.exists():
-        print(f"  processed_gita_data.json already exists — skipping re-processing.")
-        print("  (Delete data/processed_gita_data.json to force re-processing)")
+        print(f"  processed_gita_data.jsonl already exists — skipping re-processing.")
+        print("  (Delete data/processed_gita_data.jsonl to force re-processing)")
         return
 
     processor = GitaDataProcessor()
@@ -67,26 +74,117 @@ def build_vector_store():
     from vector_store import GitaVectorStore
     from backend.config import settings
 
-    processed_path = ROOT / "data" / "processed_gita_data.json"
+    processed_path = ROOT / "data" / "processed_gita_data.jsonl"
     if not processed_path.exists():
-        print("  ERROR: processed_gita_data.json not found. Run process_data() first.")
+        print("  ERROR: processed_gita_data.jsonl not found. Run process_data() first.")
         sys.exit(1)
 
     vs = GitaVectorStore(
         collection_name=settings.COLLECTION_NAME,
         persist_directory=settings.VECTOR_DB_PATH,
+        engine=settings.VECTOR_ENGINE,
+        data_path=str(processed_path),
+        artifact_dir=settings.EMBEDDING_ARTIFACT_DIR,
+        verify_model=False,     # a model change is fixed below by re-indexing
+        chunk_embedding=settings.CHUNK_EMBEDDING,
     )
-    existing = vs.get_collection_info().get("document_count", 0)
 
-    if existing > 0:
-        print(f"  Vector store already has {existing} documents — skipping re-indexing.")
-        print("  (To force rebuild: delete the vector_db/ folder and re-run setup.py)")
+    # Incremental: only new / edited documents are embedded, removed ones deleted.
+    # An index built with another embedding model is rebuilt from scratch.
+    # Embedding overlaps the writes and is checkpointed — an interrupted run
+    # picks up where it stopped when setup.py is re-run.
+    print(f"  Syncing {processed_path} into {settings.VECTOR_DB_PATH} ({settings.VECTOR_ENGINE}, fastembed)...")
+    vs.load_and_index_data(
+        str(processed_path),
+        rebuild="--rebuild" in sys.argv,
+        workers=settings.INDEX_EMBED_WORKERS,
+    )
+    final_count = vs.get_collection_info().get("document_count", 0)
+    print(f"  Index holds {final_count} documents")
+    return vs
+
+
+def write_artifact(vs):
+    step("Writing embedding artifact")
+    path = vs.export_artifact()
+    count = vs.get_collection_info().get("document_count", 0)
+    print(f"  {path}  ({count} documents)")
+    print("  VECTOR_ENGINE=numpy memory-maps this at startup — no embedding, no SQLite")
+
+
+# Seeker-style questions for the pooling comparison (plus every browse query)
+_POOLING_QUERIES = (
+    "How to find inner peace?",
+    "I feel anxious about my future",
+    "How do I stop worrying about results?",
+    "What is my duty when my family disagrees?",
+    "How can I control my anger?",
+    "What happens to the soul after death?",
+    "How do I let go of attachment?",
+    "I feel lost and without purpose",
+    "How should I meditate?",
+    "What is true devotion?",
+    "How do I act without fear of failure?",
+    "Why do good people suffer?",
+)
+
+
+def compare_chunk_pooling(vs):
+    """
+    Offline check for CHUNK_EMBEDDING: embed every verse and chunk, pool the
+    chunk vectors from their verses, and compare — cosine to the embedded
+    chunk vector, and how many of the top-k search results (verses + chunks)
+    stay the same when pooled chunks replace embedded ones.
+    """
+    step("Comparing pooled vs. embedded chunk vectors")
+    import numpy as np
+    from corpus import load_documents
+    from embedding_artifact import doc_id
+    from vector_store import pool_vectors
+    from backend.api.routes.verses import browse_queries
+
+    documents = load_documents(str(ROOT / "data" / "processed_gita_data.jsonl"))
+    verses = {doc_id(d): d for d in documents if d["content_type"] == "verse"}
+    chunks = [d for d in documents if d["content_type"] == "chunk"
+              and d.get("verse_ids") and all(v in verses for v in d["verse_ids"])]
+    if not chunks:
+        print("  No chunks with verse_ids — re-run processing (delete processed_gita_data.jsonl)")
         return
 
-    print(f"  Indexing {processed_path} into ChromaDB (Google text-embedding-004)...")
-    vs.load_and_index_data(str(processed_path))
-    final_count = vs.get_collection_info().get("document_count", 0)
-    print(f"  Indexed {final_count} documents into {settings.VECTOR_DB_PATH}")
+    def unit(rows):
+        rows = np.asarray(rows, dtype=np.float32)
+        return rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-12)
+
+    verse_ids = list(verses)
+    row_of = {v: r for r, v in enumerate(verse_ids)}
+    verse_vecs = unit(vs.embed_texts([verses[v]["text"] for v in verse_ids]))
+    chunk_vecs = unit(vs.embed_texts([c["text"] for c in chunks]))
+    queries = unit(vs.embed_queries(browse_queries() + list(_POOLING_QUERIES)))
+
+    def top_k(matrix, k):
+        return [set(row) for row in np.argsort(-(queries @ matrix.T), axis=1)[:, :k]]
+
+    n_verses = len(verse_ids)
+    truth = {k: top_k(np.vstack([verse_vecs, chunk_vecs]), k) for k in (5, 10)}
+    truth_chunks = top_k(chunk_vecs, 5)
+    print(f"  {len(chunks)} chunks, {len(queries)} queries — recall = overlap with embedded-chunk results")
+    for mode in ("mean", "weighted"):
+        pooled = np.asarray([
+            pool_vectors(
+                verse_vecs[[row_of[v] for v in c["verse_ids"]]],
+                [max(1, len(verses[v]["text"].split())) for v in c["verse_ids"]] if mode == "weighted" else None,
+            )
+            for c in chunks
+        ])
+        cosine = (pooled * chunk_vecs).sum(axis=1)
+        recall = {}
+        for k in (5, 10):
+            got = top_k(np.vstack([verse_vecs, pooled]), k)
+            recall[k] = np.mean([len(a & b) / k for a, b in zip(got, truth[k])])
+        chunk_recall = np.mean([len(a & b) / 5 for a, b in zip(top_k(pooled, 5), truth_chunks)])
+        print(f"  {mode:<8}  cosine mean {cosine.mean():.3f} / min {cosine.min():.3f}   "
+              f"recall@5 {recall[5]:.3f}  recall@10 {recall[10]:.3f}  chunk-only recall@5 {chunk_recall:.3f}")
+    print(f"  ({n_verses} verse vectors reused; pooling skips {len(chunks)} chunk embeddings)")
 
 
 def verify():
@@ -121,7 +219,10 @@ if __name__ == "__main__":
 
     check_env()
     process_data()
-    build_vector_store()
+    vs = build_vector_store()
+    write_artifact(vs)
+    if "--compare-chunk-pooling" in sys.argv:
+        compare_chunk_pooling(vs)
     verify()
 
     print("\n" + "=" * 55)
@@ -0,0 +1,146 @@
+"""
+Gita Wisdom Guide — Processed corpus (JSON Lines)
+
+data/processed_gita_data.jsonl, written by GitaDataProcessor, one compact
+record per line:
+
+    {"format":"gita-corpus","version":1,"verses":640,"chunks":214}
+    {"content_type":"verse","chapter":2,"verse":47,"theme":"action","word_count":31,"text":"..."}
+    ...
+    {"content_type":"chunk","chunk_id":"chunk_1","chapter_range":"1-1","verse_range":"1-3",
+     "theme":"duty","verse_ids":["verse:1.1","verse:1.2","verse:1.3"]}
+
+Every verse is stored once. A chunk stores only the IDs of its verses — its
+text (those verses joined by spaces) is rebuilt on load — and derivable
+fields (verse_id) are not stored at all. Verses come first, so a caller that
+only wants verses stops reading at the first chunk:
+
+    corpus = Corpus(path)
+    corpus.verses()       # iterator over verse dicts
+    corpus.documents()    # verses then chunks — the dicts the pipeline always used
+
+The legacy processed_gita_data.json (one indented JSON array) is still read.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+FORMAT  = "gita-corpus"
+VERSION = 1
+
+_VERSE_FIELDS = ("chapter", "verse", "theme", "word_count", "text")
+_CHUNK_FIELDS = ("chunk_id", "chapter_range", "verse_range", "theme", "verse_ids")
+
+# One decoder for every line — json.loads() per line costs about twice as much
+_decode = json.JSONDecoder().decode
+
+
+def _verse_key(chapter, verse) -> str:
+    # Same scheme as embedding_artifact.doc_id
+    return f"verse:{chapter}.{verse}"
+
+
+def _dumps(record: Dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_corpus(path: str, documents: List[Dict]) -> None:
+    """Write processed documents (verses, then chunks with verse_ids) as a corpus file."""
+    verses = [d for d in documents if d.get("content_type") == "verse"]
+    chunks = [d for d in documents if d.get("content_type") == "chunk"]
+    known = {_verse_key(v["chapter"], v["verse"]) for v in verses}
+    for chunk in chunks:
+        missing = [v for v in chunk.get("verse_ids", []) if v not in known]
+        if missing or not chunk.get("verse_ids"):
+            raise ValueError(f"{chunk.get('chunk_id')} references unknown verses: {missing or 'none'}")
+
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(_dumps({"format": FORMAT, "version": VERSION, "verses": len(verses), "chunks": len(chunks)}) + "\n")
+        for v in verses:
+            f.write(_dumps({"content_type": "verse", **{k: v[k] for k in _VERSE_FIELDS if k in v}}) + "\n")
+        for c in chunks:
+            f.write(_dumps({"content_type": "chunk", **{k: c[k] for k in _CHUNK_FIELDS if k in c}}) + "\n")
+    tmp.replace(path)
+
+
+def _verse(record: Dict) -> Dict:
+    return {
+        "chapter":      record["chapter"],
+        "verse":        record["verse"],
+        "text":         record["text"],
+        "verse_id":     f"Chapter {record['chapter']}, Verse {record['verse']}",
+        "content_type": "verse",
+        "word_count":   record.get("word_count", len(record["text"].split())),
+        "theme":        record.get("theme", "general"),
+    }
+
+
+def _chunk(record: Dict, verse_texts: Dict[str, str]) -> Dict:
+    return {
+        "chunk_id":      record["chunk_id"],
+        "chapter_range": record.get("chapter_range", ""),
+        "verse_range":   record.get("verse_range", ""),
+        "text":          " ".join(verse_texts[v] for v in record["verse_ids"]),
+        "verse_ids":     record["verse_ids"],
+        "content_type":  "chunk",
+        "theme":         record.get("theme", "general"),
+    }
+
+
+class Corpus:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path, encoding="utf-8") as f:
+            first = f.readline()
+        self.legacy = first.lstrip().startswith("[")
+        if self.legacy:
+            self.header: Dict = {"format": FORMAT, "version": 0}
+        else:
+            self.header = json.loads(first)
+            if self.header.get("format") != FORMAT or self.header.get("version") != VERSION:
+                raise ValueError(f"{self.path} is not a {FORMAT} v{VERSION} file: {self.header}")
+
+    def _records(self) -> Iterator[Dict]:
+        with open(self.path, encoding="utf-8") as f:
+            f.readline()    # header
+            for line in f:
+                if line.strip():
+                    yield _decode(line)
+
+    def _legacy(self) -> List[Dict]:
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def verses(self) -> Iterator[Dict]:
+        """Verse documents, in file order — chunk records are never parsed."""
+        if self.legacy:
+            yield from (d for d in self._legacy() if d.get("content_type") == "verse")
+            return
+        for record in self._records():
+            if record["content_type"] != "verse":
+                return
+            yield _verse(record)
+
+    def documents(self) -> Iterator[Dict]:
+        """Every document — verses, then chunks with their text rebuilt."""
+        if self.legacy:
+            yield from self._legacy()
+            return
+        verse_texts: Dict[str, str] = {}
+        for record in self._records():
+            if record["content_type"] == "verse":
+                verse = _verse(record)
+                verse_texts[_verse_key(verse["chapter"], verse["verse"])] = verse["text"]
+                yield verse
+            else:
+                yield _chunk(record, verse_texts)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.documents()
+
+
+def load_documents(path: str) -> List[Dict]:
+    """All documents of a corpus file (JSON Lines or legacy JSON array)."""
+    return list(Corpus(path).documents())
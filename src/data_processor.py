@@ -3,6 +3,9 @@ import json
 import re
 from typing import List, Dict
 
+from corpus import write_corpus
+from embedding_artifact import doc_id
+
 class GitaDataProcessor:
     def __init__(self):
         self.processed_data = []
@@ -80,7 +83,7 @@ class GitaDataProcessor:
                 'chapter_range': f"{chunk_verses[0]['chapter']}-{chunk_verses[-1]['chapter']}",
                 'verse_range': f"{chunk_verses[0]['verse']}-{chunk_verses[-1]['verse']}",
                 'text': combined_text,
-                'verses': chunk_verses,
+                'verse_ids': [doc_id(v) for v in chunk_verses],
                 'content_type': 'chunk',
                 'theme': chunk_verses[0]['theme']  # Take theme from first verse
             }
@@ -102,10 +105,9 @@ class GitaDataProcessor:
         # Combine individual verses and chunks
         self.processed_data = processed_verses + chunks
         
-        # Save if output path provided
+        # Save if output path provided (JSON Lines; chunks reference their verses)
         if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.processed_data, f, ensure_ascii=False, indent=2)
+            write_corpus(output_path, self.processed_data)
         
         return self.processed_data
     
@@ -132,7 +134,7 @@ if __name__ == "__main__":
     # Process the data
     processed_data = processor.process_complete_dataset(
         'data/reformatted_bhagavad_gita.json',
-        'data/processed_gita_data.json'
+        'data/processed_gita_data.jsonl'
     )
     
     # Print statistics
@@ -0,0 +1,158 @@
+"""
+Gita Wisdom Guide — Precomputed embedding artifact
+
+setup.py writes the embedded corpus once, as a content-addressed directory:
+
+    vector_db/artifacts/
+        CURRENT                  name of the live artifact, e.g. "3f9a1c0e5b7d2a41"
+        3f9a1c0e5b7d2a41/
+            embeddings.npy       float32 (n, dim), unit-length rows
+            documents.json       ids, texts and metadata (compact JSON)
+            manifest.json        format version, model, shape, digest
+
+The server memory-maps embeddings.npy read-only: startup is a file map, not
+an embedding run or a SQLite open, and worker processes share the same
+physical pages. The directory name is a hash of the content, so rebuilding an
+unchanged corpus yields the same artifact, and a new build never overwrites
+files that a running worker has mapped — CURRENT is switched atomically.
+
+Document IDs are stable across builds and engines ("verse:2.47",
+"chunk:chunk_12"), derived from the document itself rather than uuid4().
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+ARTIFACT_FORMAT = 1
+
+_CURRENT    = "CURRENT"
+_EMBEDDINGS = "embeddings.npy"
+_DOCUMENTS  = "documents.json"
+_MANIFEST   = "manifest.json"
+
+
+def doc_id(doc: Dict) -> str:
+    """Stable ID of a processed document: "verse:<chapter>.<verse>" or "chunk:<chunk_id>"."""
+    if doc.get("chunk_id"):
+        return f"chunk:{doc['chunk_id']}"
+    return f"verse:{doc.get('chapter', '')}.{doc.get('verse', '')}"
+
+
+def _natural_key(value: str):
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", value)]
+
+
+class Artifact(NamedTuple):
+    path: Path
+    manifest: Dict
+    ids: List[str]
+    documents: List[str]
+    metadatas: List[Dict]
+    embeddings: np.ndarray      # read-only memmap
+
+
+def write_artifact(
+    root: str,
+    ids: List[str],
+    documents: List[str],
+    metadatas: List[Dict],
+    embeddings,
+    model_name: str,
+) -> Path:
+    """
+    Write the artifact (rows in natural ID order, so equal content always
+    hashes the same) and point CURRENT at it. Returns its directory.
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+        raise ValueError(f"Embedding matrix shape {matrix.shape} does not match {len(ids)} documents")
+
+    order = sorted(range(len(ids)), key=lambda i: _natural_key(ids[i]))
+    matrix = matrix[order]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    if not np.allclose(norms[norms > 0], 1.0, atol=1e-5):
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms     # already-unit rows are left bit-for-bit alone
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    sidecar = json.dumps(
+        {
+            "ids":       [ids[i] for i in order],
+            "documents": [documents[i] for i in order],
+            "metadatas": [metadatas[i] for i in order],
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+    tmp = root_path / f".tmp-{os.getpid()}-{time.monotonic_ns()}"
+    tmp.mkdir()
+    try:
+        np.save(tmp / _EMBEDDINGS, matrix)
+        (tmp / _DOCUMENTS).write_bytes(sidecar)
+
+        digest = hashlib.sha256(model_name.encode("utf-8"))
+        digest.update((tmp / _EMBEDDINGS).read_bytes())
+        digest.update(sidecar)
+        name = digest.hexdigest()[:16]
+
+        manifest = {
+            "format":  ARTIFACT_FORMAT,
+            "digest":  name,
+            "model":   model_name,
+            "count":   int(matrix.shape[0]),
+            "dim":     int(matrix.shape[1]),
+            "dtype":   "float32",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        (tmp / _MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        target = root_path / name
+        if target.exists():
+            shutil.rmtree(tmp)      # identical content is already there
+        else:
+            os.rename(tmp, target)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    pointer = root_path / f".{_CURRENT}.tmp"
+    pointer.write_text(name + "\n", encoding="utf-8")
+    os.replace(pointer, root_path / _CURRENT)
+    return target
+
+
+def current_artifact(root: str) -> Optional[Path]:
+    pointer = Path(root) / _CURRENT
+    if not pointer.exists():
+        return None
+    path = Path(root) / pointer.read_text(encoding="utf-8").strip()
+    return path if (path / _MANIFEST).exists() else None
+
+
+def load_artifact(root: str) -> Optional[Artifact]:
+    """The live artifact with its embeddings memory-mapped read-only, or None if there is none."""
+    path = current_artifact(root)
+    if path is None:
+        return None
+    manifest = json.loads((path / _MANIFEST).read_text(encoding="utf-8"))
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} has artifact format {manifest.get('format')}, expected {ARTIFACT_FORMAT}")
+
+    embeddings = np.load(path / _EMBEDDINGS, mmap_mode="r")
+    with open(path / _DOCUMENTS, "rb") as f:
+        sidecar = json.load(f)
+    if embeddings.dtype != np.float32 or embeddings.shape != (manifest["count"], manifest["dim"]) \
+            or len(sidecar["ids"]) != manifest["count"]:
+        raise ValueError(f"{path} does not match its manifest")
+
+    return Artifact(path, manifest, sidecar["ids"], sidecar["documents"], sidecar["metadatas"], embeddings)
@@ -2,23 +2,331 @@
 Gita Wisdom Guide — Vector Store
 
 Embedding provider: fastembed  BAAI/bge-small-en-v1.5  (384-dim, ONNX)
-Vector DB: ChromaDB (local persistent)
+Vector DB: ChromaDB (local persistent)  or  in-process NumPy exact search
 
 Why fastembed:
   - Uses ONNX Runtime, NOT PyTorch  →  ~150 MB RAM vs ~500 MB for sentence-transformers
   - Fully local, zero API calls, zero rate limits
   - Fits comfortably in Render free tier (512 MB)
   - ~24 MB model downloaded once on first startup, then cached
+
+Why a NumPy engine:
+  - The whole corpus is ~850 documents × 384 dims ≈ 1.3 MB of float32
+  - Exact top-k is one matrix-vector product — microseconds, no HNSW, no SQLite
+  - Theme / chapter filters are precomputed boolean masks
+  - chromadb is never imported when engine="numpy"
+  - Served from the precomputed embedding artifact (see embedding_artifact.py),
+    memory-mapped read-only — nothing is embedded at startup
 """
 
+import hashlib
 import json
-import uuid
-from typing import List, Dict, Optional
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
 
-import chromadb
+from corpus import load_documents
+from embedding_artifact import doc_id, load_artifact, write_artifact
 
 _EMBED_MODEL = "BAAI/bge-small-en-v1.5"
 _BATCH_SIZE  = 128
+# Embedded batches the indexing pipeline may hold while the writer catches up
+_PIPELINE_DEPTH = 4
+
+ENGINES = ("chroma", "numpy")
+
+# How chunk vectors are made: embedded from the chunk text, or pooled from the
+# (already embedded) vectors of the verses the chunk lists in verse_ids —
+# plain mean, or weighted by each verse's word count
+CHUNK_EMBEDDING_MODES = ("embed", "mean", "weighted")
+
+# Embedding artifacts live here unless artifact_dir says otherwise
+_ARTIFACT_SUBDIR = "artifacts"
+# Vectors embedded by an unfinished indexing run (removed once it completes)
+_CHECKPOINT_SUBDIR = ".index_checkpoint"
+
+_COLLECTION_DESCRIPTION = "Bhagavad Gita verses and wisdom"
+
+
+class IndexModelMismatch(RuntimeError):
+    """The stored index was embedded with a different model than _EMBED_MODEL."""
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU cache of query embeddings.
+
+    Keys are (model name, normalized text). bge-small-en-v1.5 uses an uncased
+    tokenizer, so lower-casing and collapsing whitespace never changes the
+    vector — it only lets "How to find peace?" and "how to  find peace?" share
+    an entry. Including the model name means a model switch can never serve a
+    stale vector. Bounded by both entry count and total bytes.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._bytes      = 0
+        self._lock       = threading.Lock()
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    @staticmethod
+    def _entry_size(key: tuple, vector: np.ndarray) -> int:
+        return vector.nbytes + len(key[1])
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        key = (model_name, self.normalize(text))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_name: str, text: str, vector) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (model_name, self.normalize(text))
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        size = self._entry_size(key, vector)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._entry_size(key, old)
+            self._entries[key] = vector
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old_vector = self._entries.popitem(last=False)
+                self._bytes -= self._entry_size(old_key, old_vector)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries":     len(self._entries),
+                "bytes":       self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes":   self.max_bytes,
+                "hits":        self.hits,
+                "misses":      self.misses,
+                "evictions":   self.evictions,
+                "hit_rate":    round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def _build_metadata(doc: Dict) -> Dict:
+    """Metadata stored alongside every document — identical for both engines."""
+    meta = {
+        "chapter":      str(doc.get("chapter", "")),
+        "verse":        str(doc.get("verse", "")),
+        "verse_id":     doc.get("verse_id", ""),
+        "content_type": doc.get("content_type", "verse"),
+        "theme":        doc.get("theme", "general"),
+    }
+    if "chunk_id" in doc:
+        meta["chunk_id"]      = doc["chunk_id"]
+        meta["chapter_range"] = doc.get("chapter_range", "")
+        meta["verse_range"]   = doc.get("verse_range", "")
+    meta["fingerprint"] = fingerprint(doc.get("text", ""))
+    return meta
+
+
+def pool_vectors(vectors: np.ndarray, weights: Optional[List[float]] = None) -> np.ndarray:
+    """Unit-length (weighted) mean of unit vectors — a chunk vector from its verses."""
+    pooled = np.average(np.asarray(vectors, dtype=np.float32), axis=0, weights=weights)
+    norm = np.linalg.norm(pooled)
+    return (pooled / norm if norm else pooled).astype(np.float32)
+
+
+def fingerprint(text: str, model_name: str = _EMBED_MODEL) -> str:
+    """
+    What a stored vector was computed from: model + exact text. A document
+    whose fingerprint is unchanged keeps its vector, even if its metadata
+    (theme, ranges) changed.
+    """
+    return hashlib.blake2b(f"{model_name}\0{text}".encode("utf-8"), digest_size=12).hexdigest()
+
+
+class NumpyVectorIndex:
+    """
+    Exact nearest-neighbour search over one contiguous float32 matrix.
+
+    Distances are squared L2 between unit vectors (2 - 2·cos), i.e. the same
+    numbers Chroma's default "l2" space returns, so callers that convert
+    distance → relevance keep working unchanged.
+    """
+
+    # Metadata keys that get a precomputed boolean mask per distinct value
+    _MASK_KEYS = ("theme", "chapter", "content_type")
+
+    def __init__(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict],
+        embeddings,
+        normalized: bool = False,
+    ):
+        """`normalized=True` trusts that rows are unit length and keeps the array as-is (e.g. a memmap)."""
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(documents):
+            raise ValueError(
+                f"Embedding matrix shape {matrix.shape} does not match {len(documents)} documents"
+            )
+        self.matrix    = matrix if normalized else self.normalize(matrix)
+        self.ids       = list(ids)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas)
+
+        self._masks: Dict[tuple, np.ndarray] = {}
+        for key in self._MASK_KEYS:
+            values = np.array([str(m.get(key, "")) for m in self.metadatas])
+            for value in np.unique(values):
+                self._masks[(key, str(value))] = values == value
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @staticmethod
+    def normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _mask_for(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        """Translate a Chroma-style equality filter into a boolean mask."""
+        if not where:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in where.items():
+            if isinstance(value, dict) or key.startswith("$"):
+                raise ValueError(f"Unsupported filter for numpy engine: {where}")
+            cached = self._masks.get((key, str(value)))
+            if cached is None:
+                cached = np.array([str(m.get(key, "")) == str(value) for m in self.metadatas])
+            mask &= cached
+        return mask
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+    ) -> Dict:
+        """Same result layout as chromadb's Collection.query."""
+        searches = [(row, n_results, where) for row in range(len(query_embeddings))]
+        return self._merge(self.query_many(query_embeddings, searches))
+
+    def query_many(
+        self,
+        query_embeddings: List[List[float]],
+        searches: List[Tuple[int, int, Optional[Dict]]],
+    ) -> List[Dict]:
+        """
+        Run several (query_row, n_results, where) searches in one vectorized pass.
+        All query vectors are scored against the matrix with a single product;
+        each search then only applies its mask and takes its own top-k.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        scores = queries @ self.matrix.T
+
+        results = []
+        for row, n_results, where in searches:
+            row_scores = scores[row]
+            mask = self._mask_for(where)
+            if mask is not None:
+                row_scores = np.where(mask, row_scores, -np.inf)
+                available = int(mask.sum())
+            else:
+                available = len(self)
+            top = self._top_k(row_scores, min(n_results, available))
+            results.append({
+                "ids":       [[self.ids[i] for i in top]],
+                "documents": [[self.documents[i] for i in top]],
+                "metadatas": [[self.metadatas[i] for i in top]],
+                "distances": [np.maximum(0.0, 2.0 - 2.0 * row_scores[top]).tolist()],
+            })
+        return results
+
+    @staticmethod
+    def _top_k(row: np.ndarray, k: int) -> np.ndarray:
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k < len(row):
+            top = np.argpartition(-row, k - 1)[:k]
+            return top[np.argsort(-row[top], kind="stable")]
+        return np.argsort(-row, kind="stable")[:k]
+
+    @staticmethod
+    def _merge(results: List[Dict]) -> Dict:
+        return {key: [r[key][0] for r in results] for key in results[0]}
+
+    # ── Artifact persistence ──────────────────────────────────────────────────
+
+    def save(self, artifact_dir: str, model_name: str) -> Path:
+        return write_artifact(artifact_dir, self.ids, self.documents, self.metadatas, self.matrix, model_name)
+
+
+class IndexCheckpoint:
+    """
+    Vectors of completed indexing batches, keyed by document fingerprint, so
+    an interrupted run resumes without re-embedding them. One .npz per batch,
+    written atomically; stale entries (edited text, other model) never match.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._next = 0
+
+    def load(self) -> Dict[str, np.ndarray]:
+        vectors: Dict[str, np.ndarray] = {}
+        if not self.directory.exists():
+            return vectors
+        for path in sorted(self.directory.glob("batch_*.npz")):
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    vectors.update(zip(data["fingerprints"].tolist(), data["vectors"]))
+            except (OSError, ValueError, KeyError):
+                continue        # torn write from the interrupted run
+            self._next = max(self._next, int(path.stem.split("_")[1]) + 1)
+        return vectors
+
+    def save(self, fingerprints: List[str], vectors: np.ndarray) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"batch_{self._next:06d}.npz"
+        tmp = self.directory / f".batch_{self._next:06d}.tmp.npz"
+        np.savez(tmp, fingerprints=np.array(fingerprints), vectors=vectors)
+        os.replace(tmp, path)
+        self._next += 1
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
 
 
 class GitaVectorStore:
@@ -26,25 +334,129 @@ class GitaVectorStore:
         self,
         collection_name: str = "gita_wisdom",
         persist_directory: str = "./vector_db",
+        engine: str = "chroma",
+        data_path: Optional[str] = None,
+        query_cache_size: int = 2048,
+        query_cache_bytes: int = 8 * 1024 * 1024,
+        model_cache_dir: Optional[str] = None,
+        offline: bool = False,
+        artifact_dir: Optional[str] = None,
+        verify_model: bool = True,
+        chunk_embedding: str = "embed",
     ):
+        """
+        chunk_embedding: one of CHUNK_EMBEDDING_MODES, used when indexing.
+
+        verify_model=True (serving) raises IndexModelMismatch when the stored
+        index was embedded with another model; setup.py passes False and then
+        re-indexes, which rebuilds such an index from scratch.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown vector engine '{engine}'. Valid engines: {ENGINES}")
+        if chunk_embedding not in CHUNK_EMBEDDING_MODES:
+            raise ValueError(
+                f"Unknown chunk embedding '{chunk_embedding}'. Valid modes: {CHUNK_EMBEDDING_MODES}"
+            )
+
         self.collection_name   = collection_name
         self.persist_directory = persist_directory
+        self.engine            = engine
+        self.data_path         = data_path
+        self.model_cache_dir   = model_cache_dir
+        self.offline           = offline
+        self.artifact_dir      = artifact_dir or str(Path(persist_directory) / _ARTIFACT_SUBDIR)
+        self.chunk_embedding   = chunk_embedding
 
-        self.client       = chromadb.PersistentClient(path=persist_directory)
         self._embed_model = None   # lazy-loaded on first embed call
-        self.collection   = self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"description": "Bhagavad Gita verses and wisdom"},
-        )
+        self._model_lock  = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self.warm_up_timings: Dict[str, float] = {}
+        self.query_cache  = QueryEmbeddingCache(query_cache_size, query_cache_bytes)
+        self.client       = None
+        self.collection   = None
+        self.numpy_index: Optional[NumpyVectorIndex] = None
+        self.artifact: Optional[str] = None     # artifact the numpy index was mapped from / saved to
+        self.index_model: Optional[str] = None  # model the stored vectors were embedded with
+        self.verify_model = verify_model
+
+        if engine == "chroma":
+            import chromadb
+            self.client     = chromadb.PersistentClient(path=persist_directory)
+            self.collection = self.client.get_or_create_collection(
+                name=collection_name,
+                metadata=self._collection_metadata(),
+            )
+            if self.collection.count():
+                self.index_model = (self.collection.metadata or {}).get("embed_model")
+                self._check_model(f"collection '{collection_name}'")
+        else:
+            self._open_numpy_index()
 
     # ── Embedding helpers ─────────────────────────────────────────────────────
 
     def _get_model(self):
         if self._embed_model is None:
-            from fastembed import TextEmbedding
-            self._embed_model = TextEmbedding(model_name=_EMBED_MODEL)
+            # Retrieval runs on a thread pool — load the model exactly once
+            with self._model_lock:
+                if self._embed_model is None:
+                    from fastembed import TextEmbedding
+                    kwargs = {}
+                    if self.model_cache_dir:
+                        kwargs["cache_dir"] = self.model_cache_dir
+                    if self.offline:
+                        kwargs["local_files_only"] = True   # never touch the network
+                    self._embed_model = TextEmbedding(model_name=_EMBED_MODEL, **kwargs)
         return self._embed_model
 
+    @property
+    def model_ready(self) -> bool:
+        return self._embed_model is not None
+
+    def warm_up(self) -> Dict[str, float]:
+        """
+        Load the model, run one embed (creates the ONNX session) and one search,
+        so the first real user does not pay for any of it.
+        Returns per-step timings in milliseconds.
+        """
+        timings: Dict[str, float] = {}
+
+        t0 = time.perf_counter()
+        model = self._get_model()
+        timings["model_load_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        t0 = time.perf_counter()
+        vector = next(iter(model.embed(["warm up"]))).tolist()
+        timings["first_embed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        t0 = time.perf_counter()
+        if self.engine == "numpy":
+            self.numpy_index.query([vector], n_results=1)
+        elif self.collection.count():
+            self.collection.query(query_embeddings=[vector], n_results=1)
+        timings["first_search_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        return timings
+
+    def start_background_warm_up(self) -> bool:
+        """
+        Run warm_up() on a daemon thread, at most once per store.
+        Returns False if the model is already loaded or a warm-up was started.
+        """
+        with self._model_lock:
+            if self._embed_model is not None or self._warm_up_thread is not None:
+                return False
+
+            def _run():
+                try:
+                    self.warm_up_timings = self.warm_up()
+                    print(f"Embedding model ready (background warm-up: {self.warm_up_timings})")
+                except Exception as e:
+                    print(f"WARNING: Background embedding warm-up failed: {e}")
+
+            self._warm_up_thread = threading.Thread(target=_run, name="embed-warm-up", daemon=True)
+            self._warm_up_thread.start()
+        return True
+
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         model = self._get_model()
         return [emb.tolist() for emb in model.embed(texts)]
@@ -52,57 +464,354 @@ class GitaVectorStore:
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         return self.embed_texts(texts)
 
+    def _embed_batches(self, texts: List[str], workers: int):
+        """
+        Yield float32 matrices of up to _BATCH_SIZE rows, in order. workers > 1
+        (or 0 = every core) runs fastembed's data-parallel worker processes —
+        only worth their start-up cost when there are several batches.
+        """
+        parallel = None
+        if workers != 1 and len(texts) > 2 * _BATCH_SIZE:
+            parallel = workers
+        batch = []
+        for vector in self._get_model().embed(texts, batch_size=_BATCH_SIZE, parallel=parallel):
+            batch.append(vector)
+            if len(batch) == _BATCH_SIZE:
+                yield np.asarray(batch, dtype=np.float32)
+                batch = []
+        if batch:
+            yield np.asarray(batch, dtype=np.float32)
+
     def embed_query(self, text: str) -> List[float]:
-        model = self._get_model()
-        return next(model.embed([text])).tolist()
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries, serving repeats from the LRU cache.
+        Misses are embedded together in one fastembed batch (one ONNX call).
+        """
+        vectors = [self.query_cache.get(_EMBED_MODEL, t) for t in texts]
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            fresh = dict(zip(missing, self._get_model().embed(missing)))
+            for text, vector in fresh.items():
+                self.query_cache.put(_EMBED_MODEL, text, vector)
+            vectors = [fresh[t] if v is None else v for t, v in zip(texts, vectors)]
+        return [v.tolist() for v in vectors]
+
+    def warm_query_cache(self, texts: List[str]) -> int:
+        """Pre-embed known query strings (e.g. browse queries) at startup."""
+        texts = list(texts)
+        if texts:
+            self.embed_queries(texts)
+        return len(texts)
+
+    # ── NumPy engine ──────────────────────────────────────────────────────────
+
+    def _open_numpy_index(self) -> None:
+        """Map the embedding artifact, or embed data_path once and write one."""
+        artifact = load_artifact(self.artifact_dir)
+        if artifact is not None:
+            self.index_model = artifact.manifest["model"]
+            if self.index_model == _EMBED_MODEL:
+                self.numpy_index = NumpyVectorIndex(
+                    artifact.ids, artifact.documents, artifact.metadatas, artifact.embeddings, normalized=True
+                )
+                self.artifact = artifact.path.name
+                return
+            if not (self.data_path and Path(self.data_path).exists()):
+                self._check_model(f"artifact {artifact.path.name}")
+
+        self.numpy_index = NumpyVectorIndex([], [], [], np.empty((0, 384), dtype=np.float32))
+        if self.data_path and Path(self.data_path).exists():
+            print("  No usable embedding artifact — embedding the corpus")
+            self.load_and_index_data(self.data_path)
+        else:
+            print("  WARNING: numpy engine has no artifact and no data_path — index is empty")
+
+    def _collection_metadata(self) -> Dict:
+        return {"description": _COLLECTION_DESCRIPTION, "embed_model": _EMBED_MODEL}
+
+    def _check_model(self, what: str) -> None:
+        if self.index_model == _EMBED_MODEL:
+            return
+        if self.index_model is None:
+            print(f"  WARNING: {what} records no embedding model — re-run setup.py to fingerprint it")
+            return
+        message = (
+            f"{what} was embedded with {self.index_model}, but queries use {_EMBED_MODEL} — "
+            "run  python setup.py  to re-index"
+        )
+        if self.verify_model:
+            raise IndexModelMismatch(message)
+        print(f"  WARNING: {message}")
+
+    def export_artifact(self) -> Path:
+        """Write the current index (either engine) as an embedding artifact — no re-embedding."""
+        if self.engine == "numpy":
+            path = self.numpy_index.save(self.artifact_dir, _EMBED_MODEL)
+        else:
+            data = self.collection.get(include=["documents", "metadatas", "embeddings"])
+            path = write_artifact(
+                self.artifact_dir, data["ids"], data["documents"], data["metadatas"],
+                np.asarray(data["embeddings"], dtype=np.float32), _EMBED_MODEL,
+            )
+        self.artifact = path.name
+        return path
 
     # ── Indexing ──────────────────────────────────────────────────────────────
 
     def add_documents(self, documents: List[Dict]) -> None:
+        """Embed and add (or overwrite) documents, keyed by their stable IDs."""
         texts     = [doc["text"] for doc in documents]
-        ids       = [str(uuid.uuid4()) for _ in documents]
-        metadatas = []
-
-        for doc in documents:
-            meta = {
-                "chapter":      str(doc.get("chapter", "")),
-                "verse":        str(doc.get("verse", "")),
-                "verse_id":     doc.get("verse_id", ""),
-                "content_type": doc.get("content_type", "verse"),
-                "theme":        doc.get("theme", "general"),
-            }
-            if "chunk_id" in doc:
-                meta["chunk_id"]      = doc["chunk_id"]
-                meta["chapter_range"] = doc.get("chapter_range", "")
-                meta["verse_range"]   = doc.get("verse_range", "")
-            metadatas.append(meta)
-
-        embeddings = self.embed_texts(texts)
-        self.collection.add(
-            documents=texts,
-            metadatas=metadatas,
-            embeddings=embeddings,
-            ids=ids,
-        )
+        ids       = [doc_id(doc) for doc in documents]
+        metadatas = [_build_metadata(doc) for doc in documents]
+        self._write(ids, texts, metadatas, self.embed_texts(texts))
         print(f"  Added {len(documents)} documents")
 
-    def load_and_index_data(self, data_path: str) -> None:
-        """Load processed data JSON and rebuild the entire vector index."""
-        with open(data_path, "r", encoding="utf-8") as f:
-            documents = json.load(f)
+    def _write(self, ids: List[str], texts: List[str], metadatas: List[Dict], embeddings) -> None:
+        if self.engine == "numpy":
+            self._numpy_apply(ids, texts, metadatas, embeddings)
+        else:
+            embeddings = np.asarray(embeddings, dtype=np.float32).tolist()
+            self.collection.upsert(ids=ids, documents=texts, metadatas=metadatas, embeddings=embeddings)
 
-        self.client.delete_collection(self.collection_name)
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"description": "Bhagavad Gita verses and wisdom"},
+    def _numpy_apply(self, ids, texts, metadatas, embeddings=None, delete=()) -> None:
+        """
+        Replace / append rows (and drop `delete`) — builds a new index, the old
+        one stays valid. Only new vectors are normalized; kept rows are copied
+        bit-for-bit, so an incremental build equals a full one.
+        """
+        old = self.numpy_index
+        if embeddings is not None:
+            embeddings = NumpyVectorIndex.normalize(np.asarray(embeddings, dtype=np.float32))
+        rows = {i: (d, m, old.matrix[r]) for r, (i, d, m) in enumerate(zip(old.ids, old.documents, old.metadatas))}
+        for i in delete:
+            rows.pop(i, None)
+        for n, (i, text, meta) in enumerate(zip(ids, texts, metadatas)):
+            vector = embeddings[n] if embeddings is not None else rows[i][2]
+            rows[i] = (text, meta, vector)
+        if rows:
+            matrix = np.asarray([r[2] for r in rows.values()], dtype=np.float32)
+        else:
+            matrix = np.empty((0, old.matrix.shape[1]), dtype=np.float32)
+        self.numpy_index = NumpyVectorIndex(
+            list(rows), [r[0] for r in rows.values()], [r[1] for r in rows.values()], matrix, normalized=True,
         )
 
-        for i in range(0, len(documents), _BATCH_SIZE):
-            batch = documents[i : i + _BATCH_SIZE]
-            self.add_documents(batch)
-            print(f"  Progress: {min(i + _BATCH_SIZE, len(documents))}/{len(documents)}")
+    @property
+    def _checkpoint_dir(self) -> str:
+        return str(Path(self.persist_directory) / _CHECKPOINT_SUBDIR)
+
+    def _stored_vectors(self, ids: List[str]) -> Dict[str, np.ndarray]:
+        if self.engine == "numpy":
+            row_of = {i: r for r, i in enumerate(self.numpy_index.ids)}
+            return {i: self.numpy_index.matrix[row_of[i]] for i in ids}
+        data = self.collection.get(ids=ids, include=["embeddings"])
+        return {i: np.asarray(v, dtype=np.float32) for i, v in zip(data["ids"], data["embeddings"])}
+
+    def _stored_metadata(self) -> Dict[str, Dict]:
+        """id → metadata of everything in the index."""
+        if self.engine == "numpy":
+            return dict(zip(self.numpy_index.ids, self.numpy_index.metadatas))
+        data = self.collection.get(include=["metadatas"])
+        return dict(zip(data["ids"], data["metadatas"]))
+
+    def _reset(self) -> None:
+        """Drop every stored vector (used when the embedding model changed)."""
+        if self.engine == "numpy":
+            self.numpy_index = NumpyVectorIndex([], [], [], np.empty((0, 384), dtype=np.float32))
+        else:
+            self.client.delete_collection(self.collection_name)
+            self.collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                metadata=self._collection_metadata(),
+            )
+        self.index_model = _EMBED_MODEL
+
+    def sync_documents(self, documents: List[Dict], workers: int = 1) -> Dict[str, int]:
+        """
+        Bring the index in line with `documents` by diffing fingerprints:
+        embed + upsert only new or changed text, update metadata-only
+        changes in place, delete documents that are gone. An index embedded
+        with another model is rebuilt from scratch. Returns the counts.
 
-        print(f"Successfully indexed {len(documents)} documents")
+        Embedding runs as a pipeline (see _index_pipeline) with `workers`
+        fastembed processes, checkpointed so an interrupted run resumes.
+        With chunk_embedding "mean" / "weighted", chunks whose verses are all
+        in `documents` are pooled from the verse vectors instead of embedded.
+        """
+        if self.index_model not in (None, _EMBED_MODEL):
+            print(f"  Index was embedded with {self.index_model} — rebuilding with {_EMBED_MODEL}")
+            self._reset()
+
+        ids       = [doc_id(doc) for doc in documents]
+        texts     = [doc["text"] for doc in documents]
+        metadatas = [_build_metadata(doc) for doc in documents]
+        stored    = self._stored_metadata()
+
+        pooled = set()
+        if self.chunk_embedding != "embed":
+            verses = {i for i, doc in zip(ids, documents) if doc.get("content_type") == "verse"}
+            pool_model = f"{_EMBED_MODEL}|{self.chunk_embedding}-pool"
+            for n, doc in enumerate(documents):
+                if doc.get("verse_ids") and all(v in verses for v in doc["verse_ids"]):
+                    pooled.add(n)
+                    metadatas[n]["fingerprint"] = fingerprint(texts[n], pool_model)
+
+        to_embed = [n for n, i in enumerate(ids) if stored.get(i, {}).get("fingerprint") != metadatas[n]["fingerprint"]]
+        embedding = set(to_embed)
+        relabel  = [n for n, i in enumerate(ids) if n not in embedding and stored[i] != metadatas[n]]
+        removed  = list(set(stored) - set(ids))
+
+        to_pool  = [n for n in to_embed if n in pooled]
+        to_embed = [n for n in to_embed if n not in pooled]
+        docs_per_second = self._index_pipeline(to_embed, ids, texts, metadatas, workers) if to_embed else 0.0
+        if to_pool:
+            self._pool_chunks(to_pool, documents, ids, texts, metadatas)
+
+        if relabel or removed:
+            if self.engine == "numpy":
+                self._numpy_apply([ids[n] for n in relabel], [texts[n] for n in relabel],
+                                  [metadatas[n] for n in relabel], delete=removed)
+            else:
+                if relabel:
+                    self.collection.update(ids=[ids[n] for n in relabel], metadatas=[metadatas[n] for n in relabel])
+                if removed:
+                    self.collection.delete(ids=removed)
+
+        if self.engine == "chroma" and (self.collection.metadata or {}).get("embed_model") != _EMBED_MODEL:
+            self.collection.modify(metadata=self._collection_metadata())
+        self.index_model = _EMBED_MODEL
+
+        written = to_embed + to_pool
+        return {
+            "added":     sum(1 for n in written if ids[n] not in stored),
+            "changed":   sum(1 for n in written if ids[n] in stored),
+            "pooled":    len(to_pool),
+            "relabeled": len(relabel),
+            "deleted":   len(removed),
+            "unchanged": len(ids) - len(written) - len(relabel),
+            "docs_per_second": round(docs_per_second, 1),
+        }
+
+    def _pool_chunks(self, rows: List[int], documents: List[Dict], ids, texts, metadatas) -> None:
+        """Chunk vectors for `rows` from their verses' stored vectors — no ONNX inference."""
+        t0 = time.perf_counter()
+        words = {i: len(t.split()) for i, t in zip(ids, texts)}
+        vectors = self._stored_vectors(list({v for n in rows for v in documents[n]["verse_ids"]}))
+        pooled = []
+        for n in rows:
+            verse_ids = documents[n]["verse_ids"]
+            weights = [max(1, words[v]) for v in verse_ids] if self.chunk_embedding == "weighted" else None
+            pooled.append(pool_vectors(np.asarray([vectors[v] for v in verse_ids]), weights))
+        self._write([ids[n] for n in rows], [texts[n] for n in rows], [metadatas[n] for n in rows],
+                    np.asarray(pooled, dtype=np.float32))
+        print(f"  Pooled {len(rows)} chunk vectors from verse vectors ({self.chunk_embedding}) "
+              f"in {(time.perf_counter() - t0) * 1000:.0f}ms")
+
+    def _index_pipeline(self, rows: List[int], ids, texts, metadatas, workers: int) -> float:
+        """
+        Embed and store documents `rows`, overlapping the two: a producer
+        thread embeds batches into a bounded queue while this thread
+        checkpoints and writes them. Vectors left in the checkpoint by an
+        interrupted run are reused. Returns embedded documents per second.
+        """
+        checkpoint = IndexCheckpoint(self._checkpoint_dir)
+        saved = checkpoint.load()
+        resumed = [n for n in rows if metadatas[n]["fingerprint"] in saved]
+        pending = [n for n in rows if metadatas[n]["fingerprint"] not in saved]
+
+        collected = []      # numpy: (rows, vectors), applied once at the end
+        def store(batch: List[int], vectors: np.ndarray) -> None:
+            if self.engine == "numpy":
+                collected.append((batch, vectors))
+            else:
+                self._write([ids[n] for n in batch], [texts[n] for n in batch],
+                            [metadatas[n] for n in batch], vectors.tolist())
+
+        if resumed:
+            store(resumed, np.asarray([saved[metadatas[n]["fingerprint"]] for n in resumed], dtype=np.float32))
+            print(f"  Resumed {len(resumed)} documents from checkpoint")
+        del saved
+
+        q: "queue.Queue" = queue.Queue(maxsize=_PIPELINE_DEPTH)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for vectors in self._embed_batches([texts[n] for n in pending], workers):
+                    while not stop.is_set():
+                        try:
+                            q.put(vectors, timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+                q.put(None)
+            except BaseException as e:
+                q.put(e)
+
+        t0 = time.perf_counter()
+        producer = threading.Thread(target=produce, name="index-embed", daemon=True)
+        if pending:
+            producer.start()
+        done = 0
+        try:
+            while pending:
+                item = q.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                batch = pending[done : done + len(item)]
+                checkpoint.save([metadatas[n]["fingerprint"] for n in batch], item)
+                store(batch, item)
+                done += len(batch)
+                rate = done / max(time.perf_counter() - t0, 1e-9)
+                print(f"  Embedded: {done}/{len(pending)}  ({rate:.0f} docs/s)")
+        except BaseException:
+            stop.set()
+            print(f"  Indexing interrupted after {done}/{len(pending)} — re-run to resume from the checkpoint")
+            raise
+        finally:
+            if producer.is_alive():
+                producer.join(timeout=5)
+
+        if collected:
+            batch = [n for part, _ in collected for n in part]
+            self._write([ids[n] for n in batch], [texts[n] for n in batch], [metadatas[n] for n in batch],
+                        np.vstack([vectors for _, vectors in collected]))
+        elapsed = time.perf_counter() - t0
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if pending:
+            print(f"  Embedded {done} documents in {elapsed:.1f}s — {rate:.0f} docs/s "
+                  f"(workers={workers or os.cpu_count()})")
+        return rate
+
+    def load_and_index_data(self, data_path: str, rebuild: bool = False, workers: int = 1) -> Dict[str, int]:
+        """
+        Index the processed corpus incrementally (see sync_documents);
+        rebuild=True re-embeds everything. The numpy engine then writes a
+        new embedding artifact if anything changed.
+        """
+        documents = load_documents(data_path)
+
+        if rebuild:
+            self._reset()
+        report = self.sync_documents(documents, workers=workers)
+
+        changed = any(report[k] for k in ("added", "changed", "relabeled", "deleted"))
+        if self.engine == "numpy" and (changed or self.artifact is None):
+            path = self.export_artifact()
+            print(f"  Embedding artifact: {path}")
+        # Everything is persisted now — the resume checkpoint is no longer needed
+        IndexCheckpoint(self._checkpoint_dir).clear()
+
+        print("Indexed {total} documents: {added} added, {changed} re-written, {relabeled} metadata-only, "
+              "{deleted} deleted, {unchanged} unchanged".format(total=len(documents), **report))
+        return report
 
     # ── Search ────────────────────────────────────────────────────────────────
 
@@ -112,6 +821,12 @@ class GitaVectorStore:
         n_results: int = 5,
         filter_metadata: Optional[Dict] = None,
     ) -> Dict:
+        if self.engine == "numpy":
+            return self.numpy_index.query(
+                [self.embed_query(query)],
+                n_results=n_results,
+                where=filter_metadata,
+            )
         return self.collection.query(
             query_embeddings=[self.embed_query(query)],
             n_results=n_results,
@@ -119,6 +834,51 @@ class GitaVectorStore:
             include=["documents", "metadatas", "distances"],
         )
 
+    def search_batch(
+        self,
+        searches: List[Tuple[str, int, Optional[Dict]]],
+        query_embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> List[Dict]:
+        """
+        Run several (query, n_results, filter_metadata) searches at once.
+
+        Each distinct query string is embedded exactly once, in one batch
+        (or taken from `query_embeddings` if the caller already has it).
+        numpy: every search is served from a single vectorized pass.
+        chroma: searches sharing a filter and n_results go out as one
+        multi-embedding collection.query call.
+        Returns one result dict per search, in order, each shaped like search_similar().
+        """
+        texts = list(dict.fromkeys(query for query, _, _ in searches))
+        if query_embeddings is not None:
+            embeddings = [query_embeddings[text] for text in texts]
+        else:
+            embeddings = self.embed_queries(texts)
+        row_of = {text: row for row, text in enumerate(texts)}
+
+        if self.engine == "numpy":
+            return self.numpy_index.query_many(
+                embeddings,
+                [(row_of[query], n, where) for query, n, where in searches],
+            )
+
+        groups: Dict[str, List[int]] = {}
+        for i, (_, n, where) in enumerate(searches):
+            groups.setdefault(json.dumps([n, where], sort_keys=True), []).append(i)
+
+        results: List[Optional[Dict]] = [None] * len(searches)
+        for members in groups.values():
+            _, n, where = searches[members[0]]
+            raw = self.collection.query(
+                query_embeddings=[embeddings[row_of[searches[i][0]]] for i in members],
+                n_results=n,
+                where=where,
+                include=["documents", "metadatas", "distances"],
+            )
+            for pos, i in enumerate(members):
+                results[i] = {key: [raw[key][pos]] for key in ("ids", "documents", "metadatas", "distances")}
+        return results
+
     def search_by_theme(self, query: str, theme: str, n_results: int = 3) -> Dict:
         return self.search_similar(query, n_results, {"theme": theme})
 
@@ -128,8 +888,16 @@ class GitaVectorStore:
     # ── Info ──────────────────────────────────────────────────────────────────
 
     def get_collection_info(self) -> Dict:
+        if self.engine == "numpy":
+            count = len(self.numpy_index) if self.numpy_index is not None else 0
+        else:
+            count = self.collection.count()
         return {
             "collection_name": self.collection_name,
-            "document_count":  self.collection.count(),
+            "document_count":  count,
             "embedding_model": _EMBED_MODEL,
+            "engine":          self.engine,
+            "artifact":        self.artifact,
+            "index_model":     self.index_model,
+            "query_cache":     self.query_cache.stats(),
         }
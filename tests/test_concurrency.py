@@ -0,0 +1,107 @@
+"""
+Concurrency check for /api/query — blocking work must stay off the event loop.
+
+Retrieval runs on the retrieval executor and the LLM is awaited through the
+providers' async clients, so N concurrent questions should finish in about
+the time of one, not N times it. The app runs with its real lifespan (vector
+store, retriever, caches) behind an httpx.ASGITransport client; only the LLM
+is replaced by a fake provider that takes 500 ms per answer.
+
+    python tests/test_concurrency.py        (or: pytest tests/)
+
+Needs the indexed corpus — run  python setup.py  once first.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Before backend.config is imported: no real providers, and no answer cache or
+# single-flight so that every request really waits on the LLM
+os.environ["GOOGLE_API_KEY"] = ""
+os.environ["GROQ_API_KEY"] = ""
+os.environ["ANSWER_CACHE_ENABLED"] = "false"
+os.environ["SINGLE_FLIGHT_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+
+from backend.main import app  # noqa: E402
+
+PROVIDER_DELAY = 0.5     # seconds per fake LLM answer
+
+QUERIES = [
+    "How can I stop worrying about the results of my work?",
+    "What does Krishna teach about controlling anger?",
+    "How do I find peace when my mind is restless?",
+    "What is my duty when my family disagrees with my choices?",
+    "How should I deal with the fear of failure?",
+    "What does the Gita say about the nature of the soul?",
+    "How can I stay calm when people criticise me?",
+    "What is true devotion according to Krishna?",
+    "How do I let go of attachment to success?",
+    "How can I act without ego in my daily life?",
+]
+
+
+class SlowGemini:
+    """Stands in for genai.GenerativeModel: every answer takes PROVIDER_DELAY."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, prompt: str):
+        self.calls += 1
+        await asyncio.sleep(PROVIDER_DELAY)
+        return SimpleNamespace(text="Act without attachment to the fruits of action.")
+
+
+async def _ask(client: httpx.AsyncClient, query: str) -> float:
+    t0 = time.perf_counter()
+    response = await client.post("/api/query", json={"query": query})
+    assert response.status_code == 200, response.text
+    assert not response.json()["error"], response.json()
+    return time.perf_counter() - t0
+
+
+async def _run() -> None:
+    async with app.router.lifespan_context(app):
+        provider = SlowGemini()
+        llm_handler = app.state.llm_handler
+        llm_handler.gemini_model = provider
+        llm_handler._build_router()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+            # Warm-up (model load, first search), then one call on its own
+            await _ask(client, "What does the Gita say about doing one's duty?")
+            single = await _ask(client, "How can I overcome grief over a loss?")
+
+            t0 = time.perf_counter()
+            results = await asyncio.gather(
+                *(_ask(client, q) for q in QUERIES),
+                client.get("/api/health"),
+            )
+            wall = time.perf_counter() - t0
+
+        health = results[-1]
+        assert health.status_code == 200, health.text
+        assert provider.calls == len(QUERIES) + 2, provider.calls
+
+        print(f"1 query: {single:.2f}s   {len(QUERIES)} concurrent queries + /api/health: {wall:.2f}s")
+        # Serialised, this would take len(QUERIES) × PROVIDER_DELAY = 5 s
+        assert wall < single + PROVIDER_DELAY, \
+            f"{len(QUERIES)} concurrent queries took {wall:.2f}s against {single:.2f}s for one"
+
+
+def test_concurrent_queries_take_about_one_call():
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    test_concurrent_queries_take_about_one_call()
@@ -0,0 +1,217 @@
+"""
+ProviderRouter with fake providers, simulated 429s and an injected clock.
+
+Covers error classification (status code + Retry-After), the circuit opening
+for exactly the Retry-After, the half-open probe admitting one request,
+ranking by time-to-first-token EWMA and error rate — and, end to end, the LLM
+handler skipping a rate-limited Gemini without another round trip.
+
+    python tests/test_provider_router.py        (or: pytest tests/)
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# No real providers — the handler test installs fakes
+os.environ["GOOGLE_API_KEY"] = ""
+os.environ["GROQ_API_KEY"] = ""
+
+from backend.core.provider_router import (  # noqa: E402
+    CALL, CLOSED, HALF_OPEN, OPEN, TTFT, ProviderRouter, classify_error,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class RateLimited(Exception):
+    """A 429 shaped like the Groq / httpx SDK errors: status_code + response.headers."""
+
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = type("Response", (), {"status_code": 429, "headers": headers})()
+
+
+def _router(clock: FakeClock, **kwargs) -> ProviderRouter:
+    return ProviderRouter(["gemini", "groq"], clock=clock, **kwargs)
+
+
+# ── classify_error ────────────────────────────────────────────────────────────
+
+def test_classify_429_with_retry_after():
+    failure = classify_error(RateLimited(retry_after=30))
+    assert failure.kind == "rate_limit"
+    assert failure.retry_after == 30.0
+    assert failure.retryable
+
+
+def test_classify_other_errors():
+    assert classify_error(RateLimited()).retry_after is None
+    assert classify_error(Exception("Resource has been exhausted (e.g. check quota). Please retry in 17.3s")) \
+        == ("rate_limit", 17.3, True)
+    assert classify_error(TimeoutError()).kind == "unavailable"
+    assert classify_error(ValueError("bad prompt")) == ("error", None, False)
+
+
+# ── Circuit breaker ───────────────────────────────────────────────────────────
+
+def test_circuit_opens_for_retry_after():
+    clock = FakeClock()
+    router = _router(clock)
+    assert router.begin("gemini")
+    router.record_failure("gemini", RateLimited(retry_after=30))
+    router.release("gemini")
+
+    assert router.stats()["gemini"]["state"] == OPEN
+    assert router.candidates(TTFT) == ["groq"]
+    assert not router.begin("gemini")
+
+    clock.advance(29.9)
+    assert router.candidates(TTFT) == ["groq"]
+    assert not router.begin("gemini")
+
+    clock.advance(0.1)
+    assert router.stats()["gemini"]["state"] == HALF_OPEN
+    assert router.candidates(TTFT)[0] == "gemini"      # the probe goes first
+
+
+def test_backoff_without_retry_after():
+    clock = FakeClock()
+    router = _router(clock, base_cooldown=5.0)
+    router.record_failure("gemini", RateLimited())
+    clock.advance(4.9)
+    assert "gemini" not in router.candidates()
+    clock.advance(0.1)
+    assert router.begin("gemini")
+    router.record_failure("gemini", RateLimited())     # failed probe → doubled cooldown
+    clock.advance(9.9)
+    assert "gemini" not in router.candidates()
+    clock.advance(0.1)
+    assert "gemini" in router.candidates()
+
+
+def test_half_open_admits_exactly_one_probe():
+    clock = FakeClock()
+    router = _router(clock)
+    router.record_failure("gemini", RateLimited(retry_after=10))
+    clock.advance(10)
+
+    assert router.begin("gemini")            # the probe
+    assert not router.begin("gemini")        # everyone else waits for it
+    assert not router.begin("gemini")
+    assert router.candidates() == ["groq"]
+
+    router.record_success("gemini", TTFT, 0.2)
+    router.release("gemini")
+    assert router.stats()["gemini"]["state"] == CLOSED
+    assert router.begin("gemini") and router.begin("gemini")
+
+
+def test_cancelled_probe_frees_the_slot():
+    clock = FakeClock()
+    router = _router(clock)
+    router.record_failure("gemini", RateLimited(retry_after=1))
+    clock.advance(1)
+    assert router.begin("gemini")
+    router.release("gemini")                 # probe cancelled, no outcome recorded
+    assert router.begin("gemini")
+
+
+# ── Ranking ───────────────────────────────────────────────────────────────────
+
+def test_candidates_follow_ttft_ewma():
+    router = _router(FakeClock())
+    assert router.candidates(TTFT) == ["gemini", "groq"]   # no samples → priority order
+
+    router.record_success("gemini", TTFT, 0.9)
+    router.record_success("groq", TTFT, 0.3)
+    assert router.candidates(TTFT) == ["groq", "gemini"]
+
+    # Gemini speeds up; the EWMA (alpha 0.2) follows over a few samples
+    router.record_success("gemini", TTFT, 0.1)
+    assert router.candidates(TTFT) == ["groq", "gemini"]   # 0.74 vs 0.3
+    for _ in range(10):
+        router.record_success("gemini", TTFT, 0.1)
+    assert router.candidates(TTFT) == ["gemini", "groq"]
+
+    # Latency kinds are tracked separately
+    assert router.candidates(CALL) == ["gemini", "groq"]
+
+
+def test_candidates_penalise_error_rate_and_fallback():
+    router = _router(FakeClock(), error_threshold=1.1)      # keep circuits closed
+    router.record_success("gemini", TTFT, 0.3)
+    router.record_success("groq", TTFT, 0.3)
+    assert router.candidates(TTFT) == ["gemini", "groq"]
+
+    router.record_failure("gemini", ValueError("bad request"))   # not retryable → stays closed
+    assert router.stats()["gemini"]["state"] == CLOSED
+    assert router.candidates(TTFT) == ["groq", "gemini"]
+
+    penalised = ProviderRouter(["gemini", "groq"], penalties={"groq": 2.0}, clock=FakeClock())
+    penalised.record_success("gemini", TTFT, 0.5)
+    penalised.record_success("groq", TTFT, 0.3)             # faster, but not 2x faster
+    assert penalised.candidates(TTFT) == ["gemini", "groq"]
+
+
+# ── End to end: LLM handler with fake providers ───────────────────────────────
+
+def test_handler_skips_rate_limited_gemini():
+    from backend.core.llm_handler import EnhancedGitaLLMHandler
+
+    calls = []
+
+    class FakeProviders(EnhancedGitaLLMHandler):
+        async def _call_gemini_async(self, system, user_content):
+            calls.append("gemini")
+            raise RateLimited(retry_after=60)
+
+        async def _call_groq_async(self, system, user_content):
+            calls.append("groq")
+            return "from groq"
+
+    handler = FakeProviders()
+    handler.gemini_model = object()
+    handler.groq_client = handler.groq_client_async = object()
+    clock = FakeClock()
+    handler._build_router()
+    handler.router._clock = clock
+
+    async def ask():
+        return await handler._call_with_fallback_async("system", "question")
+
+    assert asyncio.run(ask()) == ("from groq", "groq")
+    assert calls == ["gemini", "groq"]
+
+    calls.clear()
+    for _ in range(3):
+        assert asyncio.run(ask()) == ("from groq", "groq")
+    assert calls == ["groq"] * 3             # no Gemini round trip while the circuit is open
+
+    calls.clear()
+    clock.advance(60)
+    asyncio.run(ask())
+    assert calls == ["gemini", "groq"]       # one half-open probe, still rate-limited
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith("test_") and callable(fn)]
+    for name, fn in tests:
+        fn()
+        print(f"ok  {name}")
+    print(f"{len(tests)} passed")